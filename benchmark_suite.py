@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+benchmark_suite.py
+------------------
+파서/로더/플롯 단계별 처리량(lines/s, MB/s)과 최대 메모리(peak RSS) 측정.
+입력은 synthetic_data 로 만든 합성 로그이며, 각 케이스는 별도 프로세스(spawn)에서 실행해
+케이스 간 peak RSS 가 섞이지 않게 한다. 케이스가 쓰는 모듈은 타이머 시작 전에 import 하고,
+peak RSS 는 그 직후 초기화한 /proc/self/status 의 VmHWM 으로 잰다
+(ru_maxrss 는 exec 후에도 부모의 최대값을 물려받아 입력 생성 시 메모리가 섞인다).
+기준값(benchmark_baseline.json)과 비교해 처리량/메모리 회귀가 있으면 종료 코드 1 로 끝난다.
+
+기준값은 장비마다 다르므로 저장소에 넣지 않는다. 측정할 장비에서 변경 전 코드로 한 번 저장하고,
+같은 --scale 로 비교한다 (배율이 다르면 비교하지 않고 종료 코드 2).
+
+    python benchmark_suite.py --save-baseline      # (변경 전 코드에서) 이 장비의 기준값 저장
+    python benchmark_suite.py                      # 기준값과 비교
+    python benchmark_suite.py --scale 0.2 --save-baseline   # 작은 입력용 기준값 (비교도 --scale 0.2 로)
+"""
+
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing as mp
+from pathlib import Path
+
+import pandas as pd
+
+import synthetic_data
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+WORK_DIR = Path(tempfile.gettempdir()) / "illixr_logging_bench"
+BASELINE_FILE = Path(__file__).resolve().with_name("benchmark_baseline.json")
+
+
+# ===== 비교 기준: 이전 load_csv + ensure_numeric 동작 =====
+def _legacy_load_csv(path: Path) -> pd.DataFrame:
+    for enc in ("utf-8", "cp949", "euc-kr", "utf-8-sig"):
+        try:
+            return pd.read_csv(path, encoding=enc)
+        except Exception:
+            continue
+    return pd.read_csv(path, encoding_errors="ignore")
+
+def _legacy_ensure_numeric(df: pd.DataFrame, cols):
+    out = []
+    for c in cols:
+        s = df[c]
+        if s.dtype == object:
+            s = s.astype(str).str.replace(r"[%,]", "", regex=True).str.strip()
+        df[f"__num__{c}"] = pd.to_numeric(s, errors="coerce")
+        out.append(f"__num__{c}")
+    return out
+
+
+# ===== 케이스 =====
+# 각 함수는 (입력 경로, 출력용 임시 폴더) 를 받는다. 처리량 단위(줄/행)는 입력 종류별로 정해짐.
+# 함수 안의 import 는 CASES 의 모듈 목록으로 타이머 전에 미리 불러 두므로 측정 시간에 들어가지 않는다.
+def bench_load_csv_legacy(path: Path, out_dir: Path):
+    from logger_csv_to_graph import PLOT_COLUMN_PATTERN
+    df = _legacy_load_csv(path)
+    _legacy_ensure_numeric(df, [c for c in df.columns if PLOT_COLUMN_PATTERN.search(str(c))])
+
+def bench_load_csv(path: Path, out_dir: Path):
+    from logger_csv_to_graph import PLOT_COLUMN_PATTERN, load_csv, ensure_numeric
+    df = load_csv(path, usecols=lambda c: bool(PLOT_COLUMN_PATTERN.search(str(c))))
+    ensure_numeric(df, list(df.columns))
+
+def bench_process_csv(path: Path, out_dir: Path):
+    from logger_csv_to_graph import process_csv
+    exp_dir = out_dir / "bench_exp"
+    exp_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = exp_dir / "periodic_log.csv"
+    if not csv_path.exists():
+        shutil.copy2(path, csv_path)
+    process_csv(csv_path, out_dir / "analyze")
+
+def bench_parse_log(path: Path, out_dir: Path):
+    from openvins_timing_parser import parse_log
+    parse_log(path, workers=1)
+
+def bench_parse_log_parallel(path: Path, out_dir: Path):
+    from parallel_log_scan import parallel_parse_log
+    parallel_parse_log(path, chunk_bytes=4 << 20)
+
+def bench_openvins_totals(path: Path, out_dir: Path):
+    from component_log_to_csv import parse_openvins_totals
+    parse_openvins_totals(path, workers=1)
+
+def bench_klt_parse(path: Path, out_dir: Path):
+    from openvins_klt_parser import parse_klt_log, klt_stats
+    klt_stats(parse_klt_log(path))
+
+def bench_nvtx_split(path: Path, out_dir: Path):
+    from component_log_to_csv import split_nvtx
+    split_nvtx(path, "bench", out_dir)
+
+def bench_tegrastats(path: Path, out_dir: Path):
+    from tegrastats_to_csv import parse_tegrastats
+    parse_tegrastats(path)
+
+# 이름 → (입력 종류, 함수, 미리 import 할 모듈)
+CASES = {
+    "load_csv_legacy": ("periodic_log", bench_load_csv_legacy, ("logger_csv_to_graph",)),
+    "load_csv": ("periodic_log", bench_load_csv, ("logger_csv_to_graph",)),
+    "process_csv": ("periodic_log", bench_process_csv, ("logger_csv_to_graph",)),
+    "parse_log": ("illixr_log", bench_parse_log, ("openvins_timing_parser", "parallel_log_scan")),
+    "parse_log_parallel": ("illixr_log", bench_parse_log_parallel, ("parallel_log_scan", "openvins_timing_parser")),
+    "openvins_totals": ("illixr_log", bench_openvins_totals, ("component_log_to_csv",)),
+    "klt_parse": ("illixr_log", bench_klt_parse, ("openvins_klt_parser",)),
+    "nvtx_split": ("nvtx_csv", bench_nvtx_split, ("component_log_to_csv",)),
+    # 같은 스레드 프레임이 연달아 겹치는 trace (nvtx_hierarchy 스윕 최악 경우)
+    "nvtx_split_overlap": ("nvtx_csv_overlap", bench_nvtx_split, ("component_log_to_csv",)),
+    "tegrastats": ("tegrastats_log", bench_tegrastats, ("tegrastats_to_csv",)),
+}
+
+# 기준값 대비 허용 범위: 처리량이 20% 넘게 떨어지거나 peak RSS 가 25% 넘게 늘면 회귀
+THROUGHPUT_DROP_LIMIT = 0.20
+RSS_GROWTH_LIMIT = 0.25
+
+
+# ===== 입력 생성 =====
+def _count_lines(path: Path) -> int:
+    n = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            n += block.count(b"\n")
+    return n
+
+def prepare_inputs(scale: float) -> dict:
+    """입력 종류 → (경로, 처리 단위 수). 같은 크기 파일이 있으면 재사용"""
+    specs = {
+        "periodic_log": ("periodic_log_{n}.csv", int(1_000_000 * scale),
+                         lambda p, n: synthetic_data.generate_periodic_log(p, n_rows=n)),
+        "illixr_log": ("illixr_{n}.log", int(50_000 * scale),
+                       lambda p, n: synthetic_data.generate_illixr_log(p, n_frames=n)),
+        "nvtx_csv": ("nvtx_pushpop_{n}.csv", int(100_000 * scale),
+                     lambda p, n: synthetic_data.generate_nvtx_pushpop_csv(p, n_frames=n)),
+        "nvtx_csv_overlap": ("nvtx_pushpop_overlap_{n}.csv", int(100_000 * scale),
+                             lambda p, n: synthetic_data.generate_nvtx_pushpop_csv(p, n_frames=n,
+                                                                                   overlap_frames=True)),
+        "tegrastats_log": ("tegrastats_{n}.txt", int(200_000 * scale),
+                           lambda p, n: synthetic_data.generate_tegrastats_log(p, n_lines=n)),
+    }
+    inputs = {}
+    for kind, (pattern, n, gen) in specs.items():
+        p = WORK_DIR / pattern.format(n=n)
+        if not p.exists():
+            print(f"[INFO] 합성 입력 생성: {kind} (n={n}) → {p}")
+            gen(p, n)
+        inputs[kind] = (p, _count_lines(p))
+    return inputs
+
+
+# ===== 실행 =====
+def _reset_peak_rss():
+    """VmHWM 을 현재 RSS 로 초기화 (리눅스 4.0+, 실패하면 그대로)"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def _peak_rss_mb() -> float:
+    """이 프로세스의 peak RSS. /proc 이 없으면 ru_maxrss (exec 전 최대값이 섞일 수 있음)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024.0  # kB
+    except OSError:
+        pass
+    if resource is None:
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024.0 / (1024.0 if sys.platform == "darwin" else 1.0)
+
+def _case_worker(name: str, path: str, out_dir: str, queue):
+    import os
+    import importlib
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    _kind, fn, modules = CASES[name]
+    for m in modules:
+        importlib.import_module(m)
+    _reset_peak_rss()
+    t0 = time.perf_counter()
+    fn(Path(path), Path(out_dir))
+    elapsed = time.perf_counter() - t0
+    queue.put({"elapsed_s": elapsed, "peak_rss_mb": _peak_rss_mb()})
+
+def run_case(name: str, path: Path, units: int, repeat: int = 1) -> dict:
+    """별도 프로세스에서 repeat 번 실행해 가장 빠른 시간을 쓴다"""
+    ctx = mp.get_context("spawn")
+    runs = []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(dir=WORK_DIR) as out_dir:
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_case_worker, args=(name, str(path), out_dir, queue))
+            proc.start()
+            runs.append(queue.get())
+            proc.join()
+    best = min(runs, key=lambda r: r["elapsed_s"])
+    size_mb = path.stat().st_size / 1e6
+    elapsed = best["elapsed_s"]
+    return {
+        "case": name,
+        "input": str(path),
+        "input_mb": size_mb,
+        "units": units,
+        "elapsed_s": elapsed,
+        "units_per_s": units / elapsed if elapsed > 0 else float("nan"),
+        "mb_per_s": size_mb / elapsed if elapsed > 0 else float("nan"),
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+    }
+
+
+# ===== 기준값 비교 =====
+def scale_mismatches(results: list, baseline: dict, scale: float) -> list:
+    """기준값과 입력 배율이 다른 케이스 목록 — 처리량 / RSS 가 입력 크기에 따라 달라 비교할 수 없다"""
+    return [f"{r['case']}: scale {scale:g} != baseline {baseline[r['case']].get('scale', 1.0):g}"
+            for r in results
+            if r["case"] in baseline and float(baseline[r["case"]].get("scale", 1.0)) != float(scale)]
+
+def compare_to_baseline(results: list, baseline: dict, scale: float) -> list:
+    """회귀 목록 반환. 기준값은 {case: {"units_per_s", "peak_rss_mb", "scale"}}, 배율이 다른 케이스는 건너뜀"""
+    regressions = []
+    for r in results:
+        base = baseline.get(r["case"])
+        if not base or float(base.get("scale", 1.0)) != float(scale):
+            continue
+        if r["units_per_s"] < base["units_per_s"] * (1.0 - THROUGHPUT_DROP_LIMIT):
+            regressions.append(f"{r['case']}: throughput {r['units_per_s']:.0f}/s "
+                               f"< baseline {base['units_per_s']:.0f}/s")
+        if r["peak_rss_mb"] > base["peak_rss_mb"] * (1.0 + RSS_GROWTH_LIMIT):
+            regressions.append(f"{r['case']}: peak RSS {r['peak_rss_mb']:.1f} MB "
+                               f"> baseline {base['peak_rss_mb']:.1f} MB")
+    return regressions
+
+def main():
+    ap = argparse.ArgumentParser(description="ILLIXR logging tool benchmark")
+    ap.add_argument("--scale", type=float, default=1.0,
+                    help="입력 크기 배율 (1.0 = periodic 1M 행, illixr.log 50k 프레임, NVTX 100k 프레임)")
+    ap.add_argument("--cases", default=None, help="실행할 케이스 이름 정규식")
+    ap.add_argument("--repeat", type=int, default=1, help="케이스별 반복 횟수 (최솟값 사용)")
+    ap.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="기준값 JSON")
+    ap.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    args = ap.parse_args()
+
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
+    inputs = prepare_inputs(args.scale)
+
+    results = []
+    for name, (kind, _fn, _modules) in CASES.items():
+        if args.cases and not re.search(args.cases, name):
+            continue
+        path, units = inputs[kind]
+        r = run_case(name, path, units, args.repeat)
+        results.append(r)
+        print(f"[BENCH] {name:<18} {r['elapsed_s']:8.3f} s  {r['units_per_s']:12.0f} lines/s  "
+              f"{r['mb_per_s']:8.1f} MB/s  peak {r['peak_rss_mb']:8.1f} MB")
+
+    out_json = WORK_DIR / "bench_results.json"
+    out_json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"[SAVED] {out_json}")
+
+    if args.save_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        baseline.update({r["case"]: {"units_per_s": r["units_per_s"], "peak_rss_mb": r["peak_rss_mb"],
+                                     "scale": args.scale} for r in results})
+        args.baseline.write_text(json.dumps(baseline, indent=2), encoding="utf-8")
+        print(f"[SAVED] baseline → {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"[INFO] 기준값 파일이 없습니다 ({args.baseline}). --save-baseline 으로 생성하세요.")
+        return
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    mismatched = scale_mismatches(results, baseline, args.scale)
+    if mismatched:
+        for msg in mismatched:
+            print(f"[WARN] {msg}")
+        print("[WARN] 입력 배율이 달라 비교하지 않습니다. 같은 --scale 로 다시 실행하거나 --save-baseline 으로 갱신하세요.")
+        raise SystemExit(2)
+    regressions = compare_to_baseline(results, baseline, args.scale)
+    if regressions:
+        for msg in regressions:
+            print(f"[REGRESSION] {msg}")
+        raise SystemExit(1)
+    print("[OK] 기준값 대비 회귀 없음")
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,24 @@
 import re
 import os
+import argparse
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
+import multirun
+import parallel_log_scan
+import nvtx_hierarchy
+import cuda_gpu_attribution
+import profiling
+from log_input import open_input, resolve_input
+
 # ======================================================================
 # 설정
 # ======================================================================
 BASE_DIR = Path("/home/nokdujeon/kangseok/ILLIXR/build/logger")  # build/logger
 ANALYZE_DIR = Path("/home/nokdujeon/kangseok/ILLIXR/analyze/data")
-ANALYZE_DIR.mkdir(parents=True, exist_ok=True)
+MULTIRUN_DIR = ANALYZE_DIR.parent / "multirun"  # --multi-run 결과: multirun/<app>/
+NVTX_CSV_NAME = "illixr_nvtx_pushpop_trace.csv"
 
 # ======================================================================
 # 유틸
@@ -31,34 +41,154 @@ def clean_name(name: str) -> str:
         name = name.split(":", 1)[0]
     return name.strip()
 
+OPENVINS_TOTAL_PATTERN = re.compile(r"\[TIME\]:\s*([\d\.]+)\s*ms\s*for\s*total")
+
 # ======================================================================
-# 처리 대상: build/logger 내의 *_nsys 폴더 모두
+# 단계별 처리
 # ======================================================================
-apps = [d for d in subdirs(BASE_DIR) if d.name.endswith("_nsys")]
-if not apps:
-    raise SystemExit(f"[INFO] *_nsys 폴더가 없습니다: {BASE_DIR}")
-
-summary = []
-
-for app_dir in sorted(apps):
-    app_name = app_dir.name.replace("_nsys", "")
-    print(f"\n=== APP: {app_name} ({app_dir}) ===")
-
+def find_run_files(app_dir: Path):
+    """최신 런 폴더와 그 안의 illixr.log / NVTX CSV 경로"""
     # 최신 런 폴더 탐색 (예: build/logger/openxr_nsys/20250904_201556/)
+    # (illixr.log.gz, *.csv.zst 처럼 압축된 파일이 있으면 그것을 사용)
     run_dir = latest_dir_by_mtime(app_dir)
     # 만약 바로 파일이 있는 구조면 run_dir 그대로, 아니면 하위 최신 폴더 한 번 더 확인
-    log_file = run_dir / "illixr.log"
-    nvtx_csv = run_dir / "illixr_nvtx_pushpop_trace.csv"
+    log_file = resolve_input(run_dir / "illixr.log")
+    nvtx_csv = resolve_input(run_dir / NVTX_CSV_NAME)
     if not log_file.exists() or not nvtx_csv.exists():
         # 하위에 한 단계 더 있을 수 있으니 한 번 더 최신 디렉토리 탐색
         run_dir2 = latest_dir_by_mtime(run_dir)
-        log_file2 = run_dir2 / "illixr.log"
-        nvtx_csv2 = run_dir2 / "illixr_nvtx_pushpop_trace.csv"
+        log_file2 = resolve_input(run_dir2 / "illixr.log")
+        nvtx_csv2 = resolve_input(run_dir2 / NVTX_CSV_NAME)
         if log_file2.exists():
             log_file = log_file2
         if nvtx_csv2.exists():
             nvtx_csv = nvtx_csv2
         run_dir = run_dir2
+    return run_dir, log_file, nvtx_csv
+
+def find_cuda_traces(run_dir: Path):
+    """nsys export SQLite 또는 cuda_gpu_trace / cuda_api_trace CSV 쌍. 없으면 None"""
+    sqlite_path = run_dir / "illixr.sqlite"  # sqlite3 는 압축 파일을 열 수 없음
+    if sqlite_path.exists():
+        return {"sqlite": sqlite_path}
+    gpu_csv = resolve_input(run_dir / "illixr_cuda_gpu_trace.csv")
+    api_csv = resolve_input(run_dir / "illixr_cuda_api_trace.csv")
+    if gpu_csv.exists() and api_csv.exists():
+        return {"gpu": gpu_csv, "api": api_csv}
+    return None
+
+def parse_openvins_totals(log_file: Path, workers: int = None) -> list:
+    """illixr.log → OpenVINS total 실행시간 리스트(ns). 큰 파일은 구간 병렬 파싱 (workers=1 이면 직렬)"""
+    with profiling.stage("parse"):
+        if parallel_log_scan.use_parallel(log_file, workers):
+            return parallel_log_scan.parallel_openvins_totals(log_file, workers)
+
+        time_totals = []
+        with open_input(log_file, "r", errors="ignore") as f:
+            for line in f:
+                m = OPENVINS_TOTAL_PATTERN.search(line)
+                if m:
+                    ns_value = int(float(m.group(1)) * 1_000_000)  # ms → ns
+                    time_totals.append(ns_value)
+        return time_totals
+
+MIN_STAGE_ROWS = 100  # 이보다 짧은 range 이름은 저장하지 않음
+
+def load_nvtx_stages(nvtx_csv: Path, hierarchy_dir: Path = None):
+    """
+    NVTX range trace CSV → (Name 정리 후 DataFrame, 값 컬럼 목록). 필요한 컬럼이 없으면 (None, None)
+    push/pop 스택은 제외 규칙 적용 전 전체 trace 로 다시 세워서 Self (ns)(자식 range 제외 시간)를 함께 계산한다.
+    hierarchy_dir 를 주면 range 경로별 시간표와 folded-stack 파일도 저장.
+    """
+    with profiling.stage("load"), open_input(nvtx_csv, "rb") as f:
+        df = pd.read_csv(f)
+    # 필요한 컬럼만
+    cols_needed = [c for c in ["Name", "Duration (ns)"] if c in df.columns]
+    if len(cols_needed) < 2:
+        print(f"[WARN] NVTX CSV에 필요한 컬럼이 없습니다: {nvtx_csv}")
+        return None, None
+
+    out_cols = ["Duration (ns)"]
+    if "Start (ns)" in df.columns:
+        with profiling.stage("summarize"):
+            df = nvtx_hierarchy.build_hierarchy(df)
+            df["Self (ns)"] = df["self_ns"]
+        out_cols.append("Self (ns)")
+        if hierarchy_dir is not None:
+            with profiling.stage("write"):
+                hierarchy_dir.mkdir(parents=True, exist_ok=True)
+                nvtx_hierarchy.path_summary(df).to_csv(hierarchy_dir / "nvtx_path_times.csv", index=False)
+                nvtx_hierarchy.stage_summary(df).to_csv(hierarchy_dir / "nvtx_stage_times.csv",
+                                                        index=False, float_format="%.3f")
+                nvtx_hierarchy.write_folded(df, hierarchy_dir / "nvtx.folded")
+        out_cols.append("Start (ns)")  # 단계 간 시간 정렬(periodicity_analysis)용
+    else:
+        print(f"[WARN] Start (ns) 컬럼이 없어 Self (ns) 없이 저장합니다: {nvtx_csv}")
+    with profiling.stage("clean"):
+        df = df[["Name"] + out_cols].copy()
+
+        # 제외 규칙
+        exclude_mask = (
+            df["Name"].astype(str).str.contains(r"record_command_buffer", case=False, na=False) |
+            df["Name"].astype(str).str.contains(r"get fast pose", case=False, na=False)
+        )
+        df = df[~exclude_mask]
+
+        # Name 정리
+        df["Name"] = df["Name"].astype(str).apply(clean_name)
+    return df, out_cols
+
+def nvtx_stage_frames(nvtx_csv: Path, hierarchy_dir: Path = None):
+    """NVTX range trace CSV → ({Name: 값 컬럼 DataFrame}, skipped). MIN_STAGE_ROWS 미만인 Name 은 skipped 로만 셈"""
+    df, out_cols = load_nvtx_stages(nvtx_csv, hierarchy_dir)
+    if df is None:
+        return {}, 0
+    frames = {}
+    skipped = 0
+    with profiling.stage("group"):
+        for name, group in df.groupby("Name"):
+            if len(group) >= MIN_STAGE_ROWS:
+                frames[name] = group[out_cols].reset_index(drop=True)
+            else:
+                skipped += 1
+    return frames, skipped
+
+def write_stage_frames(frames: dict, app_name: str, out_dir: Path) -> int:
+    """{stage: DataFrame} → out_dir/<stage>_<app>.csv (csv_to_graph 가 읽는 이름 규칙)"""
+    with profiling.stage("write"):
+        for name, values in frames.items():
+            values.to_csv(out_dir / f"{safe_filename(name)}_{app_name}.csv", index=False)
+    return len(frames)
+
+def split_nvtx(nvtx_csv: Path, app_name: str, out_dir: Path, hierarchy_dir: Path = None):
+    """NVTX range trace CSV 를 Name 별 CSV 로 분리 저장. 반환: (saved, skipped)"""
+    frames, skipped = nvtx_stage_frames(nvtx_csv, hierarchy_dir)
+    return write_stage_frames(frames, app_name, out_dir), skipped
+
+def attribute_cuda(run_dir: Path, nvtx_csv: Path, app_name: str):
+    """CUDA 커널/memcpy → NVTX range 귀속 (trace 가 있을 때만). 결과는 analyze/<app>_nsys"""
+    cuda = find_cuda_traces(run_dir)
+    if cuda is None:
+        return
+    with profiling.stage("load"):
+        if "sqlite" in cuda:
+            gpu, api, nvtx = cuda_gpu_attribution.load_sqlite(cuda["sqlite"])
+        elif nvtx_csv.exists():
+            gpu = cuda_gpu_attribution.load_gpu_trace_csv(cuda["gpu"])
+            api = cuda_gpu_attribution.load_api_trace_csv(cuda["api"])
+            nvtx = nvtx_hierarchy.load_nvtx_trace(nvtx_csv)
+        else:
+            return
+    with profiling.stage("summarize"):
+        cuda_gpu_attribution.run(gpu, api, nvtx, ANALYZE_DIR.parent / f"{app_name}_nsys",
+                                 title=f"CPU vs GPU per stage — {app_name}")
+
+def process_app(app_dir: Path) -> dict:
+    app_name = app_dir.name.replace("_nsys", "")
+    print(f"\n=== APP: {app_name} ({app_dir}) ===")
+
+    with profiling.stage("discover"):
+        run_dir, log_file, nvtx_csv = find_run_files(app_dir)
 
     print(f"[INFO] run_dir : {run_dir}")
     print(f"[INFO] illixr : {'OK' if log_file.exists() else 'MISSING'} -> {log_file}")
@@ -69,17 +199,10 @@ for app_dir in sorted(apps):
     # -----------------------------
     ov_rows = 0
     if log_file.exists():
-        pattern = re.compile(r"\[TIME\]:\s*([\d\.]+)\s*ms\s*for\s*total")
-        time_totals = []
-        with open(log_file, "r", errors="ignore") as f:
-            for line in f:
-                m = pattern.search(line)
-                if m:
-                    ns_value = int(float(m.group(1)) * 1_000_000)  # ms → ns
-                    time_totals.append(ns_value)
-        ov_df = pd.DataFrame({"Duration (ns)": time_totals})
+        ov_df = pd.DataFrame({"Duration (ns)": parse_openvins_totals(log_file)})
         out_ov = ANALYZE_DIR / f"OpenVINS_{app_name}.csv"
-        ov_df.to_csv(out_ov, index=False)
+        with profiling.stage("write"):
+            ov_df.to_csv(out_ov, index=False)
         ov_rows = len(ov_df)
         print(f"[OK] OpenVINS totals: {ov_rows} rows → {out_ov}")
     else:
@@ -91,45 +214,142 @@ for app_dir in sorted(apps):
     saved = 0
     skipped = 0
     if nvtx_csv.exists():
-        df = pd.read_csv(nvtx_csv)
-        # 필요한 컬럼만
-        cols_needed = [c for c in ["Name", "Duration (ns)"] if c in df.columns]
-        if len(cols_needed) < 2:
-            print(f"[WARN] NVTX CSV에 필요한 컬럼이 없습니다: {nvtx_csv}")
-        else:
-            df = df[cols_needed].copy()
-
-            # 제외 규칙
-            exclude_mask = (
-                df["Name"].astype(str).str.contains(r"record_command_buffer", case=False, na=False) |
-                df["Name"].astype(str).str.contains(r"get fast pose", case=False, na=False)
-            )
-            df = df[~exclude_mask]
-
-            # Name 정리
-            df["Name"] = df["Name"].astype(str).apply(clean_name)
-
-            # 저장
-            for name, group in df.groupby("Name"):
-                if len(group) >= 100:
-                    out_csv = ANALYZE_DIR / f"{safe_filename(name)}_{app_name}.csv"
-                    group[["Duration (ns)"]].to_csv(out_csv, index=False)
-                    saved += 1
-                else:
-                    skipped += 1
-            print(f"[OK] NVTX 분리 저장: saved={saved}, skipped(<100)={skipped}")
+        # 계층 분석 결과는 csv_to_graph 출력과 같은 앱 폴더(analyze/<app>_nsys)에 저장
+        saved, skipped = split_nvtx(nvtx_csv, app_name, ANALYZE_DIR,
+                                    hierarchy_dir=ANALYZE_DIR.parent / f"{app_name}_nsys")
+        print(f"[OK] NVTX 분리 저장: saved={saved}, skipped(<100)={skipped}")
     else:
         print("[SKIP] NVTX CSV 미존재")
 
-    summary.append({
+    # -----------------------------
+    # 3) CUDA 커널/memcpy → NVTX range 귀속 (trace 가 있을 때만)
+    # -----------------------------
+    attribute_cuda(run_dir, nvtx_csv, app_name)
+
+    return {
         "app": app_name,
         "run_dir": str(run_dir),
         "openvins_rows": ov_rows,
         "nvtx_saved": saved,
         "nvtx_skipped": skipped
-    })
+    }
+
+# ======================================================================
+# 멀티 런: 앱 폴더 아래 모든 런 폴더를 run id 로 구분해 합침
+# ======================================================================
+def has_run_files(d: Path) -> bool:
+    return resolve_input(d / "illixr.log").exists() or resolve_input(d / NVTX_CSV_NAME).exists()
+
+def list_run_dirs(app_dir: Path) -> list:
+    """[(run_id, run_dir), ...] 오래된 순. find_run_files 처럼 한 단계 아래 폴더까지 확인"""
+    by_mtime = lambda d: d.stat().st_mtime
+    runs = []
+    for d in sorted(subdirs(app_dir), key=by_mtime):
+        if has_run_files(d):
+            runs.append((d.name, d))
+            continue
+        for sub in sorted(subdirs(d), key=by_mtime):
+            if has_run_files(sub):
+                runs.append((f"{d.name}_{sub.name}", sub))
+    if not runs and has_run_files(app_dir):
+        runs.append((app_dir.name, app_dir))
+    return runs
+
+def _ms_stats(st: dict) -> dict:
+    """ns 통계 → ms 컬럼 (std 는 표본 표준편차)"""
+    n = st["n"]
+    out = {"n": n, "mean_ms": st["mean"] / 1e6,
+           "std_ms": float(np.sqrt(st["m2"] / (n - 1))) / 1e6 if n > 1 else np.nan}
+    for k in ("min", "p50", "p95", "max"):
+        if k in st:
+            out[f"{k}_ms"] = st[k] / 1e6
+    return out
+
+def process_app_multirun(app_dir: Path) -> dict:
+    """
+    모든 런 폴더를 처리. 런 하나씩 stage 별 값을 정렬 spool 로 내려 두고(메모리에는 모멘트만),
+    마지막에 stage 별로 spool 을 k-way 병합해 merged/<stage>_<app>.csv 와 pooled 통계를 만든다.
+    """
+    app_name = app_dir.name.replace("_nsys", "")
+    with profiling.stage("discover"):
+        runs = list_run_dirs(app_dir)
+    print(f"\n=== APP (multi-run): {app_name} ({app_dir}) runs={len(runs)} ===")
+    app_out = MULTIRUN_DIR / app_name
+
+    spools = {}    # stage → [(run_id, spool 경로)]
+    per_run = []   # stage/run 별 통계 (ns)
+    for run_id, run_dir in runs:
+        log_file = resolve_input(run_dir / "illixr.log")
+        nvtx_csv = resolve_input(run_dir / NVTX_CSV_NAME)
+
+        stage_values = {}
+        if log_file.exists():
+            stage_values["OpenVINS"] = pd.DataFrame({"Duration (ns)": parse_openvins_totals(log_file)})
+        if nvtx_csv.exists():
+            stage_values.update(nvtx_stage_frames(nvtx_csv)[0])
+
+        for stage, values in stage_values.items():
+            if values.empty:
+                continue
+            spool = app_out / "runs" / run_id / f"{safe_filename(stage)}.csv"
+            with profiling.stage("write"):
+                st = multirun.write_spool(values, spool)
+            spools.setdefault(stage, []).append((run_id, spool))
+            per_run.append({"stage": stage, "run": run_id, **st})
+        print(f"[OK] run {run_id}: stages={len(stage_values)}")
+        del stage_values
+
+    if not per_run:
+        print("[SKIP] 처리할 런이 없습니다")
+        return {"app": app_name, "runs": len(runs), "stages": 0}
+
+    pooled = []
+    for stage, items in spools.items():
+        stats = [r for r in per_run if r["stage"] == stage]
+        n, mean, m2 = multirun.combine_moments(stats)
+        merged = app_out / "merged" / f"{safe_filename(stage)}_{app_name}.csv"
+        with profiling.stage("summarize"):
+            qs = multirun.merge_spools(items, merged, n)
+        run_means = np.array([r["mean"] for r in stats]) / 1e6
+        row = {"Stage": stage, "runs": len(items), "n": n, "mean_ms": mean / 1e6,
+               "std_ms": float(np.sqrt(m2 / (n - 1))) / 1e6 if n > 1 else np.nan}
+        row.update({f"p{int(q * 100)}_ms": v / 1e6 for q, v in qs.items()})
+        # 런 간 변동: 런 평균들의 표준편차와 변동계수
+        row["run_mean_std_ms"] = float(run_means.std(ddof=1)) if len(run_means) > 1 else np.nan
+        row["run_mean_cv_pct"] = row["run_mean_std_ms"] / float(run_means.mean()) * 100.0
+        pooled.append(row)
+
+    per_run_df = pd.DataFrame([{"Stage": r["stage"], "Run": r["run"], **_ms_stats(r)} for r in per_run])
+    per_run_df.to_csv(app_out / "per_run_stats.csv", index=False, float_format="%.4f")
+    pooled_df = pd.DataFrame(pooled).sort_values("mean_ms", ascending=False)
+    pooled_df.to_csv(app_out / "pooled_stats.csv", index=False, float_format="%.4f")
+    print(f"[OK] per-run / pooled 통계 저장 → {app_out}")
+    return {"app": app_name, "runs": len(runs), "stages": len(spools)}
+
+# ======================================================================
+# 처리 대상: build/logger 내의 *_nsys 폴더 모두
+# ======================================================================
+def main():
+    ap = argparse.ArgumentParser(description="ILLIXR nsys 로그 → analyze/data CSV")
+    ap.add_argument("--multi-run", action="store_true",
+                    help="최신 런만이 아니라 앱별 모든 런 폴더를 처리해 analyze/multirun/<app>/ 에 합침")
+    profiling.add_arguments(ap)
+    args = ap.parse_args()
+    profiling.enable_from_args(args, "component_log_to_csv")
+
+    ANALYZE_DIR.mkdir(parents=True, exist_ok=True)
+    with profiling.stage("discover"):
+        apps = [d for d in subdirs(BASE_DIR) if d.name.endswith("_nsys")]
+    if not apps:
+        raise SystemExit(f"[INFO] *_nsys 폴더가 없습니다: {BASE_DIR}")
+
+    handler = process_app_multirun if args.multi_run else process_app
+    summary = [handler(app_dir) for app_dir in sorted(apps)]
+
+    # 요약 출력
+    print("\n=== SUMMARY ===")
+    for s in summary:
+        print(s)
 
-# 요약 출력
-print("\n=== SUMMARY ===")
-for s in summary:
-    print(s)
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,16 @@ import matplotlib.pyplot as plt
 DATA_DIR = "/home/nokdujeon/kangseok/ILLIXR/analyze/data"
 ANALYZE_DIR = "/home/nokdujeon/kangseok/ILLIXR/analyze"  # 앱별 하위 폴더 생성 기준
 
-def read_duration_ms(path):
-    s = pd.read_csv(path)["Duration (ns)"].astype("int64")
-    return (s / 1_000_000.0).reset_index(drop=True)  # ns→ms
+def read_times_ms(path):
+    """(inclusive ms, self ms). Self (ns) 컬럼이 없으면(OpenVINS total 등) self = inclusive"""
+    return times_ms(pd.read_csv(path))
+
+def times_ms(df: pd.DataFrame):
+    """stage DataFrame(ns) → (inclusive ms, self ms). pipeline_runner 처럼 메모리에서 바로 넘길 때도 사용"""
+    dur = (df["Duration (ns)"].astype("int64") / 1_000_000.0).reset_index(drop=True)
+    if "Self (ns)" not in df.columns:
+        return dur, dur
+    return dur, (df["Self (ns)"].astype("int64") / 1_000_000.0).reset_index(drop=True)
 
 def normalize_x(n_points: int):
     if n_points == 1:
@@ -32,23 +39,28 @@ def ensure_dir(p):
     return p
 
 def plot_for_app(app: str, files_for_app: list):
-    # 앱별 출력 폴더(예: analyze/spaceship_nsys)
-    out_dir = ensure_dir(os.path.join(ANALYZE_DIR, f"{app}_nsys"))
-
     # ===== 데이터 읽기: {stage: series(ms)} =====
     data = {}
+    self_data = {}
     for p in files_for_app:
         name_no_ext = os.path.splitext(os.path.basename(p))[0]
         stage, _app = split_stage_app(name_no_ext)
         try:
-            data[stage] = read_duration_ms(p)
+            data[stage], self_data[stage] = read_times_ms(p)
         except Exception as e:
             print(f"[WARN] 읽기 실패: {p} ({e})")
 
+    plot_stage_times(app, data, self_data)
+
+def plot_stage_times(app: str, data: dict, self_data: dict):
+    """{stage: inclusive ms Series}, {stage: self ms Series} → 라인 그래프 / 스택 막대 / 요약 CSV"""
     if not data:
         print(f"[INFO] {app}: 데이터 없음")
         return
 
+    # 앱별 출력 폴더(예: analyze/spaceship_nsys)
+    out_dir = ensure_dir(os.path.join(ANALYZE_DIR, f"{app}_nsys"))
+
     # ===== (1) 라인 그래프: 평균 실행시간 상위 2개 + 나머지 =====
     stats = sorted(((k, v.mean()) for k, v in data.items()),
                    key=lambda x: x[1], reverse=True)
@@ -94,7 +106,9 @@ def plot_for_app(app: str, files_for_app: list):
     plt.close(fig)
 
     # ===== (2) 합계 기준 100% 스택 막대그래프 =====
-    stage_sums_ms = {name: s.sum() for name, s in data.items()}
+    # 중첩 range 가 부모/자식에 이중으로 잡히지 않도록 self 시간(자식 range 제외) 합계로 비율 계산
+    stage_sums_ms = {name: s.sum() for name, s in self_data.items()}
+    inclusive_ms = {name: s.sum() for name, s in data.items()}
     total_ms = sum(stage_sums_ms.values())
     if total_ms <= 0:
         print(f"[경고] {app}: 합계 0 → 스택 그래프 생략")
@@ -128,6 +142,7 @@ def plot_for_app(app: str, files_for_app: list):
     pd.DataFrame({
         "Stage": list(stage_sums_ms.keys()),
         "Total (ms)": list(stage_sums_ms.values()),
+        "Inclusive (ms)": [inclusive_ms[k] for k in stage_sums_ms.keys()],
         "Ratio (%)": [stage_ratios[k] for k in stage_sums_ms.keys()]
     }).sort_values("Ratio (%)", ascending=False).to_csv(summary_csv, index=False)
     print(f"[완료] {app}: 요약 CSV 저장 → {summary_csv}")
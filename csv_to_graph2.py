@@ -4,6 +4,8 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 
+from steady_state import TRIM_STEADY_STATE, trim_series
+
 DATA_DIR = "/home/nokdujeon/kangseok/ILLIXR/analyze/data"
 ANALYZE_DIR = "/home/nokdujeon/kangseok/ILLIXR/analyze"  # 앱별 하위 폴더 생성 기준
 
@@ -26,20 +28,30 @@ def ensure_dir(p):
     os.makedirs(p, exist_ok=True)
     return p
 
-def plot_app(app: str, csv_paths: list):
-    rows = []
+def plot_app(app: str, csv_paths: list, trim: bool = TRIM_STEADY_STATE):
+    series = {}
     for p in csv_paths:
         name_no_ext = os.path.splitext(os.path.basename(p))[0]
         stage, _app = split_stage_app(name_no_ext)
-        y = read_ms(p).dropna()
+        series.setdefault(stage, read_ms(p))
+    plot_stage_bars(app, series, trim)
+
+def plot_stage_bars(app: str, series: dict, trim: bool = TRIM_STEADY_STATE):
+    """
+    {stage: 실행시간 ms Series} → 평균 + min/max 막대그래프.
+    trim=True 면 stage 별로 warm-up / 종료 구간(MSER-5)을 잘라낸 뒤 통계를 낸다
+    """
+    rows = []
+    for stage, s in series.items():
+        y, info = trim_series(s, enabled=trim)
         if len(y) == 0:
             continue
         rows.append({
             "Stage": stage,
-            "n": int(len(y)),
             "mean_ms": float(y.mean()),
             "min_ms": float(y.min()),
             "max_ms": float(y.max()),
+            **info,
         })
 
     if not rows:
@@ -60,7 +72,7 @@ def plot_app(app: str, csv_paths: list):
     ax.set_ylabel("Time (ms)")
     ax.set_xticks(x)
     ax.set_xticklabels(labels, rotation=20, ha="right")
-    ax.set_title(f"Per-plugin mean with min/max — {app}")
+    ax.set_title(f"Per-plugin mean with min/max — {app}{' (steady state)' if trim else ''}")
     ax.grid(axis="y", alpha=0.3)
 
     # 값 표시
@@ -73,6 +85,8 @@ def plot_app(app: str, csv_paths: list):
     out_png = os.path.join(out_dir, "bar_mean_min_max.png")
     plt.savefig(out_png, dpi=150)
     plt.close(fig)
+    # 그래프에 쓴 통계와 잘라낸 범위(trim_head / trim_tail 샘플 수)
+    df.to_csv(os.path.join(out_dir, "bar_mean_min_max.csv"), index=False, float_format="%.4f")
     print(f"[완료] {app}: 저장 → {out_png}")
 
 def main():
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""
+cuda_gpu_attribution.py
+-----------------------
+nsys 의 CUDA GPU/API trace 를 NVTX range 에 귀속시켜 stage 별 CPU 시간과 GPU 시간을 나란히 보여준다.
+
+- 입력: (a) nsys stats CSV: cuda_gpu_trace, cuda_api_trace, nvtx_pushpop_trace
+        (b) nsys export SQLite: CUPTI_ACTIVITY_KIND_KERNEL/MEMCPY/MEMSET/RUNTIME, NVTX_EVENTS, StringIds
+- 커널/memcpy → (CorrId) → 런타임 API 호출(스레드, 호출 시각)
+  → 같은 스레드에서 그 시각을 감싸는 가장 안쪽 NVTX range (정렬 + searchsorted + 부모 따라 올라가기)
+- stage 별: CPU inclusive/self 시간, GPU busy 시간(구간 합집합), 커널/복사 수, H2D/D2H 바이트
+
+    python cuda_gpu_attribution.py --sqlite report.sqlite --out analyze/openxr_nsys
+    python cuda_gpu_attribution.py --nvtx illixr_nvtx_pushpop_trace.csv \\
+        --gpu-trace illixr_cuda_gpu_trace.csv --api-trace illixr_cuda_api_trace.csv --out analyze/openxr_nsys
+    python cuda_gpu_attribution.py --synthetic 2000      # 합성 trace 로 귀속 결과 검증
+"""
+
+import re
+import sqlite3
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from pathlib import Path
+
+import nvtx_hierarchy
+from log_input import open_input
+
+UNATTRIBUTED = "(no NVTX range)"
+
+# 컬럼 이름 정규화(소문자, 영문만) 후 후보 이름 → 표준 이름
+GPU_COLUMNS = {
+    "start": ("startns", "start"),
+    "end": ("endns", "end"),
+    "duration": ("durationns", "duration"),
+    "corr_id": ("corrid", "correlationid"),
+    "bytes": ("bytes", "bytesb"),
+    "bytes_kb": ("byteskb",),
+    "bytes_mb": ("bytesmb",),
+    "name": ("name", "kernelname", "operation"),
+}
+API_COLUMNS = {
+    "start": ("startns", "start"),
+    "end": ("endns", "end"),
+    "duration": ("durationns", "duration"),
+    "corr_id": ("corrid", "correlationid"),
+    "tid": ("tid", "threadid"),
+    "name": ("name", "apiname"),
+}
+
+COPY_KIND_PATTERNS = (
+    ("HtoD", re.compile(r"HtoD|Host-to-Device", re.I)),
+    ("DtoH", re.compile(r"DtoH|Device-to-Host", re.I)),
+    ("DtoD", re.compile(r"DtoD|Device-to-Device", re.I)),
+    ("PtoP", re.compile(r"PtoP|Peer-to-Peer", re.I)),
+)
+# CUPTI_ACTIVITY_MEMCPY_KIND
+CUPTI_COPY_KIND = {1: "HtoD", 2: "DtoH", 8: "DtoD", 10: "PtoP"}
+NVTX_PUSHPOP_EVENT = 59
+
+
+# ===== 입력: CSV =====
+def _norm(col: str) -> str:
+    return re.sub(r"[^a-z]", "", str(col).lower())
+
+def _canonical(df: pd.DataFrame, spec: dict, path) -> pd.DataFrame:
+    by_norm = {_norm(c): c for c in df.columns}
+    out = pd.DataFrame(index=df.index)
+    for key, aliases in spec.items():
+        for a in aliases:
+            if a in by_norm:
+                out[key] = df[by_norm[a]]
+                break
+    if "start" not in out.columns or "corr_id" not in out.columns:
+        raise ValueError(f"Start / CorrId 컬럼을 찾지 못했습니다: {path} ({list(df.columns)})")
+    if "end" not in out.columns:
+        out["end"] = out["start"] + out["duration"]
+    out["start"] = out["start"].astype(np.int64)
+    out["end"] = out["end"].astype(np.int64)
+    return out.drop(columns=["duration"], errors="ignore")
+
+def _read_csv(path) -> pd.DataFrame:
+    with open_input(path, "rb") as f:
+        return pd.read_csv(f)
+
+def load_gpu_trace_csv(path) -> pd.DataFrame:
+    """cuda_gpu_trace → [start, end, corr_id, name, kind, copy, bytes]"""
+    g = _canonical(_read_csv(path), GPU_COLUMNS, path)
+    name = g["name"].astype(str) if "name" in g.columns else pd.Series("", index=g.index)
+    g["name"] = name
+    g["kind"] = np.where(name.str.startswith("[CUDA memcpy"), "memcpy",
+                         np.where(name.str.startswith("[CUDA memset"), "memset", "kernel"))
+    g["copy"] = None
+    for kind, pat in COPY_KIND_PATTERNS:
+        g.loc[(g["kind"] == "memcpy") & g["copy"].isna() & name.str.contains(pat), "copy"] = kind
+    # nsys 는 Bytes (MB) 처럼 단위를 붙여 쓰는 버전이 있음 (10^3 / 10^6 기준)
+    if "bytes" in g.columns:
+        nbytes = pd.to_numeric(g["bytes"], errors="coerce")
+    elif "bytes_mb" in g.columns:
+        nbytes = pd.to_numeric(g["bytes_mb"], errors="coerce") * 1e6
+    elif "bytes_kb" in g.columns:
+        nbytes = pd.to_numeric(g["bytes_kb"], errors="coerce") * 1e3
+    else:
+        nbytes = pd.Series(np.nan, index=g.index)
+    g["bytes"] = nbytes.fillna(0).round().astype(np.int64)
+    g["corr_id"] = pd.to_numeric(g["corr_id"], errors="coerce")
+    return g[["start", "end", "corr_id", "name", "kind", "copy", "bytes"]]
+
+def load_api_trace_csv(path) -> pd.DataFrame:
+    """cuda_api_trace → [start, end, corr_id, tid, name]"""
+    a = _canonical(_read_csv(path), API_COLUMNS, path)
+    if "tid" not in a.columns:
+        raise ValueError(f"Tid 컬럼을 찾지 못했습니다: {path}")
+    a["corr_id"] = pd.to_numeric(a["corr_id"], errors="coerce")
+    a["tid"] = a["tid"].astype(np.int64)
+    if "name" not in a.columns:
+        a["name"] = ""
+    return a[["start", "end", "corr_id", "tid", "name"]]
+
+
+# ===== 입력: SQLite (nsys export --type sqlite) =====
+def _tables(con) -> set:
+    return {r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+def load_sqlite(path):
+    """(gpu, api, nvtx) — CSV 로더와 같은 컬럼. nvtx 는 build_hierarchy 입력 형식"""
+    con = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        tables = _tables(con)
+        parts = []
+        if "CUPTI_ACTIVITY_KIND_KERNEL" in tables:
+            k = pd.read_sql_query(
+                "SELECT k.start, k.end, k.correlationId AS corr_id, s.value AS name "
+                "FROM CUPTI_ACTIVITY_KIND_KERNEL k LEFT JOIN StringIds s ON s.id = k.shortName", con)
+            k["kind"], k["copy"], k["bytes"] = "kernel", None, 0
+            parts.append(k)
+        if "CUPTI_ACTIVITY_KIND_MEMCPY" in tables:
+            m = pd.read_sql_query(
+                "SELECT start, end, correlationId AS corr_id, bytes, copyKind "
+                "FROM CUPTI_ACTIVITY_KIND_MEMCPY", con)
+            m["copy"] = m.pop("copyKind").map(CUPTI_COPY_KIND)
+            m["kind"] = "memcpy"
+            m["name"] = "[CUDA memcpy " + m["copy"].fillna("other") + "]"
+            parts.append(m)
+        if "CUPTI_ACTIVITY_KIND_MEMSET" in tables:
+            s = pd.read_sql_query(
+                "SELECT start, end, correlationId AS corr_id, bytes FROM CUPTI_ACTIVITY_KIND_MEMSET", con)
+            s["kind"], s["copy"], s["name"] = "memset", None, "[CUDA memset]"
+            parts.append(s)
+        cols = ["start", "end", "corr_id", "name", "kind", "copy", "bytes"]
+        gpu = pd.concat(parts, ignore_index=True)[cols] if parts else pd.DataFrame(columns=cols)
+
+        # globalTid = (pid << 24) | tid
+        api = pd.read_sql_query(
+            "SELECT r.start, r.end, r.correlationId AS corr_id, r.globalTid % 16777216 AS tid, s.value AS name "
+            "FROM CUPTI_ACTIVITY_KIND_RUNTIME r LEFT JOIN StringIds s ON s.id = r.nameId", con)
+
+        nvtx_cols = ["Name", "Start (ns)", "End (ns)", "TID"]
+        if "NVTX_EVENTS" in tables:
+            nvtx = pd.read_sql_query(
+                "SELECT COALESCE(n.text, s.value) AS \"Name\", n.start AS \"Start (ns)\", n.end AS \"End (ns)\", "
+                "n.globalTid % 16777216 AS \"TID\" "
+                "FROM NVTX_EVENTS n LEFT JOIN StringIds s ON s.id = n.textId "
+                f"WHERE n.eventType = {NVTX_PUSHPOP_EVENT} AND n.end IS NOT NULL", con)
+        else:
+            nvtx = pd.DataFrame(columns=nvtx_cols)
+    finally:
+        con.close()
+    gpu["bytes"] = pd.to_numeric(gpu["bytes"], errors="coerce").fillna(0).astype(np.int64)
+    return gpu, api, nvtx
+
+
+# ===== 귀속 =====
+def enclosing_ranges(h: pd.DataFrame, tids: np.ndarray, times: np.ndarray) -> np.ndarray:
+    """
+    (tid, time) 마다 같은 스레드에서 start <= time < end 인 가장 안쪽 range 의 행 번호 (-1 = 없음).
+    시작 시각이 time 이하인 마지막 range 를 찾고, 그 range 가 이미 끝났으면 부모로 올라간다.
+    (push/pop range 는 제대로 중첩되므로 time 을 감싸는 range 는 반드시 그 조상 중에 있다)
+    """
+    start = h["Start (ns)"].to_numpy(dtype=np.int64)
+    end = h["End (ns)"].to_numpy(dtype=np.int64)
+    h_tid = h["TID"].to_numpy(dtype=np.int64)
+    parent = h["parent"].to_numpy(dtype=np.int64)
+
+    out = np.full(len(times), -1, dtype=np.int64)
+    for t in np.unique(tids):
+        rows = np.flatnonzero(h_tid == t)
+        if len(rows) == 0:
+            continue
+        # build_hierarchy 와 같은 순서: 시작 오름차순, 같은 시작이면 긴 것 먼저
+        rows = rows[np.lexsort((-end[rows], start[rows]))]
+        q = np.flatnonzero(tids == t)
+        tq = times[q]
+        pos = np.searchsorted(start[rows], tq, side="right") - 1
+        cand = np.where(pos >= 0, rows[np.maximum(pos, 0)], -1)
+        while True:
+            done_or_none = (cand < 0) | (end[np.maximum(cand, 0)] > tq)
+            if done_or_none.all():
+                break
+            walk = ~done_or_none
+            cand[walk] = parent[cand[walk]]
+        out[q] = cand
+    return out
+
+def attribute(gpu: pd.DataFrame, api: pd.DataFrame, h: pd.DataFrame) -> pd.DataFrame:
+    """GPU 활동마다 호출 API / 스레드 / 감싸는 NVTX range(stage, path) 를 붙인다"""
+    calls = api[["corr_id", "start", "tid", "name"]].rename(
+        columns={"start": "api_start", "name": "api_name"}).dropna(subset=["corr_id"])
+    calls = calls.drop_duplicates("corr_id")
+    g = gpu.merge(calls, on="corr_id", how="left")
+
+    has_call = g["api_start"].notna().to_numpy()
+    tids = np.where(has_call, g["tid"].fillna(-1), -1).astype(np.int64)
+    times = g["api_start"].fillna(0).to_numpy(dtype=np.int64)
+    row = np.full(len(g), -1, dtype=np.int64)
+    if len(h) and has_call.any():
+        row[has_call] = enclosing_ranges(h, tids[has_call], times[has_call])
+
+    found = row >= 0
+    stage = np.full(len(g), UNATTRIBUTED, dtype=object)
+    path = np.full(len(g), UNATTRIBUTED, dtype=object)
+    if found.any():
+        stage[found] = h["stage"].to_numpy()[row[found]]
+        path[found] = h["path"].to_numpy()[row[found]]
+    g["nvtx_row"] = row
+    g["stage"] = stage
+    g["path"] = path
+    return g
+
+
+# ===== 집계 =====
+def interval_union_ns(start: np.ndarray, end: np.ndarray) -> int:
+    """겹치는 구간을 합친 총 길이. start 오름차순 정렬 가정"""
+    if len(start) == 0:
+        return 0
+    run_end = np.maximum.accumulate(end)
+    new = np.r_[True, start[1:] > run_end[:-1]]
+    idx = np.flatnonzero(new)
+    seg_end = np.maximum.reduceat(end, idx)
+    return int((seg_end - start[idx]).sum())
+
+def gpu_report(g: pd.DataFrame, key: str) -> pd.DataFrame:
+    """key(stage / path) 별 GPU busy 시간(합집합)과 합계, 개수, 복사 바이트"""
+    g = g.sort_values([key, "start"], kind="stable")
+    keys = g[key].to_numpy()
+    start = g["start"].to_numpy(dtype=np.int64)
+    end = g["end"].to_numpy(dtype=np.int64)
+    bounds = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1], True])
+
+    busy = {keys[a]: interval_union_ns(start[a:b], end[a:b]) for a, b in zip(bounds[:-1], bounds[1:])}
+    dur = end - start
+    df = pd.DataFrame({
+        key: keys, "dur": dur,
+        "kernel": g["kind"].to_numpy() == "kernel",
+        "memcpy": g["kind"].to_numpy() == "memcpy",
+        "h2d": np.where(g["copy"].to_numpy() == "HtoD", g["bytes"].to_numpy(), 0),
+        "d2h": np.where(g["copy"].to_numpy() == "DtoH", g["bytes"].to_numpy(), 0),
+        "d2d": np.where(g["copy"].to_numpy() == "DtoD", g["bytes"].to_numpy(), 0),
+    })
+    out = df.groupby(key).agg(
+        gpu_sum_ns=("dur", "sum"), kernels=("kernel", "sum"), memcpys=("memcpy", "sum"),
+        h2d_bytes=("h2d", "sum"), d2h_bytes=("d2h", "sum"), d2d_bytes=("d2d", "sum"))
+    out.insert(0, "gpu_busy_ns", pd.Series(busy))
+    return out
+
+def stage_report(h: pd.DataFrame, g: pd.DataFrame) -> pd.DataFrame:
+    """stage 별 CPU(NVTX inclusive/self) 와 GPU 지표를 한 표로 (ms, MB)"""
+    cpu = nvtx_hierarchy.stage_summary(h).set_index("stage")[["inclusive_ns", "self_ns"]] if len(h) else \
+        pd.DataFrame(columns=["inclusive_ns", "self_ns"])
+    gpu = gpu_report(g, "stage") if len(g) else pd.DataFrame()
+    t = cpu.join(gpu, how="outer")
+    out = pd.DataFrame(index=t.index)
+    for c, label in (("inclusive_ns", "CPU inclusive (ms)"), ("self_ns", "CPU self (ms)"),
+                     ("gpu_busy_ns", "GPU busy (ms)"), ("gpu_sum_ns", "GPU sum (ms)")):
+        if c in t.columns:
+            out[label] = t[c] / 1e6
+    for c, label in (("kernels", "Kernels"), ("memcpys", "Memcpys")):
+        if c in t.columns:
+            out[label] = t[c].fillna(0).astype(np.int64)
+    for c, label in (("h2d_bytes", "H2D (MB)"), ("d2h_bytes", "D2H (MB)"), ("d2d_bytes", "D2D (MB)")):
+        if c in t.columns:
+            out[label] = t[c].fillna(0) / 1e6
+    out.index.name = "Stage"
+    sort_col = "CPU inclusive (ms)" if "CPU inclusive (ms)" in out.columns else out.columns[0]
+    return out.sort_values(sort_col, ascending=False, na_position="last").reset_index()
+
+def plot_stage_report(report: pd.DataFrame, out_png: Path, title: str):
+    cols = [c for c in ("CPU inclusive (ms)", "CPU self (ms)", "GPU busy (ms)") if c in report.columns]
+    if report.empty or not cols:
+        return
+    x = np.arange(len(report))
+    w = 0.8 / len(cols)
+    fig, ax = plt.subplots(figsize=(max(6.0, 0.7 * len(report)), 4.2), constrained_layout=True)
+    for i, c in enumerate(cols):
+        ax.bar(x + (i - (len(cols) - 1) / 2) * w, report[c].fillna(0).values, width=w, label=c)
+    ax.set_xticks(x)
+    ax.set_xticklabels(report["Stage"], rotation=45, ha="right", fontsize=8)
+    ax.set_ylabel("Time (ms)")
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(axis="y", alpha=0.3)
+    plt.savefig(out_png, dpi=150)
+    plt.close(fig)
+    print(f"[SAVED] {out_png}")
+
+
+# ===== 실행 =====
+def run(gpu: pd.DataFrame, api: pd.DataFrame, nvtx: pd.DataFrame, out_dir: Path, title: str = "CUDA attribution",
+        save_activities: bool = False):
+    h = nvtx_hierarchy.build_hierarchy(nvtx) if len(nvtx) else nvtx.assign(stage=[], path=[], parent=[])
+    g = attribute(gpu, api, h)
+    report = stage_report(h, g)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    report.to_csv(out_dir / "cuda_stage_attribution.csv", index=False, float_format="%.3f")
+    if len(g):
+        path_t = gpu_report(g, "path").reset_index()
+        path_t.to_csv(out_dir / "cuda_path_attribution.csv", index=False)
+    if save_activities:
+        g.to_csv(out_dir / "cuda_activity_attribution.csv", index=False)
+    plot_stage_report(report, out_dir / "cuda_stage_attribution.png", title)
+
+    n_un = int((g["stage"] == UNATTRIBUTED).sum()) if len(g) else 0
+    print(f"[OK] CUDA attribution: {len(g)} GPU activities, {n_un} outside NVTX ranges → {out_dir}")
+    return report, g
+
+def verify_synthetic(n_frames: int) -> bool:
+    """합성 trace: 모든 GPU 활동이 생성 시 지정한 range 로 귀속되는지, 바이트 합이 맞는지 확인"""
+    import synthetic_data
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        paths = synthetic_data.generate_cuda_trace(tmp, n_frames=n_frames)
+        gpu = load_gpu_trace_csv(paths["gpu"])
+        api = load_api_trace_csv(paths["api"])
+        nvtx = nvtx_hierarchy.load_nvtx_trace(paths["nvtx"])
+        expected = pd.read_csv(paths["expected"])
+        report, g = run(gpu, api, nvtx, tmp / "out")
+
+    got = g.set_index(g["corr_id"].astype(np.int64))["path"]
+    exp = expected.set_index("corr_id")["path"]
+    same_path = bool((got.reindex(exp.index) == exp).all())
+    h2d_ok = np.isclose(report["H2D (MB)"].sum(), expected["h2d_bytes"].sum() / 1e6)
+    d2h_ok = np.isclose(report["D2H (MB)"].sum(), expected["d2h_bytes"].sum() / 1e6)
+    print(f"[VERIFY] range attribution: {'OK' if same_path else 'MISMATCH'} ({len(exp)} activities)")
+    print(f"[VERIFY] transfer bytes   : {'OK' if h2d_ok and d2h_ok else 'MISMATCH'}")
+    return same_path and bool(h2d_ok and d2h_ok)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="CUDA 커널/memcpy 를 NVTX range 에 귀속")
+    ap.add_argument("--sqlite", type=Path, help="nsys export --type sqlite 결과")
+    ap.add_argument("--nvtx", type=Path, help="nvtx_pushpop_trace CSV")
+    ap.add_argument("--gpu-trace", type=Path, help="cuda_gpu_trace CSV")
+    ap.add_argument("--api-trace", type=Path, help="cuda_api_trace CSV")
+    ap.add_argument("--out", type=Path, default=Path("."))
+    ap.add_argument("--activities", action="store_true", help="활동별 귀속 결과 CSV 도 저장")
+    ap.add_argument("--synthetic", type=int, metavar="N_FRAMES", help="합성 trace 로 검증")
+    args = ap.parse_args()
+
+    if args.synthetic:
+        raise SystemExit(0 if verify_synthetic(args.synthetic) else 1)
+    if args.sqlite:
+        gpu, api, nvtx = load_sqlite(args.sqlite)
+        title = args.sqlite.stem
+    elif args.nvtx and args.gpu_trace and args.api_trace:
+        gpu = load_gpu_trace_csv(args.gpu_trace)
+        api = load_api_trace_csv(args.api_trace)
+        nvtx = nvtx_hierarchy.load_nvtx_trace(args.nvtx)
+        title = args.gpu_trace.stem
+    else:
+        ap.error("--sqlite 또는 --nvtx/--gpu-trace/--api-trace 를 지정하세요")
+    run(gpu, api, nvtx, args.out, title=title, save_activities=args.activities)
+
+if __name__ == "__main__":
+    main()
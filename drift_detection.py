@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+"""
+drift_detection.py
+------------------
+긴 실행 동안 stage 실행 시간 분포가 서서히 변하는지(맵이 커지며 느려지는 OpenVINS tracking, 열 누적 등) 본다.
+
+- 시계열을 WINDOW 샘플 단위 구간으로 나누고, 구간마다 고정 로그 간격 히스토그램(상대 오차 ~1%)을 스케치로 쓴다.
+- 입력은 청크 단위로 읽고, 청크 안의 구간들은 bincount 한 번으로 (구간 × bin) 행렬을 만든다.
+  메모리에는 진행 중 구간 / 직전 구간 / 기준 구간 히스토그램만 남으므로 실행 길이와 무관하다.
+- 인접 구간 KS 거리와 Wasserstein-1 거리를 CDF 행렬에서 한 번에 계산하고,
+  기준 구간(첫 구간은 초기화 프레임이 섞이므로 기본값은 두 번째 구간) 대비 거리 / p50 변화도 같이 기록한다.
+- KS 가 유의 수준 임계값을 넘고 Wasserstein 거리가 기준 p50 의 MIN_SHIFT_PCT 이상이면 drift 로 표시
+  (샘플이 많으면 KS 만으로는 아주 작은 차이도 유의하게 나오므로).
+
+    python drift_detection.py --app openxr                 # analyze/data/<stage>_openxr.csv
+    python drift_detection.py --log data/openxr.log        # OpenVINS [TIME] 단계별
+    python drift_detection.py --synthetic 200000           # 합성 시계열로 검증
+"""
+
+import csv
+import argparse
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from pathlib import Path
+
+from log_input import open_input, strip_compression_suffix
+
+ANALYZE_ROOT = Path("/home/nokdujeon/kangseok/ILLIXR/analyze")
+DATA_DIR = ANALYZE_ROOT / "data"
+
+WINDOW = 1000             # 구간 하나의 샘플 수 (30 Hz 기준 약 33초)
+CHUNK_ROWS = 1 << 18      # 한 번에 읽는 행 수
+SKETCH_MIN_MS = 1e-3      # 이보다 작은 값은 underflow bin
+SKETCH_MAX_MS = 1e4       # 이보다 큰 값은 overflow bin
+SKETCH_GAMMA = 1.02       # 인접 bin 경계 비율 (분위수 상대 오차 ≈ 1%)
+BASELINE_WINDOW = 1       # 기준 구간 번호 (0 은 warm-up 이 섞임)
+KS_ALPHA_C = 1.358        # 2표본 KS 임계값 계수 (α = 0.05)
+MIN_SHIFT_PCT = 5.0       # drift 로 볼 최소 Wasserstein 거리 (기준 p50 대비 %)
+QUANTILES = (0.5, 0.95, 0.99)
+
+_N_BINS = int(np.ceil(np.log(SKETCH_MAX_MS / SKETCH_MIN_MS) / np.log(SKETCH_GAMMA)))
+# bin 0 = underflow, 1.._N_BINS = [MIN·γ^(i-1), MIN·γ^i), _N_BINS+1 = overflow. 대표값은 기하 중앙
+BIN_VALUES = np.concatenate([[SKETCH_MIN_MS],
+                             SKETCH_MIN_MS * SKETCH_GAMMA ** (np.arange(1, _N_BINS + 1) - 0.5),
+                             [SKETCH_MIN_MS * SKETCH_GAMMA ** _N_BINS]])
+N_BINS = len(BIN_VALUES)
+
+WINDOW_COLUMNS = (["series", "window", "first_sample", "n", "mean_ms"]
+                  + [f"p{int(q * 100)}_ms" for q in QUANTILES]
+                  + ["ks_prev", "w1_prev_ms", "ks_base", "w1_base_ms", "p50_change_pct", "ks_crit", "drift"])
+
+
+# ===== 스케치 =====
+def bin_index(v_ms: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        idx = np.floor(np.log(v_ms / SKETCH_MIN_MS) / np.log(SKETCH_GAMMA)) + 1
+    idx = np.where(v_ms < SKETCH_MIN_MS, 0, idx)   # 0 / 음수도 underflow
+    return np.clip(np.nan_to_num(idx, nan=0), 0, N_BINS - 1).astype(np.int64)
+
+def sketch_quantiles(H: np.ndarray, qs=QUANTILES) -> np.ndarray:
+    """(k × bins) 히스토그램 → (k × len(qs)) 분위수 (bin 대표값)"""
+    C = np.cumsum(H, axis=1)
+    target = np.asarray(qs)[None, :] * C[:, -1:]
+    idx = np.empty(target.shape, dtype=np.int64)
+    for j in range(target.shape[1]):   # 분위수 개수만큼만 반복 (구간 수와 무관)
+        idx[:, j] = (C < target[:, j:j + 1]).sum(axis=1)
+    return BIN_VALUES[np.minimum(idx, N_BINS - 1)]
+
+def distances(A: np.ndarray, B: np.ndarray):
+    """
+    행별 히스토그램 쌍 A[i] vs B[i] → (KS, Wasserstein-1 ms).
+    W1 = Σ |F_A - F_B| · (다음 bin 대표값 - 현재 대표값)  (bin 대표값에 질량을 둔 이산 분포 기준 정확값)
+    """
+    FA = np.cumsum(A, axis=1) / np.maximum(A.sum(axis=1, keepdims=True), 1)
+    FB = np.cumsum(B, axis=1) / np.maximum(B.sum(axis=1, keepdims=True), 1)
+    D = np.abs(FA - FB)
+    return D.max(axis=1), D[:, :-1] @ np.diff(BIN_VALUES)
+
+def ks_critical(n: np.ndarray, m: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return KS_ALPHA_C * np.sqrt((n + m) / (n * m))
+
+
+class DriftTracker:
+    """
+    시계열 하나의 구간 스케치 상태. update(값 ms 배열) 로 청크를 넣으면 완성된 구간의 행(dict 목록)을 돌려준다.
+    상태 크기는 bin 수 × 3 으로 고정.
+    """
+
+    def __init__(self, series: str, window: int = WINDOW, baseline: int = BASELINE_WINDOW):
+        self.series = series
+        self.window = window
+        self.baseline_idx = baseline
+        self.partial = np.zeros(N_BINS, dtype=np.int64)
+        self.partial_n = 0
+        self.partial_sum = 0.0
+        self.prev = None        # 직전 완성 구간 히스토그램
+        self.base = None        # 기준 구간 히스토그램
+        self.base_p50 = np.nan
+        self.n_windows = 0
+        self.n_samples = 0
+        # 요약용 누적값 (p50 의 구간 번호에 대한 선형 회귀 합, drift 개수 등)
+        self.reg = np.zeros(5)  # Σx, Σy, Σxx, Σxy, n
+        self.n_drift = 0
+        self.first_drift = None
+        self.max_w1 = 0.0
+        self.first_p50 = np.nan
+        self.last_p50 = np.nan
+
+    def update(self, v_ms: np.ndarray) -> list:
+        v_ms = np.asarray(v_ms, dtype=np.float64)
+        v_ms = v_ms[np.isfinite(v_ms)]
+        if len(v_ms) == 0:
+            return []
+        pos = self.partial_n + np.arange(len(v_ms))
+        w = pos // self.window                      # 0 = 진행 중이던 구간
+        k = int(w[-1]) + 1
+        H = np.bincount(w * N_BINS + bin_index(v_ms), minlength=k * N_BINS).reshape(k, N_BINS)
+        S = np.bincount(w, weights=v_ms, minlength=k)
+        H[0] += self.partial
+        S[0] += self.partial_sum
+        n = H.sum(axis=1)
+        first = self.n_samples - self.partial_n + np.arange(k) * self.window
+        self.n_samples += len(v_ms)
+
+        done = n == self.window
+        self.partial = H[-1].copy() if not done[-1] else np.zeros(N_BINS, dtype=np.int64)
+        self.partial_n = int(n[-1]) if not done[-1] else 0
+        self.partial_sum = float(S[-1]) if not done[-1] else 0.0
+        if not done.any():
+            return []
+        return self._emit(H[done], S[done], first[done])
+
+    def flush(self, min_fraction: float = 0.5) -> list:
+        """남은 미완성 구간 (WINDOW 의 min_fraction 이상일 때만)"""
+        if self.partial_n < self.window * min_fraction:
+            return []
+        H, S = self.partial[None, :], np.array([self.partial_sum])
+        first = np.array([self.n_samples - self.partial_n])
+        self.partial, self.partial_n, self.partial_sum = np.zeros(N_BINS, dtype=np.int64), 0, 0.0
+        return self._emit(H, S, first)
+
+    def _emit(self, H: np.ndarray, S: np.ndarray, first: np.ndarray) -> list:
+        k = len(H)
+        idx = self.n_windows + np.arange(k)
+        n = H.sum(axis=1)
+        q = sketch_quantiles(H)
+
+        # 인접 구간: [직전, H0, H1, ...] 에서 한 칸씩 밀어 비교
+        prev = np.vstack([self.prev[None, :] if self.prev is not None else np.zeros((1, N_BINS)), H[:-1]])
+        ks_prev, w_prev = distances(H, prev)
+        if self.prev is None:
+            ks_prev[0], w_prev[0] = np.nan, np.nan
+
+        # 기준 구간이 이번 묶음에 있으면 그 행을 기준으로
+        if self.base is None and idx[-1] >= self.baseline_idx:
+            j = int(self.baseline_idx - idx[0]) if idx[0] <= self.baseline_idx else 0
+            self.base = H[j].copy()
+            self.base_p50 = float(q[j, 0])
+        if self.base is not None:
+            ks_base, w_base = distances(H, np.broadcast_to(self.base, H.shape))
+            before = idx < self.baseline_idx
+            ks_base[before], w_base[before] = np.nan, np.nan
+            crit = ks_critical(n, self.base.sum())
+            with np.errstate(invalid="ignore", divide="ignore"):
+                p50_change = (q[:, 0] / self.base_p50 - 1.0) * 100.0
+                drift = (ks_base > crit) & (w_base / self.base_p50 * 100.0 >= MIN_SHIFT_PCT)
+        else:
+            ks_base = w_base = crit = p50_change = np.full(k, np.nan)
+            drift = np.zeros(k, dtype=bool)
+
+        # 요약 누적 (기준 구간 이후만)
+        after = idx >= self.baseline_idx
+        if after.any():
+            x, y = idx[after].astype(np.float64), q[after, 0]
+            self.reg += [x.sum(), y.sum(), (x * x).sum(), (x * y).sum(), len(x)]
+            if np.isnan(self.first_p50):
+                self.first_p50 = float(y[0])
+            # 요약의 p50 변화율은 마지막 '완성된' 구간 기준 (flush 의 미완성 구간은 표본이 적음)
+            full = after & (n == self.window)
+            if full.any():
+                self.last_p50 = float(q[full, 0][-1])
+            self.max_w1 = max(self.max_w1, float(np.nanmax(w_base[after])) if np.isfinite(w_base[after]).any() else 0.0)
+        self.n_drift += int(drift.sum())
+        if self.first_drift is None and drift.any():
+            self.first_drift = int(idx[drift][0])
+
+        self.prev = H[-1].copy()
+        self.n_windows += k
+
+        rows = []
+        for i in range(k):
+            row = {"series": self.series, "window": int(idx[i]), "first_sample": int(first[i]), "n": int(n[i]),
+                   "mean_ms": S[i] / n[i]}
+            row.update({f"p{int(qq * 100)}_ms": q[i, j] for j, qq in enumerate(QUANTILES)})
+            row.update({"ks_prev": ks_prev[i], "w1_prev_ms": w_prev[i], "ks_base": ks_base[i],
+                        "w1_base_ms": w_base[i], "p50_change_pct": p50_change[i], "ks_crit": crit[i],
+                        "drift": bool(drift[i])})
+            rows.append(row)
+        return rows
+
+    def summary(self) -> dict:
+        sx, sy, sxx, sxy, m = self.reg
+        den = m * sxx - sx * sx
+        slope = (m * sxy - sx * sy) / den if m > 1 and den > 0 else np.nan
+        return {
+            "series": self.series,
+            "samples": self.n_samples,
+            "windows": self.n_windows,
+            "baseline_p50_ms": self.base_p50,
+            "last_p50_ms": self.last_p50,
+            "p50_change_pct": (self.last_p50 / self.base_p50 - 1.0) * 100.0 if self.base_p50 else np.nan,
+            # 기준 구간 이후 p50 의 선형 추세 (구간 100개당 ms)
+            "p50_slope_ms_per_100_windows": slope * 100.0,
+            "drift_windows": self.n_drift,
+            "first_drift_window": self.first_drift,
+            "first_drift_sample": self.first_drift * self.window if self.first_drift is not None else None,
+            "max_w1_base_ms": self.max_w1,
+        }
+
+
+# ===== 입력 스트림 =====
+def stage_csv_chunks(path: Path, chunk_rows: int = CHUNK_ROWS):
+    """<stage>_<app>.csv → Duration(ms) 청크"""
+    with open_input(path, "rb") as f:
+        for chunk in pd.read_csv(f, usecols=["Duration (ns)"], chunksize=chunk_rows):
+            yield chunk["Duration (ns)"].to_numpy(dtype=np.float64) / 1e6
+
+def openvins_log_chunks(log_path: Path, chunk_rows: int = CHUNK_ROWS):
+    """illixr.log → (단계 이름, ms 청크). openvins_timing_parser 와 같은 [TIME] 패턴, 줄 단위 스트리밍"""
+    from openvins_timing_parser import patterns
+
+    buffers = {k: [] for k in patterns}
+    with open_input(log_path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if "[TIME]" not in line:
+                continue
+            for key, pattern in patterns.items():
+                m = pattern.search(line)
+                if m:
+                    buf = buffers[key]
+                    buf.append(float(m.group(1)))
+                    if len(buf) >= chunk_rows:
+                        yield key, np.array(buf)
+                        buf.clear()
+    for key, buf in buffers.items():
+        if buf:
+            yield key, np.array(buf)
+
+
+# ===== 실행 / 저장 =====
+def run_streams(streams, out_dir: Path, window: int = WINDOW) -> pd.DataFrame:
+    """
+    streams: (series, ms 청크) 를 내는 iterable. 완성된 구간 행은 drift_windows.csv 에 바로 쓰고 요약을 반환.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    trackers = {}
+    with open(out_dir / "drift_windows.csv", "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=WINDOW_COLUMNS)
+        w.writeheader()
+        for series, chunk in streams:
+            tr = trackers.get(series)
+            if tr is None:
+                tr = trackers[series] = DriftTracker(series, window)
+            w.writerows(_fmt(r) for r in tr.update(chunk))
+        for tr in trackers.values():
+            w.writerows(_fmt(r) for r in tr.flush())
+    summary = pd.DataFrame([tr.summary() for tr in trackers.values()])
+    if not summary.empty:
+        summary = summary.sort_values("p50_change_pct", ascending=False, key=lambda s: s.abs())
+    summary.to_csv(out_dir / "drift_summary.csv", index=False, float_format="%.4f")
+    print(f"[SAVED] {out_dir / 'drift_windows.csv'}")
+    print(f"[SAVED] {out_dir / 'drift_summary.csv'}")
+    return summary
+
+def _fmt(row: dict) -> dict:
+    return {k: (f"{v:.4f}" if isinstance(v, (float, np.floating)) and np.isfinite(v) else
+                ("" if isinstance(v, (float, np.floating)) else v)) for k, v in row.items()}
+
+def plot_windows(out_dir: Path, title: str, window: int = WINDOW, max_series: int = 12):
+    """drift_windows.csv → 시계열별 p50 / p95 구간 추이 (drift 구간 표시)"""
+    win = pd.read_csv(out_dir / "drift_windows.csv")
+    if win.empty:
+        return
+    summary = pd.read_csv(out_dir / "drift_summary.csv")
+    series = list(summary["series"])[:max_series]
+    fig, axes = plt.subplots(len(series), 1, figsize=(11, 2.2 * len(series)), sharex=False,
+                             constrained_layout=True, squeeze=False)
+    for ax, name in zip(axes[:, 0], series):
+        d = win[win["series"] == name]
+        ax.fill_between(d["window"], d["p50_ms"], d["p95_ms"], alpha=0.25, label="p50–p95")
+        ax.plot(d["window"], d["p50_ms"], linewidth=1.0, label="p50")
+        drift = d[d["drift"].astype(str) == "True"]
+        ax.scatter(drift["window"], drift["p50_ms"], color="red", s=10, zorder=3, label="drift")
+        ax.set_ylabel("ms")
+        ax.set_title(name, fontsize=9, loc="left")
+        ax.grid(True, alpha=0.3)
+    axes[0, 0].legend(fontsize=8, ncols=3, loc="upper right")
+    axes[-1, 0].set_xlabel(f"Window ({window} samples)")
+    fig.suptitle(f"Latency drift per window — {title}")
+    out_png = out_dir / "drift_windows.png"
+    plt.savefig(out_png, dpi=150)
+    plt.close(fig)
+    print(f"[SAVED] {out_png}")
+
+def analyze_app(app: str, window: int = WINDOW, data_dir: Path = DATA_DIR):
+    paths = sorted(data_dir.glob(f"*_{app}.csv*"))
+    if not paths:
+        print(f"[INFO] {app}: analyze/data 에 CSV 가 없습니다")
+        return
+
+    def streams():
+        for p in paths:
+            stage = Path(strip_compression_suffix(p.name)).stem[: -len(app) - 1]
+            for chunk in stage_csv_chunks(p):
+                yield stage, chunk
+
+    out_dir = ANALYZE_ROOT / f"{app}_nsys" / "drift"
+    print_summary(run_streams(streams(), out_dir, window))
+    plot_windows(out_dir, app, window)
+
+def analyze_log(log_path: Path, window: int = WINDOW):
+    scene = Path(strip_compression_suffix(log_path.name)).stem
+    out_dir = ANALYZE_ROOT / "drift" / scene
+    print_summary(run_streams(openvins_log_chunks(log_path), out_dir, window))
+    plot_windows(out_dir, scene, window)
+
+def print_summary(summary: pd.DataFrame):
+    if summary.empty:
+        return
+    cols = ["series", "windows", "baseline_p50_ms", "last_p50_ms", "p50_change_pct", "drift_windows",
+            "first_drift_window"]
+    print(summary[cols].to_string(index=False, float_format="%.3f"))
+
+
+# ===== 검증 =====
+def verify_synthetic(n: int, window: int = WINDOW, seed: int = 0) -> bool:
+    """
+    합성 시계열로 확인:
+    - 정상 시계열: 기준 이후 drift 구간이 (거의) 없어야 함
+    - 중간부터 중앙값이 선형으로 20% 늘어나는 시계열: 변화 시작 이후에 첫 drift 가 잡혀야 함
+    - 스케치 분위수가 정확한 분위수와 상대 오차 γ-1 이내
+    """
+    rng = np.random.default_rng(seed)
+    change = n // 2
+    stable = rng.lognormal(np.log(8.0), 0.15, n)
+    ramp = np.ones(n)
+    ramp[change:] = 1.0 + 0.2 * np.linspace(0.0, 1.0, n - change)
+    drifting = rng.lognormal(np.log(8.0), 0.15, n) * ramp
+
+    def streams():
+        for lo in range(0, n, 7919):   # 구간 경계와 맞지 않는 청크 크기
+            yield "stable", stable[lo:lo + 7919]
+            yield "drifting", drifting[lo:lo + 7919]
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        summary = run_streams(streams(), Path(tmp), window).set_index("series")
+        win = pd.read_csv(Path(tmp) / "drift_windows.csv")
+
+    false_pos = int(summary.loc["stable", "drift_windows"])
+    first = summary.loc["drifting", "first_drift_sample"]
+    detected = pd.notna(first) and first >= change - window
+    w0 = win[(win["series"] == "stable") & (win["window"] == 3)].iloc[0]
+    seg = stable[int(w0["first_sample"]): int(w0["first_sample"]) + int(w0["n"])]
+    exact = np.quantile(seg, QUANTILES)
+    approx = w0[[f"p{int(q * 100)}_ms" for q in QUANTILES]].to_numpy(dtype=np.float64)
+    rel = float(np.max(np.abs(approx / exact - 1.0)))
+    # 이산 샘플의 분위수 위치 차이까지 고려해 bin 폭(γ-1) 두 배까지 허용
+    q_ok = rel <= 2 * (SKETCH_GAMMA - 1.0)
+
+    print(f"[VERIFY] stable series drift windows : {false_pos} / {int(summary.loc['stable', 'windows'])}")
+    print(f"[VERIFY] drift detected after change : {'OK' if detected else 'MISSED'} "
+          f"(change at {change}, first drift sample {first})")
+    print(f"[VERIFY] sketch quantile rel. error  : {rel:.4f} ({'OK' if q_ok else 'TOO LARGE'})")
+    return false_pos <= max(1, summary.loc["stable", "windows"] // 50) and detected and q_ok
+
+
+def main():
+    ap = argparse.ArgumentParser(description="구간별 실행 시간 분포 drift 탐지")
+    ap.add_argument("--app", action="append", help="analyze/data 의 앱 이름 (여러 번 지정 가능)")
+    ap.add_argument("--log", type=Path, action="append", help="OpenVINS [TIME] 로그 경로 (여러 번 지정 가능)")
+    ap.add_argument("--window", type=int, default=WINDOW, help="구간 하나의 샘플 수")
+    ap.add_argument("--synthetic", type=int, metavar="N", help="합성 시계열 N 개 샘플로 검증")
+    args = ap.parse_args()
+
+    if args.synthetic:
+        raise SystemExit(0 if verify_synthetic(args.synthetic, args.window) else 1)
+
+    apps = args.app
+    if not apps and not args.log:
+        apps = sorted({Path(strip_compression_suffix(p.name)).stem.rsplit("_", 1)[-1]
+                       for p in DATA_DIR.glob("*_*.csv*")}) if DATA_DIR.exists() else []
+    for app in apps or []:
+        analyze_app(app, args.window)
+    for log_path in args.log or []:
+        analyze_log(log_path, args.window)
+
+if __name__ == "__main__":
+    main()
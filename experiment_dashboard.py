@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+experiment_dashboard.py
+-----------------------
+여러 실험 폴더의 periodic_log.csv 를 병렬로 요약 벡터로 줄인 뒤
+하나의 비교 테이블과 small-multiples 그림으로 합친다. (openxr_15W vs materials_15W vs *_MAXN ...)
+
+- 워커 프로세스는 DataFrame 이 아니라 요약 dict 만 돌려주므로
+  실험 100개 스윕도 메모리에 요약 벡터만 남는다.
+- 결과: analyze/dashboard/experiment_comparison.csv, experiment_comparison.png
+"""
+
+import re
+import os
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from log_input import resolve_input
+from logger_csv_to_graph import (
+    DATA_ROOT, SEARCH_DEPTH, DATASETS, ANALYZE_ROOT, PLOT_COLUMN_PATTERN,
+    load_csv, ensure_numeric, discover_datasets,
+)
+
+DASHBOARD_DIR = ANALYZE_ROOT / "dashboard"
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+UTIL_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+# ===== 실험 하나 → 요약 벡터 =====
+def _core_cols(df: pd.DataFrame, suffix: str):
+    cols = [c for c in df.columns if re.fullmatch(rf"CPU\d+_{suffix}", str(c), re.I)]
+    return sorted(cols, key=lambda c: int(re.search(r"\d+", c).group()))
+
+def reduce_dataset(csv_path: Path) -> dict:
+    df = load_csv(csv_path, usecols=lambda c: bool(PLOT_COLUMN_PATTERN.search(str(c))))
+    row = {"experiment": csv_path.parent.name, "csv_path": str(csv_path), "n_samples": len(df)}
+
+    # ---- 코어별 util 분포 ----
+    for c in ensure_numeric(df, _core_cols(df, "util")):
+        v = df[c].to_numpy(dtype=np.float64)
+        v = v[np.isfinite(v)]
+        if len(v) == 0:
+            continue
+        pct = np.percentile(v, UTIL_PERCENTILES)
+        for p, val in zip(UTIL_PERCENTILES, pct):
+            row[f"{c}_p{p}"] = float(val)
+        row[f"{c}_mean"] = float(v.mean())
+
+    # ---- 평균 주파수 (CPU: kHz → MHz, GPU: Hz → MHz) ----
+    freq_cols = ensure_numeric(df, _core_cols(df, "freq"))
+    if freq_cols:
+        row["cpu_freq_avg_mhz"] = float(np.nanmean(df[freq_cols].to_numpy(dtype=np.float64))) / 1000.0
+    if "GPU_freq" in df.columns:
+        gpu = ensure_numeric(df, ["GPU_freq"])[0]
+        row["gpu_freq_avg_mhz"] = float(df[gpu].mean()) / 1e6
+
+    # ---- 온도 최고치 (m°C → °C) ----
+    temp_cols = ensure_numeric(df, [c for c in df.columns if re.search(r"(?:^|_)temp$", str(c), re.I)])
+    if temp_cols:
+        row["temp_peak_c"] = float(np.nanmax(df[temp_cols].to_numpy(dtype=np.float64))) / 1000.0
+
+    # ---- 메모리 최고 사용률 ----
+    mem_pct_cols = ensure_numeric(
+        df, [c for c in df.columns if re.search(r"(mem_used_pct|mem.*util|memory.*util)", str(c), re.I)])
+    if mem_pct_cols:
+        row["mem_peak_pct"] = float(np.nanmax(df[mem_pct_cols].to_numpy(dtype=np.float64)))
+    else:
+        used_cols = [c for c in df.columns if re.search(r"(mem.*used|memory_used)", str(c), re.I)]
+        total_cols = [c for c in df.columns if re.search(r"(mem.*total|memory_total)", str(c), re.I)]
+        if used_cols and total_cols:
+            used = df[ensure_numeric(df, [used_cols[0]])[0]]
+            total = df[ensure_numeric(df, [total_cols[0]])[0]]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                row["mem_peak_pct"] = float(np.nanmax((used / total).to_numpy(dtype=np.float64))) * 100.0
+            row["mem_peak_used"] = float(used.max())
+    return row
+
+def _safe_reduce(csv_path: Path):
+    try:
+        return reduce_dataset(csv_path)
+    except Exception as e:
+        print(f"[ERROR] {csv_path.parent.name}: {e}")
+        return None
+
+
+# ===== 그림 =====
+def _bxp_stats(table: pd.DataFrame, core: str):
+    stats = []
+    for _, r in table.iterrows():
+        if pd.isna(r.get(f"{core}_p50")):
+            continue
+        stats.append({
+            "label": r["experiment"],
+            "whislo": r[f"{core}_p5"], "q1": r[f"{core}_p25"], "med": r[f"{core}_p50"],
+            "q3": r[f"{core}_p75"], "whishi": r[f"{core}_p95"], "mean": r[f"{core}_mean"],
+            "fliers": [],
+        })
+    return stats
+
+def plot_dashboard(table: pd.DataFrame, out_png: Path):
+    cores = sorted({m.group(1) for c in table.columns for m in [re.fullmatch(r"(CPU\d+_util)_p50", c)] if m},
+                   key=lambda c: int(re.search(r"\d+", c).group()))
+    scalars = [(c, label) for c, label in (
+        ("cpu_freq_avg_mhz", "CPU freq avg (MHz)"),
+        ("gpu_freq_avg_mhz", "GPU freq avg (MHz)"),
+        ("temp_peak_c", "Temperature peak (°C)"),
+        ("mem_peak_pct", "Memory high-water (%)"),
+    ) if c in table.columns]
+
+    n_panels = len(cores) + len(scalars)
+    if n_panels == 0:
+        print("[INFO] 그릴 요약 지표가 없습니다.")
+        return
+    ncols = min(4, n_panels)
+    nrows = int(np.ceil(n_panels / ncols))
+    width = max(3.2, 0.45 * len(table))
+    fig, axes = plt.subplots(nrows, ncols, figsize=(width * ncols, 3.4 * nrows),
+                             squeeze=False, constrained_layout=True)
+    axes = axes.ravel()
+
+    for ax, core in zip(axes, cores):
+        ax.bxp(_bxp_stats(table, core), showfliers=False, showmeans=True)
+        ax.set_title(f"{core} (p5–p95)")
+        ax.set_ylabel("Percent")
+        ax.set_ylim(0, 100)
+        ax.tick_params(axis="x", rotation=45, labelsize=8)
+        ax.grid(axis="y", alpha=0.3)
+
+    palette = plt.cm.tab10.colors
+    for i, (ax, (col, label)) in enumerate(zip(axes[len(cores):], scalars)):
+        ax.bar(np.arange(len(table)), table[col].values, color=palette[i % len(palette)])
+        ax.set_title(label)
+        ax.set_xticks(np.arange(len(table)))
+        ax.set_xticklabels(table["experiment"], rotation=45, ha="right", fontsize=8)
+        ax.grid(axis="y", alpha=0.3)
+
+    for ax in axes[n_panels:]:
+        ax.axis("off")
+
+    fig.suptitle("Experiment comparison (periodic_log.csv)")
+    plt.savefig(out_png, dpi=150)
+    plt.close(fig)
+    print(f"[SAVED] {out_png}")
+
+
+# ===== 메인 =====
+def main():
+    if DATASETS is not None:
+        dataset_dirs = [Path(p) for p in DATASETS]
+    else:
+        dataset_dirs = discover_datasets(DATA_ROOT, depth=SEARCH_DEPTH)
+
+    if not dataset_dirs:
+        print(f"[WARN] {DATA_ROOT} 아래에서 periodic_log.csv를 찾지 못했습니다. (depth={SEARCH_DEPTH})")
+        return
+
+    print(f"[INFO] 발견된 실험 폴더 수: {len(dataset_dirs)} (workers={MAX_WORKERS})")
+    csv_paths = [resolve_input(d / "periodic_log.csv") for d in dataset_dirs]
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        rows = [r for r in ex.map(_safe_reduce, csv_paths) if r is not None]
+
+    if not rows:
+        print("[WARN] 요약할 수 있는 실험이 없습니다.")
+        return
+
+    DASHBOARD_DIR.mkdir(parents=True, exist_ok=True)
+    table = pd.DataFrame(rows).sort_values("experiment", ignore_index=True)
+    out_csv = DASHBOARD_DIR / "experiment_comparison.csv"
+    table.to_csv(out_csv, index=False, float_format="%.3f")
+    print(f"[SAVED] {out_csv}")
+
+    plot_dashboard(table, DASHBOARD_DIR / "experiment_comparison.png")
+
+if __name__ == "__main__":
+    main()
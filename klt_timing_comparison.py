@@ -12,7 +12,6 @@ import matplotlib.pyplot as plt
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 RESULTS_DIR = os.path.join(BASE_DIR, "data", "results")
 PLOT_DIR = os.path.join(RESULTS_DIR, "plots")
-os.makedirs(PLOT_DIR, exist_ok=True)
 
 # === 2. CSV 파일 목록 ===
 files = {
@@ -21,37 +20,68 @@ files = {
     "spaceship": os.path.join(RESULTS_DIR, "spaceship_klt_stats.csv")
 }
 
-# === 3. CSV 로드 ===
-dfs = {}
-for name, path in files.items():
-    if os.path.exists(path):
-        df = pd.read_csv(path, index_col=0)
-        dfs[name] = df
-    else:
-        print(f"⚠️ 파일이 없습니다: {path}")
-
-# === 4. 시각화할 통계 항목 ===
+# === 3. 시각화할 통계 항목 ===
 metrics = ["mean", "25%", "50%", "75%"]
 
-# === 5. 그래프 생성 ===
-for metric in metrics:
-    plt.figure(figsize=(10, 6))
-    
-    # 각 로그의 metric 열만 모아 데이터프레임 생성
-    metric_df = pd.DataFrame({name: df[metric] for name, df in dfs.items()})
-    
-    metric_df.plot(kind="bar", figsize=(10, 6))
-    plt.title(f"KLT {metric} Execution Time Comparison (ms)")
-    plt.ylabel("Time (ms)")
-    plt.xlabel("KLT Processing Step")
-    plt.xticks(rotation=45)
-    plt.legend(title="Scene")
-    plt.tight_layout()
-    
-    # === 6. 그래프 저장 ===
-    save_path = os.path.join(PLOT_DIR, f"klt_comparison_{metric}.png")
-    plt.savefig(save_path, dpi=200)
-    plt.close()
-    print(f"📊 그래프 저장 완료: {save_path}")
-
-print("\n✅ 모든 KLT 비교 그래프 생성 완료!")
+# === 4. 통계 로드 (results.sqlite 가 있고 CSV 보다 최신이면 DB 조회, 아니면 CSV) ===
+DB_PATH = os.path.join(RESULTS_DIR, "results.sqlite")  # python results_db.py --db ... ingest --results-dir ...
+
+def load_stats():
+    """{scene: KLT 통계 DataFrame(index=단계, columns ⊇ metrics)}"""
+    dfs = {}
+    use_db = os.path.exists(DB_PATH)
+    if use_db:
+        import results_db
+        con = results_db.connect(DB_PATH)
+        # 파서를 다시 돌리고 ingest 를 잊은 경우: DB 의 최신 run 보다 새 CSV 가 있으면 CSV 를 읽는다
+        stale = [name for name, path in files.items()
+                 if os.path.exists(path)
+                 and results_db.capture_stamp([path]) > (results_db.latest_run(con, name, "klt_stats") or "")]
+        if stale:
+            print(f"⚠️ results.sqlite 보다 새 CSV 가 있어 CSV 를 읽습니다 ({', '.join(stale)}) "
+                  f"— python results_db.py ingest 로 갱신하세요")
+            use_db = False
+        else:
+            tables = {m: results_db.summary_table(con, "klt_stats", m, apps=files.keys()) for m in metrics}
+            dfs = {name: pd.DataFrame({m: t[name] for m, t in tables.items()})
+                   for name in files if name in tables["mean"].columns}
+        con.close()
+    if not use_db:
+        for name, path in files.items():
+            if os.path.exists(path):
+                df = pd.read_csv(path, index_col=0)
+                dfs[name] = df
+            else:
+                print(f"⚠️ 파일이 없습니다: {path}")
+    return dfs
+
+# === 5. 그래프 생성 (pipeline_runner 는 openvins_klt_parser 통계를 메모리에서 바로 넘김) ===
+def plot_comparison(dfs, plot_dir=PLOT_DIR):
+    os.makedirs(plot_dir, exist_ok=True)
+    for metric in metrics:
+        plt.figure(figsize=(10, 6))
+
+        # 각 로그의 metric 열만 모아 데이터프레임 생성
+        metric_df = pd.DataFrame({name: df[metric] for name, df in dfs.items()})
+
+        metric_df.plot(kind="bar", figsize=(10, 6))
+        plt.title(f"KLT {metric} Execution Time Comparison (ms)")
+        plt.ylabel("Time (ms)")
+        plt.xlabel("KLT Processing Step")
+        plt.xticks(rotation=45)
+        plt.legend(title="Scene")
+        plt.tight_layout()
+
+        # === 6. 그래프 저장 ===
+        save_path = os.path.join(plot_dir, f"klt_comparison_{metric}.png")
+        plt.savefig(save_path, dpi=200)
+        plt.close("all")
+        print(f"📊 그래프 저장 완료: {save_path}")
+
+    print("\n✅ 모든 KLT 비교 그래프 생성 완료!")
+
+def main():
+    plot_comparison(load_stats())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+log_input.py
+------------
+압축된 로그(gzip / zstd / xz / bz2)를 그대로 읽기 위한 공통 입력 계층.
+
+- 압축 여부는 확장자가 아니라 파일 앞부분의 매직 바이트로 판별한다.
+- 압축 해제는 백그라운드 스레드에서 블록 단위로 진행되고, 파싱 쪽은 큐에서 블록을 받아 읽는다.
+  (zlib/lzma/zstd 는 해제 중 GIL 을 놓으므로 정규식 파싱과 겹쳐서 돈다)
+- 디스크에 풀어 둔 임시 파일이 필요 없다.
+
+    with open_input(path, "r", encoding="utf-8", errors="ignore") as f:   # 텍스트 로그
+        for line in f: ...
+    df = pd.read_csv(open_input(path, "rb"))                               # CSV
+"""
+
+import io
+import bz2
+import gzip
+import lzma
+import queue
+import threading
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # zstd 로그를 읽을 때만 필요
+    zstandard = None
+
+# (매직 바이트, 종류)
+MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"BZh", "bz2"),
+)
+COMPRESSED_SUFFIXES = (".gz", ".zst", ".xz", ".bz2")
+
+READ_BLOCK = 1 << 20   # 해제 스레드가 한 번에 넘기는 크기
+QUEUE_BLOCKS = 8       # 미리 풀어 둘 최대 블록 수 (메모리 상한 ≈ 8 MB)
+
+
+# ===== 판별 =====
+def detect_compression(path) -> str:
+    """압축 종류('gzip', 'zstd', 'xz', 'bz2') 또는 None"""
+    with open(path, "rb") as f:
+        head = f.read(8)
+    for magic, kind in MAGIC:
+        if head.startswith(magic):
+            return kind
+    return None
+
+def is_compressed(path) -> bool:
+    return detect_compression(path) is not None
+
+def strip_compression_suffix(name: str) -> str:
+    """'illixr.log.gz' -> 'illixr.log'"""
+    for suf in COMPRESSED_SUFFIXES:
+        if name.endswith(suf):
+            return name[: -len(suf)]
+    return name
+
+def resolve_input(path) -> Path:
+    """path 가 없으면 같은 이름의 압축본(path.gz, path.zst, ...)을 찾아 반환"""
+    path = Path(path)
+    if path.exists():
+        return path
+    for suf in COMPRESSED_SUFFIXES:
+        cand = path.with_name(path.name + suf)
+        if cand.exists():
+            return cand
+    return path
+
+
+# ===== 스트리밍 해제 =====
+def _open_decompressor(path, kind):
+    if kind == "gzip":
+        return gzip.open(path, "rb")
+    if kind == "xz":
+        return lzma.open(path, "rb")
+    if kind == "bz2":
+        return bz2.open(path, "rb")
+    if kind == "zstd":
+        if zstandard is None:
+            raise RuntimeError(f"zstd 로그를 읽으려면 zstandard 패키지가 필요합니다: {path}")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    raise ValueError(f"unknown compression: {kind}")
+
+class _ThreadedReader(io.RawIOBase):
+    """백그라운드 스레드가 풀어 둔 블록을 큐에서 꺼내 주는 읽기 전용 스트림"""
+
+    def __init__(self, src):
+        super().__init__()
+        self._src = src
+        self._queue = queue.Queue(maxsize=QUEUE_BLOCKS)
+        self._stop = threading.Event()
+        self._error = None
+        self._block = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._pump, name="log-input-decompress", daemon=True)
+        self._thread.start()
+
+    def _pump(self):
+        try:
+            while not self._stop.is_set():
+                block = self._src.read(READ_BLOCK)
+                if not block:
+                    break
+                self._put(block)
+        except Exception as e:  # 읽는 쪽에서 다시 raise
+            self._error = e
+        finally:
+            self._src.close()
+            self._put(None)
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if not self._block:
+            if self._eof:
+                return 0
+            block = self._queue.get()
+            if block is None:
+                self._eof = True
+                if self._error is not None:
+                    raise self._error
+                return 0
+            self._block = memoryview(block)
+        n = min(len(b), len(self._block))
+        b[:n] = self._block[:n]
+        self._block = self._block[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+        super().close()
+
+
+def open_input(path, mode: str = "r", encoding=None, errors=None, threaded: bool = True):
+    """
+    open() 대체. 압축 파일이면 스트리밍 해제, 아니면 일반 open.
+    mode 는 'r'(텍스트) 또는 'rb'(바이너리)만 지원한다.
+    """
+    if mode not in ("r", "rb"):
+        raise ValueError(f"open_input supports only 'r' / 'rb': {mode}")
+
+    kind = detect_compression(path)
+    if kind is None:
+        if mode == "rb":
+            return open(path, "rb")
+        return open(path, "r", encoding=encoding, errors=errors)
+
+    src = _open_decompressor(path, kind)
+    raw = _ThreadedReader(src) if threaded else src
+    binary = io.BufferedReader(raw, buffer_size=READ_BLOCK) if threaded else raw
+    if mode == "rb":
+        return binary
+    return io.TextIOWrapper(binary, encoding=encoding, errors=errors)
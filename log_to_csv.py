@@ -2,6 +2,9 @@ import re
 import pandas as pd
 import os
 
+from log_input import open_input
+from nvtx_hierarchy import build_hierarchy
+
 # ================================================================================
 # 1. Convert log file to csv, which means OpenVINS (VIO integrator) execution time 
 # ================================================================================
@@ -16,7 +19,7 @@ pattern = re.compile(r"\[TIME\]:\s*([\d\.]+)\s*ms\s*for\s*total")
 time_totals = []
 
 # 로그 파일에서 값 추출
-with open(log_file, "r") as f:
+with open_input(log_file, "r") as f:
     for line in f:
         match = pattern.search(line)
         if match:
@@ -44,10 +47,20 @@ output_dir = "/home/nokdujeon/kangseok/ILLIXR/analyze/data"  # 결과 저장 폴
 os.makedirs(output_dir, exist_ok=True)
 
 # CSV 읽기
-df = pd.read_csv(input_csv)
+with open_input(input_csv, "rb") as f:
+    df = pd.read_csv(f)
+
+# 0) 제외 규칙 적용 전, 스레드별 push/pop 스택을 다시 세워 자식 range 를 뺀 self 시간 계산
+#    (Start (ns) 가 없는 CSV 는 계층을 세울 수 없으므로 Duration 만 저장)
+out_cols = ["Duration (ns)"]
+if "Start (ns)" in df.columns:
+    df["Self (ns)"] = build_hierarchy(df)["self_ns"]
+    out_cols.append("Self (ns)")
+else:
+    print(f"[WARN] Start (ns) 컬럼이 없어 Self (ns) 는 생략합니다: {input_csv}")
 
 # 필요한 컬럼만 사용
-df = df[["Name", "Duration (ns)"]].copy()
+df = df[["Name"] + out_cols].copy()
 
 # 1) 먼저 제외할 항목부터 필터링 (원본 Name 기준, 대소문자 무시)
 exclude_mask = (
@@ -75,7 +88,7 @@ def safe_filename(s: str) -> str:
 for name, group in df.groupby("Name"):
     if len(group) >= 100:
         output_csv = os.path.join(output_dir, f"{safe_filename(name)}.csv")
-        group[["Duration (ns)"]].to_csv(output_csv, index=False)
+        group[out_cols].to_csv(output_csv, index=False)
         print(f"{name} ({len(group)} rows) → {output_csv} 저장 완료")
     else:
         print(f"{name} ({len(group)} rows) → 저장 생략 (100 미만)")
\ No newline at end of file
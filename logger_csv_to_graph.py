@@ -5,6 +5,14 @@ analyze/<폴더명>/ 에 plot들을 저장하는 버전
 """
 
 import re
+import io
+import os
+import argparse
+import json
+import tempfile
+import importlib.util
+import codecs
+import hashlib
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -12,6 +20,10 @@ import matplotlib.dates as mdates
 import shutil
 from pathlib import Path
 
+import time_axis
+import profiling
+from log_input import open_input, resolve_input, is_compressed
+
 # ====== 사용자 설정 ======
 # 1) 부모 폴더 아래의 하위 폴더에서 periodic_log.csv 자동 탐색 (예: /exp_runs/openxr_15W, /exp_runs/materials_15W 등)
 DATA_ROOT = Path("/home/nokdujeon/kangseok/ILLIXR/build")  # 부모 폴더
@@ -27,27 +39,245 @@ DATASETS = None
 # 3) 출력 루트 (여기 아래에 <폴더명>/figure/ 로 저장됨)
 ANALYZE_ROOT = Path("/home/nokdujeon/kangseok/ILLIXR/analyze")
 
+# 4) CSV 스키마 캐시 (헤더 시그니처 → 인코딩/컬럼 dtype). 같은 로거가 만든 CSV 는 추론을 건너뜀
+SCHEMA_CACHE_FILE = ANALYZE_ROOT / "csv_schema_cache.json"
+SCHEMA_SAMPLE_ROWS = 2000   # dtype 추론에 쓰는 앞부분 행 수
+NUMERIC_RATIO = 0.95        # 샘플의 95% 이상이 숫자로 읽히면 숫자 컬럼
+STRIP_CHUNK_BYTES = 1 << 20 # '%' 제거 시 한 번에 읽는 바이트 수
+BLOCK_READ_MIN_BYTES = 32 << 20  # 이보다 큰 숫자 전용 CSV 는 미리 할당한 배열에 청크 단위로 채움 (최대 메모리 ≈ 결과 크기)
+BLOCK_READ_CHUNK_ROWS = 32768
+
+# process_csv 에서 실제로 쓰는 컬럼만 읽기 위한 패턴
+PLOT_COLUMN_PATTERN = re.compile(
+    r"(time|date|cpu\d+_(util|freq|max_freq)|gpu.*(util|load|freq)$|temp$|mem|memory)", re.I)
+
+# pyarrow 가 있으면 멀티스레드 pyarrow 파서 사용
+CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") is not None else "c"
+
+_schema_cache = None
+
 
 # ===== 공통 유틸 =====
-def load_csv(path: Path) -> pd.DataFrame:
+def sniff_encoding(path: Path, nbytes: int = 1 << 16) -> str:
+    """앞부분 바이트만 보고 인코딩 결정 (BOM → utf-8-sig, utf-8 → cp949 순)"""
+    with open_input(path, "rb") as f:
+        head = f.read(nbytes)
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        head.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        if e.start >= len(head) - 3:  # 읽기 경계에서 잘린 멀티바이트 문자
+            return "utf-8"
+    try:
+        head.decode("cp949")
+        return "cp949"
+    except UnicodeDecodeError:
+        return "utf-8"
+
+def header_signature(path: Path, encoding: str) -> str:
+    with open_input(path, "r", encoding=encoding, errors="ignore") as f:
+        header = f.readline().strip()
+    return hashlib.sha1(f"{encoding}|{header}".encode("utf-8")).hexdigest()
+
+def _load_schema_cache() -> dict:
+    global _schema_cache
+    if _schema_cache is None:
+        _schema_cache = {}
+        if SCHEMA_CACHE_FILE.exists():
+            try:
+                _schema_cache = json.loads(SCHEMA_CACHE_FILE.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                _schema_cache = {}
+    return _schema_cache
+
+def _store_schema(signature: str, schema: dict):
+    cache = _load_schema_cache()
+    cache[signature] = schema
+    # 임시 파일에 쓴 뒤 os.replace → 동시에 돌던 다른 스크립트가 반쯤 쓰인 JSON 을 읽지 않음
+    tmp = None
+    try:
+        SCHEMA_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=SCHEMA_CACHE_FILE.name + ".", suffix=".tmp",
+                                   dir=SCHEMA_CACHE_FILE.parent)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1, ensure_ascii=False)
+        os.replace(tmp, SCHEMA_CACHE_FILE)
+    except OSError as e:
+        print(f"[WARN] 스키마 캐시 저장 실패: {e}")
+        if tmp is not None and os.path.exists(tmp):
+            os.remove(tmp)
+
+def infer_csv_schema(path: Path, encoding: str) -> dict:
+    """
+    앞부분 샘플을 문자열로 한 번 읽어 컬럼별 dtype 을 정한다.
+    '%' 또는 천 단위 ',' 가 붙은 숫자 컬럼은 파싱 단계에서 제거하도록 표시한다.
+    """
+    with open_input(path, "rb") as f:
+        sample = pd.read_csv(f, nrows=SCHEMA_SAMPLE_ROWS, dtype=str, encoding=encoding)
+    dtypes, pct_cols, has_thousands, pct_in_text = {}, [], False, False
+    for c in sample.columns:
+        s = sample[c].dropna().str.strip()
+        if s.empty:
+            continue  # 샘플이 비어 있으면 파서 추론에 맡김
+        cleaned = s.str.replace(r"[%,]", "", regex=True)
+        num = pd.to_numeric(cleaned, errors="coerce")
+        if num.notna().mean() < NUMERIC_RATIO:
+            dtypes[c] = "object"
+            pct_in_text |= bool(s.str.contains("%", regex=False).any())
+            continue
+        if s.str.contains("%", regex=False).any():
+            pct_cols.append(str(c))
+        has_thousands |= bool(s.str.contains(",", regex=False).any())
+        integral = num.dropna()
+        # ns 타임스탬프처럼 float64 로 정밀도가 깨지는 큰 정수만 int64 로 유지
+        big_int = (integral == np.floor(integral)).all() and integral.abs().max() > 2**53
+        dtypes[c] = "int64" if big_int and num.notna().all() else "float64"
+    return {
+        "encoding": encoding,
+        "columns": [str(c) for c in sample.columns],
+        "dtypes": dtypes,
+        "pct_cols": pct_cols,
+        "strip_pct": bool(pct_cols) and not pct_in_text,
+        "thousands": has_thousands,
+    }
+
+class _PercentStripper(io.RawIOBase):
+    """
+    원본 바이트 스트림에서 '%' 를 청크 단위로 제거하며 읽는다 (파일 전체를 메모리에 올리지 않음).
+    헤더 줄은 그대로 둬서 'CPU Util (%)' 같은 컬럼 이름이 스키마의 컬럼 이름과 계속 일치하게 한다.
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.in_body = False
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        while True:
+            chunk = self.raw.read(len(buf))
+            if not chunk:
+                return 0
+            if self.in_body:
+                chunk = chunk.translate(None, b"%")  # C 레벨 translate
+            else:
+                nl = chunk.find(b"\n")
+                if nl >= 0:
+                    self.in_body = True
+                    chunk = chunk[:nl + 1] + chunk[nl + 1:].translate(None, b"%")
+            if chunk:  # 청크가 전부 '%' 였으면 다음 청크
+                break
+        n = len(chunk)
+        buf[:n] = chunk
+        return n
+
+def _read_with_schema(path: Path, schema: dict, usecols) -> pd.DataFrame:
+    dtypes = dict(schema["dtypes"])
+    if usecols is not None:
+        dtypes = {c: t for c, t in dtypes.items() if c in usecols}
+    kwargs = {"encoding": schema["encoding"], "usecols": usecols}
+    engine = CSV_ENGINE if schema["encoding"] == "utf-8" else "c"
+    if schema["thousands"]:
+        kwargs["thousands"] = ","  # pyarrow 엔진은 thousands 미지원
+        engine = "c"
+
+    if not schema["strip_pct"]:
+        # 텍스트 컬럼에도 '%' 가 있어 일괄 제거할 수 없으면 해당 숫자 컬럼만 문자열로 읽고
+        # ensure_numeric 에서 변환
+        for c in schema["pct_cols"]:
+            if c in dtypes:
+                dtypes[c] = "object"
+
+    block_read = (set(dtypes.values()) <= {"float64", "int64"} and not is_compressed(path)
+                  and path.stat().st_size >= BLOCK_READ_MIN_BYTES)
+    with open_input(path, "rb") as f:
+        # '%' 는 파서에 넘기기 전 바이트 단계에서 스트리밍으로 제거
+        source = (io.BufferedReader(_PercentStripper(f), buffer_size=STRIP_CHUNK_BYTES)
+                  if schema["strip_pct"] else f)
+        if block_read:
+            return _read_into_blocks(source, _count_lines(path), dtypes, **kwargs)
+        return pd.read_csv(source, dtype=dtypes, engine=engine, **kwargs)
+
+def _count_lines(path: Path) -> int:
+    """줄바꿈 수 (+1). 헤더 포함이므로 데이터 행 수의 상한"""
+    n = 1
+    with open(path, "rb") as f:
+        for buf in iter(lambda: f.read(STRIP_CHUNK_BYTES), b""):
+            n += buf.count(b"\n")
+    return n
+
+def _read_into_blocks(source, capacity: int, dtypes: dict, **kwargs) -> pd.DataFrame:
+    """
+    숫자 컬럼만 있는 큰 CSV: dtype 별 (컬럼 수, 행 수) 배열을 미리 잡고 청크 단위로 채운다.
+    pandas 블록과 같은 배치라 DataFrame 을 만들 때 복사가 없어서, 한 번에 읽을 때
+    (컬럼별 배열 + 블록 통합 복사로 결과의 약 2배)보다 최대 메모리가 결과 크기 근처로 낮아진다.
+    """
+    reader = pd.read_csv(source, dtype=dtypes, engine="c", chunksize=BLOCK_READ_CHUNK_ROWS, **kwargs)
+    blocks, groups, columns, pos = {}, {}, None, 0
+    with reader:
+        for chunk in reader:
+            if columns is None:
+                columns = list(chunk.columns)
+                for c in columns:
+                    groups.setdefault(str(chunk[c].dtype), []).append(c)
+                blocks = {t: np.empty((len(cs), capacity), dtype=t) for t, cs in groups.items()}
+            m = len(chunk)
+            if pos + m > capacity:  # 줄 수 추정이 모자란 경우 (CR 전용 개행 등)
+                capacity = max(2 * capacity, pos + m)
+                for t in blocks:
+                    grown = np.empty((blocks[t].shape[0], capacity), dtype=blocks[t].dtype)
+                    grown[:, :pos] = blocks[t][:, :pos]
+                    blocks[t] = grown
+            for t, cs in groups.items():
+                blocks[t][:, pos:pos + m] = chunk[cs].to_numpy(dtype=t).T
+            pos += m
+    if columns is None:
+        return pd.DataFrame({c: pd.Series(dtype=t) for c, t in dtypes.items()})
+    frames = [pd.DataFrame(blocks[t][:, :pos].T, columns=cs, copy=False) for t, cs in groups.items()]
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, axis=1)[columns]
+    return df
+
+def load_csv(path: Path, usecols=None) -> pd.DataFrame:
+    """
+    한 번의 파싱으로 CSV 를 읽는다.
+    인코딩은 앞부분 바이트로 판별하고, 컬럼 dtype 은 헤더 시그니처별로 캐시된 스키마를 쓴다.
+    usecols 에 컬럼 리스트나 컬럼명 → bool 함수를 주면 필요한 컬럼만 읽는다.
+    """
+    path = resolve_input(path)  # periodic_log.csv.gz 등 압축본 허용
     if not path.exists():
         raise FileNotFoundError(f"CSV not found: {path}")
-    for enc in ("utf-8", "cp949", "euc-kr", "utf-8-sig"):
-        try:
-            return pd.read_csv(path, encoding=enc)
-        except Exception:
-            continue
-    return pd.read_csv(path, encoding_errors="ignore")
+
+    encoding = sniff_encoding(path)
+    signature = header_signature(path, encoding)
+    schema = _load_schema_cache().get(signature)
+    if schema is None:
+        schema = infer_csv_schema(path, encoding)
+        _store_schema(signature, schema)
+
+    if callable(usecols):
+        usecols = [c for c in schema["columns"] if usecols(c)]
+
+    try:
+        return _read_with_schema(path, schema, usecols)
+    except (ValueError, TypeError, UnicodeDecodeError) as e:
+        # 샘플 이후에 스키마와 다른 값이 나온 경우: dtype 지정 없이 한 번만 다시 읽음
+        print(f"[WARN] 스키마 기반 파싱 실패, 일반 파싱으로 재시도: {path} ({e})")
+        with open_input(path, "rb") as f:
+            return pd.read_csv(f, encoding=encoding, encoding_errors="ignore", usecols=usecols)
 
 def copy_csv_to_analyze(csv_path: Path, out_root: Path):
     """periodic_log.csv 파일을 analyze/<폴더명>/로 복사"""
     exp_name = csv_path.parent.name
     dest_dir = out_root / exp_name
     dest_dir.mkdir(parents=True, exist_ok=True)
-    dest_path = dest_dir / "periodic_log.csv"
+    dest_path = dest_dir / csv_path.name  # 압축본이면 압축된 채로 복사
 
     try:
-        shutil.copy2(csv_path, dest_path)
+        with profiling.stage("write"):
+            shutil.copy2(csv_path, dest_path)
         print(f"[COPIED] {csv_path} → {dest_path}")
     except Exception as e:
         print(f"[WARN] CSV 복사 실패: {csv_path} → {e}")
@@ -60,43 +290,50 @@ def find_time_column(df: pd.DataFrame):
                 return c
     return cand[0] if cand else None
 
-def parse_time_column(df: pd.DataFrame, time_col: str):
-    """성공 시: ('_time_parsed', True), 실패 시: ('_time_index', False)"""
+def parse_time_column(df: pd.DataFrame, time_col: str, schema: dict = None):
+    """
+    성공 시: ('_time_parsed', True), 실패 시: ('_time_index', False)
+    단위(s/ms/us/ns, epoch/monotonic)는 time_axis 에서 추론하며, schema 를 넘기면 추론을 건너뛴다.
+    monotonic 시계는 첫 샘플 기준 ms 로 변환한다. 추론 결과는 df.attrs["time_schema"] 에 남긴다.
+    """
     if time_col is None:
-        df["_time_index"] = np.arange(len(df)) * 100
+        df["_time_index"] = np.arange(len(df)) * time_axis.DEFAULT_INTERVAL_MS
+        df.attrs["time_schema"] = {"column": None, "kind": "index", "unit": None,
+                                   "interval_ms": time_axis.DEFAULT_INTERVAL_MS}
         return "_time_index", False
 
-    ser = pd.to_numeric(df[time_col], errors="coerce")
-    if ser.notna().sum() > 0:
-        med = ser.dropna().median()
-        if med > 1e12:
-            dt = pd.to_datetime(ser, unit="ms", errors="coerce")
-            df["_time_parsed"] = dt
-            return "_time_parsed", True
-        elif med > 1e9:
-            dt = pd.to_datetime(ser, unit="s", errors="coerce")
-            df["_time_parsed"] = dt
-            return "_time_parsed", True
-        else:
-            df["_time_index"] = ser
-            return "_time_index", False
+    if schema is None or schema.get("column") != str(time_col):
+        schema = time_axis.infer_time_schema(df[time_col], time_col)
+    df.attrs["time_schema"] = schema
+
+    if schema["kind"] in ("epoch", "datetime"):
+        df["_time_parsed"] = time_axis.to_datetime(df[time_col], schema)
+        return "_time_parsed", True
+    if schema["kind"] == "monotonic":
+        df["_time_index"] = time_axis.to_milliseconds(df[time_col], schema)
+        return "_time_index", False
 
     df["_time_index"] = np.arange(len(df))
     return "_time_index", False
 
 def ensure_numeric(df: pd.DataFrame, cols):
+    """숫자형이 아닌 컬럼만 제자리에서 변환한다 (이미 숫자형이면 그대로 사용)"""
     out = []
-    for c in cols:
-        if c not in df.columns:
-            continue
-        s = df[c]
-        if s.dtype == object:
-            s = s.astype(str).str.replace(r"[%,]", "", regex=True).str.strip()
-        df[f"__num__{c}"] = pd.to_numeric(s, errors="coerce")
-        out.append(f"__num__{c}")
+    with profiling.stage("clean"):
+        for c in cols:
+            if c not in df.columns:
+                continue
+            if not pd.api.types.is_numeric_dtype(df[c]):
+                s = df[c].astype(str).str.replace(r"[%,]", "", regex=True).str.strip()
+                df[c] = pd.to_numeric(s, errors="coerce")
+            out.append(c)
     return out
 
 def plot_series(x, y, title, ylabel, save_dir: Path):
+    with profiling.stage("render"):
+        _plot_series(x, y, title, ylabel, save_dir)
+
+def _plot_series(x, y, title, ylabel, save_dir: Path):
     save_dir.mkdir(parents=True, exist_ok=True)
 
     plt.figure(figsize=(11, 4.5))
@@ -126,17 +363,23 @@ def plot_series(x, y, title, ylabel, save_dir: Path):
 # ===== 단일 CSV 처리 =====
 def process_csv(csv_path: Path, out_root: Path):
     copy_csv_to_analyze(csv_path, out_root)
-    df = load_csv(csv_path)
-
-    # 시간축
-    time_col_raw = find_time_column(df)
-    time_col, is_dt = parse_time_column(df, time_col_raw)
-    x = df[time_col]
+    with profiling.stage("load"):
+        df = load_csv(csv_path, usecols=lambda c: bool(PLOT_COLUMN_PATTERN.search(str(c))))
 
     # 저장 디렉터리: analyze/<실험폴더명>/figure
     exp_name = csv_path.parent.name  # 예: openxr_15W
     save_dir = out_root / exp_name / "figure"
 
+    # 시간축 (추론한 스키마는 analyze/<실험폴더명>/time_schema.json 에 캐시)
+    schema_path = out_root / exp_name / "time_schema.json"
+    with profiling.stage("parse"):
+        cached_schema = time_axis.load_time_schema(schema_path, csv_path)
+        time_col_raw = cached_schema["column"] if cached_schema else find_time_column(df)
+        time_col, is_dt = parse_time_column(df, time_col_raw, cached_schema)
+        if cached_schema is None:
+            time_axis.save_time_schema(schema_path, csv_path, df.attrs["time_schema"])
+    x = df[time_col]
+
     # ---- CPU 평균 Util (CPU0_util~CPU5_util) ----
     cpu_cols = [c for c in df.columns if re.fullmatch(r"CPU[0-5]_util", str(c))]
     if not cpu_cols:
@@ -161,12 +404,9 @@ def process_csv(csv_path: Path, out_root: Path):
             return int(m.group(1)) if m else 10**9
 
         core_num_cols = sorted(core_num_cols, key=core_key)
-        label_map = {col: re.sub(r"^__num__", "", col) for col in core_num_cols}
-
         for ncol in core_num_cols:
             y_core = df[ncol].rolling(5, min_periods=1).mean()
-            core_label = label_map[ncol]
-            plot_series(x, y_core, f"CPU Utilization {core_label}", "Percent", save_dir)
+            plot_series(x, y_core, f"CPU Utilization {ncol}", "Percent", save_dir)
     else:
         print(f"[INFO] ({exp_name}) CPU#_util 컬럼(코어별)을 찾지 못했습니다.")
 
@@ -254,9 +494,13 @@ def process_csv(csv_path: Path, out_root: Path):
         "time_column_found": time_col_raw,
         "time_column_used": time_col,
         "time_is_datetime": is_dt,
-        "cpu_cols_used": [c.replace("__num__", "") for c in cpu_nums] if cpu_nums else [],
-        "temp_cols_used": [c.replace("__num__", "") for c in temp_nums] if temp_nums else [],
-        "mem_pct_cols_used": [c.replace("__num__", "") for c in mem_pct_nums] if mem_pct_nums else []
+        "time_kind": df.attrs["time_schema"].get("kind"),
+        "time_unit": df.attrs["time_schema"].get("unit"),
+        "interval_ms": df.attrs["time_schema"].get("interval_ms"),
+        "time_gaps": df.attrs["time_schema"].get("n_gaps"),
+        "cpu_cols_used": cpu_nums,
+        "temp_cols_used": temp_nums,
+        "mem_pct_cols_used": mem_pct_nums
     })
 
 
@@ -272,7 +516,7 @@ def discover_datasets(data_root: Path, depth: int = 1):
     }
     pat = patterns.get(depth, "*")
     folders = []
-    for csv_path in data_root.glob(f"{pat}/periodic_log.csv"):
+    for csv_path in data_root.glob(f"{pat}/periodic_log.csv*"):
         if csv_path.is_file():
             folders.append(csv_path.parent)
     return sorted(set(folders))
@@ -280,10 +524,16 @@ def discover_datasets(data_root: Path, depth: int = 1):
 
 # ===== 메인 =====
 def main():
-    if DATASETS is not None:
-        dataset_dirs = [Path(p) for p in DATASETS]
-    else:
-        dataset_dirs = discover_datasets(DATA_ROOT, depth=SEARCH_DEPTH)
+    ap = argparse.ArgumentParser(description="periodic_log.csv → analyze/<폴더명>/figure 그래프")
+    profiling.add_arguments(ap)
+    args = ap.parse_args()
+    profiling.enable_from_args(args, "logger_csv_to_graph")
+
+    with profiling.stage("discover"):
+        if DATASETS is not None:
+            dataset_dirs = [Path(p) for p in DATASETS]
+        else:
+            dataset_dirs = discover_datasets(DATA_ROOT, depth=SEARCH_DEPTH)
 
     if not dataset_dirs:
         print(f"[WARN] {DATA_ROOT} 아래에서 periodic_log.csv를 찾지 못했습니다. (depth={SEARCH_DEPTH})")
@@ -291,7 +541,7 @@ def main():
 
     print(f"[INFO] 발견된 실험 폴더 수: {len(dataset_dirs)}")
     for d in dataset_dirs:
-        csv_path = d / "periodic_log.csv"
+        csv_path = resolve_input(d / "periodic_log.csv")
         try:
             process_csv(csv_path, ANALYZE_ROOT)
         except Exception as e:
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+multirun.py
+-----------
+같은 앱의 반복 실행(run) 여러 개를 메모리에 한꺼번에 올리지 않고 합치는 도구.
+
+- run 하나를 처리할 때마다 stage 별 값을 Duration 기준으로 정렬해 spool CSV 로 내려 두고
+  (n, 평균, M2) 모멘트만 메모리에 남긴다.
+- 합칠 때는 run 별 spool 을 heapq.merge 로 k-way 병합하며 한 줄씩 흘려 쓰고,
+  전체 개수 N 을 미리 알고 있으므로 pooled 분위수도 같은 스트림에서 뽑는다.
+- pooled 평균/표준편차는 run 별 모멘트를 합쳐서 계산한다.
+"""
+
+import csv
+import heapq
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from operator import itemgetter
+
+SPOOL_KEY = "Duration (ns)"
+RUN_QUANTILES = (0.5, 0.95)
+POOLED_QUANTILES = (0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+# ===== run 하나 =====
+def run_stats(v: np.ndarray) -> dict:
+    """정렬된 값(ns) → n / mean / m2(편차 제곱합) / min / max / 분위수"""
+    n = len(v)
+    mean = float(v.mean())
+    out = {"n": n, "mean": mean, "m2": float(((v - mean) ** 2).sum()), "min": float(v[0]), "max": float(v[-1])}
+    for q, val in zip(RUN_QUANTILES, np.quantile(v, RUN_QUANTILES)):
+        out[f"p{int(q * 100)}"] = float(val)
+    return out
+
+def write_spool(values: pd.DataFrame, path: Path) -> dict:
+    """
+    values: Duration (ns)[, Self (ns)] (시간 순서).
+    원래 순번(Seq)을 붙여 Duration 오름차순으로 저장하고 run 통계를 반환.
+    """
+    df = values.reset_index(drop=True)
+    df.insert(0, "Seq", np.arange(len(df)))
+    df = df.sort_values(SPOOL_KEY, kind="stable")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, index=False)
+    return run_stats(df[SPOOL_KEY].to_numpy(dtype=np.float64))
+
+
+# ===== run 합치기 =====
+def combine_moments(stats: list):
+    """[{n, mean, m2}, ...] → (N, pooled mean, pooled M2). 병렬 분산 합산 공식"""
+    n, mean, m2 = 0, 0.0, 0.0
+    for s in stats:
+        nb = s["n"]
+        if nb == 0:
+            continue
+        tot = n + nb
+        delta = s["mean"] - mean
+        mean += delta * nb / tot
+        m2 += s["m2"] + delta * delta * n * nb / tot
+        n = tot
+    return n, mean, m2
+
+def _spool_header(path: Path) -> list:
+    with open(path, newline="") as f:
+        return next(csv.reader(f))
+
+def _iter_spool(path: Path, run_id: str, cols: list):
+    """(Duration, run_id, 선택 컬럼 값들) 을 정렬 순서대로 한 줄씩"""
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        key = header.index(SPOOL_KEY)
+        idx = [header.index(c) for c in cols]
+        for row in reader:
+            yield int(row[key]), run_id, [row[i] for i in idx]
+
+def merge_spools(spools: list, out_path: Path, n_total: int, quantiles=POOLED_QUANTILES) -> dict:
+    """
+    spools: [(run_id, spool 경로), ...] (각각 Duration 오름차순).
+    Run 컬럼을 붙여 Duration 오름차순으로 out_path 에 스트리밍 저장하고 pooled 분위수를 반환.
+    분위수는 np.quantile 기본(linear) 과 같은 위치 q*(N-1) 에서 보간한다.
+    """
+    headers = [_spool_header(p) for _, p in spools]
+    cols = [c for c in headers[0] if all(c in h for h in headers)]
+
+    positions = {q: q * (n_total - 1) for q in quantiles}
+    needed = set()
+    for pos in positions.values():
+        lo = int(np.floor(pos))
+        needed.update((lo, min(lo + 1, n_total - 1)))
+    picked = {}
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    streams = [_iter_spool(p, run_id, cols) for run_id, p in spools]
+    with open(out_path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["Run"] + cols)
+        for i, (key, run_id, vals) in enumerate(heapq.merge(*streams, key=itemgetter(0))):
+            w.writerow([run_id] + vals)
+            if i in needed:
+                picked[i] = key
+
+    out = {}
+    for q, pos in positions.items():
+        lo = int(np.floor(pos))
+        hi = min(lo + 1, n_total - 1)
+        out[q] = picked[lo] + (picked[hi] - picked[lo]) * (pos - lo)
+    return out
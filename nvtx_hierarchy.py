@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+nvtx_hierarchy.py
+-----------------
+NVTX push/pop trace 의 시작/끝 시각으로 스레드별 range 스택을 다시 세워
+range 경로(부모;자식;...)별 inclusive / exclusive(self) 시간을 계산한다.
+
+- (TID, Start 오름차순, End 내림차순) 정렬 후 한 번의 선형 스윕으로 부모를 찾는다.
+- 자식 시간 합은 np.bincount 로 한 번에 구해 self = duration - Σ child.
+- flamegraph.pl / speedscope 에서 바로 열 수 있는 folded-stack 파일을 쓴다.
+
+    python nvtx_hierarchy.py illixr_nvtx_pushpop_trace.csv --out analyze/openxr_nsys
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from log_input import open_input
+
+PATH_SEP = ";"
+
+
+def stage_name(name: str) -> str:
+    """component_log_to_csv.clean_name 과 같은 규칙: 맨 앞 ':' 제거 후 첫 ':' 앞부분"""
+    name = str(name).lstrip(":")
+    if ":" in name:
+        name = name.split(":", 1)[0]
+    return name.strip()
+
+def frame_name(name: str) -> str:
+    """folded-stack 프레임 이름 (경로 구분자 ';' 는 쓸 수 없음)"""
+    return str(name).lstrip(":").strip().replace(PATH_SEP, ",")
+
+
+# ===== 스택 재구성 =====
+def build_hierarchy(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    입력: Name, Start (ns), End (ns) (또는 Duration (ns)), TID 컬럼
+    출력: 원래 행 순서 그대로 + parent / depth / path / stage / self_ns / is_outer_stage 컬럼
+      - parent : 같은 스레드에서 이 range 를 감싸는 가장 안쪽 range 의 행 번호 (-1 = 최상위)
+      - is_outer_stage : 같은 stage 의 조상이 없는 range (stage 단위 inclusive 계산 시 중복 방지)
+    부모보다 늦게 끝나는(제대로 중첩되지 않은) range 는 그 부모 밑에 넣지 않고,
+    자신을 완전히 감싸는 더 바깥 range 를 부모로 삼는다. 형제끼리 겹쳐도 self_ns 는 0 아래로 내려가지 않는다.
+    """
+    n = len(df)
+    start = df["Start (ns)"].to_numpy(dtype=np.int64)
+    if "End (ns)" in df.columns:
+        end = df["End (ns)"].to_numpy(dtype=np.int64)
+    else:
+        end = start + df["Duration (ns)"].to_numpy(dtype=np.int64)
+    tid = df["TID"].to_numpy() if "TID" in df.columns else np.zeros(n, dtype=np.int64)
+    names = df["Name"].astype(str).to_numpy()
+
+    # 부모가 자식보다 먼저 오도록: 시작 오름차순, 같은 시작이면 긴 것(끝 내림차순) 먼저
+    order = np.lexsort((-end, start, tid))
+    s_start, s_end, s_tid = start[order], end[order], tid[order]
+
+    name_ids, name_uniq = pd.factorize(names[order])
+    frames = [frame_name(x) for x in name_uniq]
+    stages = [stage_name(x) for x in name_uniq]
+    stage_ids, stage_uniq = pd.factorize(pd.Series(stages))
+
+    # 스윕은 파이썬 리스트로 (numpy 스칼라 인덱싱보다 훨씬 빠름)
+    starts, ends, tids = s_start.tolist(), s_end.tolist(), s_tid.tolist()
+    nids, sids = name_ids.tolist(), stage_ids.tolist()
+    parent_sorted = [-1] * n
+    depth_sorted = [0] * n
+    path_sorted = [0] * n
+    outer_sorted = [True] * n
+
+    # 경로 인터닝: (부모 경로 id, 이름 id) → 경로 id. 경로 수는 행 수보다 훨씬 적다
+    path_index = {}
+    path_names = []
+    path_stage_sets = []
+    stack = []
+    prev_tid = None
+    for i in range(n):
+        if tids[i] != prev_tid:
+            stack.clear()
+            prev_tid = tids[i]
+        # 부모 = 자신을 완전히 감싸는(끝이 같거나 늦은) 가장 안쪽 열린 range.
+        # 이미 끝났거나 i 보다 먼저 끝나는 range 는 스택에서 뺀다. 뒤에 올 range 가 그 안에 들어가면
+        # (시작이 i 이후이므로) i 안에도 들어가기 때문에 잃는 부모는 없고, 스택은 끝 시각 순 사슬로 유지된다.
+        en = ends[i]
+        while stack and ends[stack[-1]] < en:
+            stack.pop()
+        p = stack[-1] if stack else -1
+
+        nid = nids[i]
+        sid = sids[nid]
+        if p >= 0:
+            parent_sorted[i] = p
+            depth_sorted[i] = depth_sorted[p] + 1
+            ppath = path_sorted[p]
+        else:
+            ppath = -1
+
+        key = (ppath, nid)
+        pid = path_index.get(key)
+        if pid is None:
+            pid = len(path_names)
+            path_index[key] = pid
+            if ppath < 0:
+                path_names.append(frames[nid])
+                path_stage_sets.append(frozenset((sid,)))
+            else:
+                path_names.append(path_names[ppath] + PATH_SEP + frames[nid])
+                path_stage_sets.append(path_stage_sets[ppath] | {sid})
+        path_sorted[i] = pid
+        if ppath >= 0 and sid in path_stage_sets[ppath]:
+            outer_sorted[i] = False
+        stack.append(i)
+
+    parent_sorted = np.asarray(parent_sorted, dtype=np.int64)
+    depth_sorted = np.asarray(depth_sorted, dtype=np.int32)
+    path_sorted = np.asarray(path_sorted, dtype=np.int64)
+    outer_sorted = np.asarray(outer_sorted, dtype=bool)
+
+    dur = (s_end - s_start).astype(np.int64)
+    has_parent = parent_sorted >= 0
+    child_sum = np.bincount(parent_sorted[has_parent], weights=dur[has_parent], minlength=n)
+    self_sorted = np.maximum(dur - child_sum.astype(np.int64), 0)
+
+    # 원래 행 순서로 되돌림
+    inv = np.empty(n, dtype=np.int64)
+    inv[order] = np.arange(n)
+    parent = np.where(parent_sorted >= 0, order[np.maximum(parent_sorted, 0)], -1)
+
+    out = df.copy()
+    out["parent"] = parent[inv]
+    out["depth"] = depth_sorted[inv]
+    out["path"] = np.asarray(path_names, dtype=object)[path_sorted[inv]]
+    out["stage"] = np.asarray(stage_uniq, dtype=object)[stage_ids[name_ids]][inv]
+    out["self_ns"] = self_sorted[inv]
+    out["is_outer_stage"] = outer_sorted[inv]
+    return out
+
+
+# ===== 집계 =====
+def path_summary(h: pd.DataFrame) -> pd.DataFrame:
+    dur = h["End (ns)"] - h["Start (ns)"] if "End (ns)" in h.columns else h["Duration (ns)"]
+    g = pd.DataFrame({"path": h["path"], "inclusive_ns": dur, "self_ns": h["self_ns"]}).groupby("path")
+    out = g.agg(count=("self_ns", "size"), inclusive_ns=("inclusive_ns", "sum"), self_ns=("self_ns", "sum"))
+    return out.sort_values("inclusive_ns", ascending=False).reset_index()
+
+def stage_summary(h: pd.DataFrame) -> pd.DataFrame:
+    """stage(플러그인) 단위: inclusive 는 같은 stage 중첩을 한 번만, self 는 그대로 합산"""
+    dur = h["End (ns)"] - h["Start (ns)"] if "End (ns)" in h.columns else h["Duration (ns)"]
+    outer = h["is_outer_stage"].to_numpy()
+    df = pd.DataFrame({"stage": h["stage"], "inclusive_ns": np.where(outer, dur, 0), "self_ns": h["self_ns"]})
+    out = df.groupby("stage").agg(inclusive_ns=("inclusive_ns", "sum"), self_ns=("self_ns", "sum"))
+    total_self = out["self_ns"].sum()
+    out["self_ratio_pct"] = out["self_ns"] / total_self * 100.0 if total_self > 0 else np.nan
+    return out.sort_values("self_ns", ascending=False).reset_index()
+
+def write_folded(h: pd.DataFrame, out_path: Path):
+    """'a;b;c <self ns>' 형식 (flamegraph.pl 입력)"""
+    folded = h.groupby("path")["self_ns"].sum()
+    folded = folded[folded > 0]
+    with open(out_path, "w", encoding="utf-8") as f:
+        for path, v in folded.items():
+            f.write(f"{path} {int(v)}\n")
+
+
+def load_nvtx_trace(nvtx_csv: Path) -> pd.DataFrame:
+    with open_input(nvtx_csv, "rb") as f:
+        return pd.read_csv(f)
+
+def analyze(nvtx_csv: Path, out_dir: Path, prefix: str = "nvtx"):
+    df = load_nvtx_trace(nvtx_csv)
+    if "TID" not in df.columns:
+        print(f"[WARN] TID 컬럼이 없어 모든 range 를 한 스레드로 취급합니다: {nvtx_csv}")
+    h = build_hierarchy(df)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    path_summary(h).to_csv(out_dir / f"{prefix}_path_times.csv", index=False)
+    stage_summary(h).to_csv(out_dir / f"{prefix}_stage_times.csv", index=False, float_format="%.3f")
+    write_folded(h, out_dir / f"{prefix}.folded")
+    print(f"[OK] NVTX hierarchy: {len(h)} ranges, max depth {int(h['depth'].max()) if len(h) else 0} → {out_dir}")
+    return h
+
+
+def main():
+    ap = argparse.ArgumentParser(description="NVTX range 계층 / self time 분석")
+    ap.add_argument("nvtx_csv", type=Path)
+    ap.add_argument("--out", type=Path, default=Path("."))
+    ap.add_argument("--prefix", default="nvtx")
+    args = ap.parse_args()
+    analyze(args.nvtx_csv, args.out, args.prefix)
+
+if __name__ == "__main__":
+    main()
@@ -6,48 +6,64 @@ openvins_klt_parser.py
 
 import os
 import re
-import pandas as pd
 import matplotlib.pyplot as plt
 
+from log_input import open_input, strip_compression_suffix
+from steady_state import TRIM_STEADY_STATE, steady_describe
+
 # === 1. 경로 설정 ===
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 RESULTS_DIR = os.path.join(DATA_DIR, "results")
-os.makedirs(RESULTS_DIR, exist_ok=True)
-
-# === 2. 로그 파일 목록 ===
-log_files = [f for f in os.listdir(DATA_DIR) if f.endswith(".log")]
 
-# === 3. 정규식 패턴 ===
+# === 2. 정규식 패턴 ===
 pattern = re.compile(r"\[TIME-KLT\]:\s+([\d.]+)\s+ms\s+for\s+(.+)")
+ansi_pattern = re.compile(r"\x1B\[[0-9;]*[A-Za-z]")
 
-# === 4. 각 로그 파일 처리 ===
-for log_file in log_files:
-    log_path = os.path.join(DATA_DIR, log_file)
-    with open(log_path, "r", encoding="utf-8", errors="ignore") as f:
+# === 3. 로그 한 개 파싱 → {step: [ms, ...]} ===
+def parse_klt_log(log_path):
+    with open_input(log_path, "r", encoding="utf-8", errors="ignore") as f:
         text = f.read()
 
     # ANSI 색상 코드 제거
-    text = re.sub(r"\x1B\[[0-9;]*[A-Za-z]", "", text)
+    text = ansi_pattern.sub("", text)
 
     # 데이터 추출
-    matches = pattern.findall(text)
-    if not matches:
-        print(f"⚠️ No [TIME-KLT] entries found in {log_file}")
-        continue
-
     data = {}
-    for time_str, step in matches:
+    for time_str, step in pattern.findall(text):
         step = step.strip().split("(")[0].strip()  # "(xx features)" 등 제거
         data.setdefault(step, []).append(float(time_str))
+    return data
+
+# === 4. 통계 계산 ===
+#    단계별로 warm-up / 종료 구간을 잘라낸 뒤 통계 (n_total, n, trim_head, trim_tail 컬럼으로 기록)
+def klt_stats(data, trim=TRIM_STEADY_STATE):
+    return steady_describe(data, enabled=trim)
+
+# === 5. 각 로그 파일 처리 ===
+def main():
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    # 압축된 로그(.log.gz 등)도 포함
+    log_files = [f for f in os.listdir(DATA_DIR) if strip_compression_suffix(f).endswith(".log")]
+
+    for log_file in log_files:
+        log_path = os.path.join(DATA_DIR, log_file)
+        log_file = strip_compression_suffix(log_file)
+        data = parse_klt_log(log_path)
+        if not data:
+            print(f"⚠️ No [TIME-KLT] entries found in {log_file}")
+            continue
+
+        trim = TRIM_STEADY_STATE
+        save_klt_stats(klt_stats(data, trim), log_file, trim=trim)
 
-    # === 5. 통계 계산 ===
-    df = pd.DataFrame({step: vals for step, vals in data.items()})
-    stats = df.describe(percentiles=[0.25, 0.5, 0.75]).T[["mean", "25%", "50%", "75%"]]
+    print("\n✅ All KLT logs processed successfully.")
 
-    # === 6. CSV 저장 ===
+# === 6. 통계 CSV / 표 그래프 저장 ===
+#    trim 은 stats 를 만들 때 실제로 적용한 값 (표 제목에 표시)
+def save_klt_stats(stats, log_file, results_dir=RESULTS_DIR, trim=TRIM_STEADY_STATE):
     csv_name = log_file.replace(".log", "_klt_stats.csv")
-    csv_path = os.path.join(RESULTS_DIR, csv_name)
+    csv_path = os.path.join(results_dir, csv_name)
     stats.to_csv(csv_path, float_format="%.4f")
     print(f"✅ Saved: {csv_path}")
 
@@ -61,10 +77,11 @@ for log_file in log_files:
         loc="center"
     )
     table.scale(1, 1.5)
-    plt.title(f"{log_file.replace('.log','')} — KLT Timing Summary (ms)")
-    png_path = os.path.join(RESULTS_DIR, log_file.replace(".log", "_klt_table.png"))
+    plt.title(f"{log_file.replace('.log','')} — KLT Timing Summary (ms){' — steady state' if trim else ''}")
+    png_path = os.path.join(results_dir, log_file.replace(".log", "_klt_table.png"))
     plt.savefig(png_path, bbox_inches="tight", dpi=200)
     plt.close()
     print(f"📊 Table saved: {png_path}")
 
-print("\n✅ All KLT logs processed successfully.")
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,9 @@ import re
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from log_input import open_input, strip_compression_suffix
+from steady_state import TRIM_STEADY_STATE, steady_describe
+
 # 🔹 로그 파싱용 정규식 패턴
 patterns = {
     'tracking': re.compile(r"\[TIME\]:\s*([\d.]+)\s*ms\s*for\s*tracking"),
@@ -15,9 +18,14 @@ patterns = {
 }
 
 # 🔹 로그 한 개를 파싱하는 함수
-def parse_log(filepath):
+#    큰 파일은 parallel_log_scan 으로 구간 병렬 파싱 (workers=1 이면 항상 직렬)
+def parse_log(filepath, workers=None):
+    import parallel_log_scan
+    if parallel_log_scan.use_parallel(filepath, workers):
+        return parallel_log_scan.parallel_parse_log(filepath, workers)
+
     data = {k: [] for k in patterns.keys()}
-    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+    with open_input(filepath, 'r', encoding='utf-8', errors='ignore') as f:
         for line in f:
             for key, pattern in patterns.items():
                 match = pattern.search(line)
@@ -26,11 +34,16 @@ def parse_log(filepath):
     return pd.DataFrame(data)
 
 # 🔹 통계표 시각화 및 저장 함수 (boxplot 제거 버전)
-def save_summary_table(df, title, save_dir):
-    stats = df.describe(percentiles=[0.25, 0.5, 0.75]).T[['mean', '25%', '50%', '75%']]
+#    초기화 / 종료 구간은 항목별로 MSER-5 로 잘라내고, 잘라낸 샘플 수를 표와 CSV 에 같이 남김
+def summary_stats(df, trim=TRIM_STEADY_STATE):
+    return steady_describe(df, enabled=trim)
+
+def save_summary_table(df, title, save_dir, trim=TRIM_STEADY_STATE):
+    write_summary_table(summary_stats(df, trim), title, save_dir, trim)
 
+def write_summary_table(stats, title, save_dir, trim=TRIM_STEADY_STATE):
     # ✅ 통계표 시각화 및 저장
-    fig, ax = plt.subplots(figsize=(8, 3))
+    fig, ax = plt.subplots(figsize=(10, 3))
     ax.axis('tight')
     ax.axis('off')
     table = ax.table(
@@ -42,7 +55,7 @@ def save_summary_table(df, title, save_dir):
     table.scale(1, 1.2)
     table.auto_set_font_size(False)
     table.set_fontsize(10)
-    plt.title(f"{title} — Summary Statistics (ms)")
+    plt.title(f"{title} — Summary Statistics (ms){' — steady state' if trim else ''}")
     plt.tight_layout()
 
     table_path = os.path.join(save_dir, f"{title}_table.png")
@@ -58,13 +71,17 @@ def save_summary_table(df, title, save_dir):
 # 🔹 data 폴더 내 모든 로그 처리
 data_folder = r"C:\Users\study\Downloads\data"
 save_folder = os.path.join(data_folder, "results")
-os.makedirs(save_folder, exist_ok=True)
 
-log_files = [f for f in os.listdir(data_folder) if f.endswith(".log")]
+def main():
+    os.makedirs(save_folder, exist_ok=True)
+
+    # illixr.log.gz / .zst / .xz 처럼 압축된 로그도 그대로 처리
+    log_files = [f for f in os.listdir(data_folder) if strip_compression_suffix(f).endswith(".log")]
+
+    if not log_files:
+        print("⚠️ 로그 파일을 찾을 수 없습니다.")
+        return
 
-if not log_files:
-    print("⚠️ 로그 파일을 찾을 수 없습니다.")
-else:
     for log_name in log_files:
         filepath = os.path.join(data_folder, log_name)
         print(f"📘 Processing {log_name} ...")
@@ -72,4 +89,7 @@ else:
         if df.empty:
             print(f"  → {log_name} 에서 유효한 데이터가 없습니다.\n")
             continue
-        save_summary_table(df, os.path.splitext(log_name)[0], save_folder)
+        save_summary_table(df, os.path.splitext(strip_compression_suffix(log_name))[0], save_folder)
+
+if __name__ == "__main__":
+    main()
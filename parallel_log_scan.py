@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+parallel_log_scan.py
+--------------------
+거대한 illixr.log 한 개를 줄바꿈 경계에 맞춘 바이트 구간으로 나눠 여러 프로세스에서 파싱한다.
+
+- 각 구간은 기존 정규식(openvins_timing_parser.patterns, component_log_to_csv 의 total 패턴)을
+  그대로 쓰고, 부분 결과는 구간 순서대로 이어 붙이므로 프레임 순서가 보존된다.
+- 구간은 항상 b"\\n" 직후에서 끊기므로 줄 분리/디코딩 결과가 직렬 파싱과 같다.
+- 워커는 fork 가 아니라 forkserver(없으면 spawn)로 띄운다. pipeline_runner 처럼 스레드가 돌고 있는
+  프로세스를 fork 하면 다른 스레드가 잡고 있던 락이 자식에 복사돼 교착될 수 있다.
+
+    python parallel_log_scan.py illixr.log --verify          # 직렬 결과와 바이트 단위 비교
+    python parallel_log_scan.py illixr.log --workers 8
+"""
+
+import io
+import os
+import time
+import argparse
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from log_input import is_compressed
+
+CHUNK_BYTES = 32 << 20           # 구간 하나의 목표 크기 (32 MB)
+PARALLEL_MIN_BYTES = 256 << 20   # 이보다 작은 파일은 직렬 파싱이 더 빠름
+MAX_WORKERS = os.cpu_count() or 1
+MP_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+# ===== 구간 분할 =====
+def newline_aligned_ranges(path: Path, chunk_bytes: int = CHUNK_BYTES):
+    """[(start, end), ...] — 각 end 는 줄바꿈 바로 다음 위치 (마지막은 파일 끝)"""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        pos = chunk_bytes
+        while pos < size:
+            f.seek(pos)
+            f.readline()  # 현재 줄 끝까지 건너뜀
+            cut = f.tell()
+            if cut >= size:
+                break
+            if cut > bounds[-1]:
+                bounds.append(cut)
+            pos = cut + chunk_bytes
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _iter_lines(path: str, start: int, end: int, encoding):
+    with open(path, "rb") as f:
+        f.seek(start)
+        chunk = f.read(end - start)
+    # open(..., "r") 와 같은 디코딩/개행 처리
+    return io.TextIOWrapper(io.BytesIO(chunk), encoding=encoding, errors="ignore")
+
+
+# ===== 구간 파서 (워커 프로세스에서 실행) =====
+def _scan_openvins(args):
+    """openvins_timing_parser.parse_log 와 같은 규칙: {key: [ms, ...]}"""
+    from openvins_timing_parser import patterns
+    path, start, end = args
+    data = {k: [] for k in patterns.keys()}
+    for line in _iter_lines(path, start, end, "utf-8"):
+        if "[TIME]" not in line:
+            continue
+        for key, pattern in patterns.items():
+            match = pattern.search(line)
+            if match:
+                data[key].append(float(match.group(1)))
+    return data
+
+def _scan_openvins_totals(args):
+    """component_log_to_csv.parse_openvins_totals 와 같은 규칙: [ns, ...]"""
+    from component_log_to_csv import OPENVINS_TOTAL_PATTERN
+    path, start, end = args
+    totals = []
+    for line in _iter_lines(path, start, end, None):
+        if "[TIME]" not in line:
+            continue
+        m = OPENVINS_TOTAL_PATTERN.search(line)
+        if m:
+            totals.append(int(float(m.group(1)) * 1_000_000))  # ms → ns
+    return totals
+
+def _map_ranges(scan, path: Path, workers: int, chunk_bytes: int):
+    ranges = [(str(path), s, e) for s, e in newline_aligned_ranges(path, chunk_bytes)]
+    workers = max(1, min(workers or MAX_WORKERS, len(ranges)))
+    if workers == 1:
+        return [scan(r) for r in ranges]
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context(MP_START_METHOD)) as ex:
+        return list(ex.map(scan, ranges))  # map 은 입력 순서대로 결과를 돌려줌
+
+
+# ===== 공개 함수 =====
+def parallel_parse_log(filepath, workers: int = None, chunk_bytes: int = CHUNK_BYTES) -> pd.DataFrame:
+    """openvins_timing_parser.parse_log 의 병렬 버전 (결과 동일)"""
+    from openvins_timing_parser import patterns
+    data = {k: [] for k in patterns.keys()}
+    for part in _map_ranges(_scan_openvins, Path(filepath), workers, chunk_bytes):
+        for k, vals in part.items():
+            data[k].extend(vals)
+    return pd.DataFrame(data)
+
+def parallel_openvins_totals(log_file, workers: int = None, chunk_bytes: int = CHUNK_BYTES) -> list:
+    """component_log_to_csv.parse_openvins_totals 의 병렬 버전 (결과 동일)"""
+    totals = []
+    for part in _map_ranges(_scan_openvins_totals, Path(log_file), workers, chunk_bytes):
+        totals.extend(part)
+    return totals
+
+def use_parallel(path, workers) -> bool:
+    """workers=1 이면 항상 직렬, 그 외에는 파일 크기로 판단. 압축 파일은 바이트 구간 분할이 안 되므로 직렬"""
+    if workers == 1 or os.path.getsize(path) < PARALLEL_MIN_BYTES:
+        return False
+    return not is_compressed(path)
+
+
+# ===== 검증 =====
+def verify_identical(path: Path, workers: int = None, chunk_bytes: int = CHUNK_BYTES) -> bool:
+    """직렬/병렬 결과를 CSV 바이트로 비교"""
+    from openvins_timing_parser import parse_log
+    from component_log_to_csv import parse_openvins_totals
+
+    t0 = time.perf_counter()
+    serial_df = parse_log(path, workers=1)
+    serial_tot = parse_openvins_totals(path, workers=1)
+    t_serial = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    par_df = parallel_parse_log(path, workers, chunk_bytes)
+    par_tot = parallel_openvins_totals(path, workers, chunk_bytes)
+    t_parallel = time.perf_counter() - t0
+
+    same_df = serial_df.to_csv(index=False).encode() == par_df.to_csv(index=False).encode()
+    same_tot = (pd.DataFrame({"Duration (ns)": serial_tot}).to_csv(index=False).encode()
+                == pd.DataFrame({"Duration (ns)": par_tot}).to_csv(index=False).encode())
+    print(f"[VERIFY] parse_log            : {'IDENTICAL' if same_df else 'DIFFERENT'} ({len(serial_df)} rows)")
+    print(f"[VERIFY] parse_openvins_totals: {'IDENTICAL' if same_tot else 'DIFFERENT'} ({len(serial_tot)} rows)")
+    print(f"[VERIFY] serial {t_serial:.2f} s / parallel {t_parallel:.2f} s "
+          f"(x{t_serial / t_parallel if t_parallel > 0 else float('nan'):.2f})")
+    return same_df and same_tot
+
+
+def main():
+    ap = argparse.ArgumentParser(description="illixr.log 병렬 스캔")
+    ap.add_argument("log", type=Path)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--chunk-mb", type=int, default=CHUNK_BYTES >> 20)
+    ap.add_argument("--verify", action="store_true", help="직렬 파싱 결과와 바이트 단위 비교")
+    args = ap.parse_args()
+
+    chunk_bytes = args.chunk_mb << 20
+    if args.verify:
+        raise SystemExit(0 if verify_identical(args.log, args.workers, chunk_bytes) else 1)
+
+    t0 = time.perf_counter()
+    df = parallel_parse_log(args.log, args.workers, chunk_bytes)
+    print(f"[OK] {args.log}: {len(df)} rows in {time.perf_counter() - t0:.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+periodicity_analysis.py
+-----------------------
+stage 실행 시간 / periodic_log 지표에서 주기적인 스파이크(로그 flush, 거버너 tick, 카메라 주기 beat)를 찾는다.
+
+- 모든 시계열을 NaN 패딩 행렬로 모아 rfft 한 번으로 스펙트럼과 자기상관(Wiener–Khinchin)을 구한다.
+- 주기: 스펙트럼 상위 국소 최댓값 + 자기상관 최강 피크
+- 스파이크(MAD 기준)의 위상 정렬: 기준 주기에 대한 원형 평균 위상 / 결과 벡터 길이 R / Rayleigh p,
+  stage 쌍별 스파이크 동시 발생 비율
+- stage 간 상호상관: 공통 시간 격자로 리샘플 → z-score → FFT 상호상관의 최대값과 그 지연
+
+    python periodicity_analysis.py --app openxr
+    python periodicity_analysis.py --periodic /path/to/openxr_15W/periodic_log.csv
+"""
+
+import re
+import argparse
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from pathlib import Path
+
+from log_input import open_input, resolve_input, strip_compression_suffix
+
+ANALYZE_ROOT = Path("/home/nokdujeon/kangseok/ILLIXR/analyze")
+DATA_DIR = ANALYZE_ROOT / "data"
+
+TOP_PERIODS = 3           # 시계열마다 보고할 스펙트럼 주기 수
+MAX_LAG = 2000            # 자기상관 최대 지연 (샘플)
+SPIKE_K = 5.0             # median + K * 1.4826 * MAD 초과를 스파이크로 봄
+GRID_MS = 5.0             # stage 간 비교용 공통 시간 격자 간격
+MAX_GRID = 1 << 17        # 격자 길이 상한 (넘으면 간격을 늘림)
+XCORR_MAX_LAG_MS = 1000.0 # 상호상관에서 볼 최대 지연
+COINCIDENCE_MS = 2.0      # 두 stage 스파이크가 이 이내면 동시 발생
+
+
+# ===== 행렬 =====
+def pad_matrix(series: list, fill=np.nan):
+    """[1D 배열, ...] → (k × Lmax 행렬, 길이 배열)"""
+    lengths = np.array([len(s) for s in series], dtype=np.int64)
+    X = np.full((len(series), int(lengths.max()) if len(series) else 0), fill, dtype=np.float64)
+    for i, s in enumerate(series):
+        X[i, : len(s)] = s
+    return X, lengths
+
+def _next_pow2(n: int) -> int:
+    return 1 << max(0, int(n - 1).bit_length())
+
+def _centered(X: np.ndarray) -> np.ndarray:
+    """행별 평균 제거, 패딩(NaN)은 0 → FFT 입력"""
+    with np.errstate(invalid="ignore"):
+        Xc = X - np.nanmean(X, axis=1, keepdims=True)
+    return np.nan_to_num(Xc, nan=0.0)
+
+
+# ===== 스펙트럼 / 자기상관 =====
+def spectrum_and_acf(X: np.ndarray, lengths: np.ndarray, max_lag: int = MAX_LAG):
+    """
+    반환: (power k×(nfft/2+1), acf k×(max_lag+1), nfft)
+    선형 자기상관을 위해 2L 이상으로 zero-padding, 겹치는 샘플 수 (n - lag) 로 나눈 뒤 lag 0 으로 정규화.
+    """
+    L = X.shape[1]
+    nfft = _next_pow2(2 * L)
+    F = np.fft.rfft(_centered(X), n=nfft, axis=1)
+    power = F.real ** 2 + F.imag ** 2
+    max_lag = min(max_lag, L - 1)
+    acf = np.fft.irfft(power, n=nfft, axis=1)[:, : max_lag + 1]
+    lags = np.arange(max_lag + 1)
+    overlap = lengths[:, None] - lags[None, :]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        acf = acf / np.maximum(overlap, 1)
+        acf = acf / acf[:, :1]
+    acf[overlap <= 1] = np.nan
+    return power, acf, nfft
+
+def _local_max(A: np.ndarray) -> np.ndarray:
+    m = np.zeros(A.shape, dtype=bool)
+    m[:, 1:-1] = (A[:, 1:-1] > A[:, :-2]) & (A[:, 1:-1] >= A[:, 2:])
+    return m
+
+def dominant_periods(power: np.ndarray, nfft: int, lengths: np.ndarray, top: int = TOP_PERIODS):
+    """스펙트럼 국소 최댓값 중 상위 top 개의 주기(샘플)와 전체 파워 대비 비율"""
+    k = np.arange(power.shape[1])
+    with np.errstate(divide="ignore"):
+        period = np.where(k > 0, nfft / np.maximum(k, 1), np.inf)
+    # DC 와 시계열 길이의 절반보다 긴 주기(2번도 반복되지 않음)는 제외
+    usable = (k[None, :] > 0) & (period[None, :] <= lengths[:, None] / 2)
+    P = np.where(usable, power, 0.0)
+    total = P.sum(axis=1, keepdims=True)
+    cand = np.where(_local_max(P), P, 0.0)
+    idx = np.argsort(-cand, axis=1)[:, :top]
+    top_power = np.take_along_axis(cand, idx, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frac = top_power / total
+    periods = np.where(top_power > 0, period[idx], np.nan)
+    return periods, np.where(top_power > 0, frac, np.nan)
+
+def acf_peak(acf: np.ndarray, lengths: np.ndarray):
+    """lag ≥ 2 의 국소 최댓값 중 가장 강한 것 (95% 신뢰 한계 2/sqrt(n) 초과만). 반환: (lag, 강도)"""
+    A = np.nan_to_num(acf, nan=-np.inf)
+    conf = 2.0 / np.sqrt(np.maximum(lengths, 1))
+    cand = _local_max(A) & (A > conf[:, None])
+    cand[:, :2] = False
+    score = np.where(cand, A, -np.inf)
+    lag = score.argmax(axis=1)
+    has = np.isfinite(score.max(axis=1))
+    return np.where(has, lag, np.nan), np.where(has, score.max(axis=1), np.nan)
+
+
+# ===== 스파이크 / 위상 =====
+def mad_spikes(X: np.ndarray, k: float = SPIKE_K) -> np.ndarray:
+    """행별 median + k * 1.4826 * MAD 초과 (NaN 패딩은 False)"""
+    med = np.nanmedian(X, axis=1, keepdims=True)
+    mad = np.nanmedian(np.abs(X - med), axis=1, keepdims=True)
+    with np.errstate(invalid="ignore"):
+        return X > med + k * 1.4826 * np.maximum(mad, 1e-12)
+
+def phase_alignment(spike_t: np.ndarray, spike_id: np.ndarray, n_series: int, period: float) -> pd.DataFrame:
+    """기준 주기에 대한 스파이크 위상의 원형 통계 (stage 별, bincount 로 한 번에)"""
+    theta = 2 * np.pi * np.mod(spike_t, period) / period
+    n = np.bincount(spike_id, minlength=n_series).astype(np.float64)
+    C = np.bincount(spike_id, weights=np.cos(theta), minlength=n_series)
+    S = np.bincount(spike_id, weights=np.sin(theta), minlength=n_series)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        R = np.hypot(C, S) / n
+    return pd.DataFrame({
+        "n_spikes": n.astype(np.int64),
+        "mean_phase_deg": np.degrees(np.mod(np.arctan2(S, C), 2 * np.pi)),
+        "R": R,
+        "rayleigh_p": np.exp(-n * R ** 2),   # 큰 n 근사
+    })
+
+def coincidence_matrix(spike_t: np.ndarray, spike_id: np.ndarray, n_series: int, tol: float) -> np.ndarray:
+    """M[a, b] = a 의 스파이크 중 tol 이내에 b 스파이크가 있는 비율"""
+    M = np.full((n_series, n_series), np.nan)
+    counts = np.bincount(spike_id, minlength=n_series)
+    for b in range(n_series):
+        tb = np.sort(spike_t[spike_id == b])
+        if len(tb) == 0:
+            continue
+        pos = np.searchsorted(tb, spike_t)
+        left = np.abs(spike_t - tb[np.clip(pos - 1, 0, len(tb) - 1)])
+        right = np.abs(tb[np.clip(pos, 0, len(tb) - 1)] - spike_t)
+        hit = (np.minimum(left, right) <= tol).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            M[:, b] = np.bincount(spike_id, weights=hit, minlength=n_series) / counts
+    return M
+
+
+# ===== 상호상관 =====
+def resample_to_grid(times: list, values: list, step: float):
+    """stage 별 (시각, 값) → 공통 격자 평균 (k × L). 빈 칸은 앞 값으로 채움. 반환: (행렬, step)"""
+    ok = [np.isfinite(t) & np.isfinite(v) for t, v in zip(times, values)]
+    times = [t[m] for t, m in zip(times, ok)]
+    values = [v[m] for v, m in zip(values, ok)]
+    t0 = min(t.min() for t in times if len(t))
+    t1 = max(t.max() for t in times if len(t))
+    while (t1 - t0) / step + 1 > MAX_GRID:
+        step *= 2
+    L = int((t1 - t0) // step) + 1
+    k = len(times)
+    sid = np.concatenate([np.full(len(t), i) for i, t in enumerate(times)])
+    b = ((np.concatenate(times) - t0) // step).astype(np.int64)
+    flat = sid * L + b
+    v = np.concatenate(values)
+    cnt = np.bincount(flat, minlength=k * L).reshape(k, L)
+    sm = np.bincount(flat, weights=v, minlength=k * L).reshape(k, L)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        grid = sm / cnt
+    grid = pd.DataFrame(grid.T).ffill().to_numpy().T
+    return grid, step
+
+def xcorr_matrix(Z: np.ndarray, max_lag: int):
+    """
+    z-score 행렬 (k × L) → (최대 |상관|, 그 지연) k × k.
+    lag > 0 이면 행 stage 가 열 stage 보다 늦게 움직인다. 행 블록 단위로 irfft 를 한 번에 계산.
+    """
+    k, L = Z.shape
+    nfft = _next_pow2(2 * L)
+    F = np.fft.rfft(Z, n=nfft, axis=1)
+    max_lag = min(max_lag, L - 1)
+    lags = np.r_[np.arange(0, max_lag + 1), np.arange(-max_lag, 0)]
+    peak = np.full((k, k), np.nan)
+    peak_lag = np.full((k, k), np.nan)
+    for i in range(k):
+        cc = np.fft.irfft(F[i][None, :] * np.conj(F), n=nfft, axis=1) / L
+        cc = np.concatenate([cc[:, : max_lag + 1], cc[:, nfft - max_lag:]], axis=1)
+        j = np.abs(cc).argmax(axis=1)
+        peak[i] = cc[np.arange(k), j]
+        peak_lag[i] = lags[j]
+    return peak, peak_lag
+
+def _zscore(X: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        Z = (X - np.nanmean(X, axis=1, keepdims=True)) / np.nanstd(X, axis=1, keepdims=True)
+    return np.nan_to_num(Z, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+# ===== 분석 =====
+def analyze_series(names: list, values: list, dt: np.ndarray, unit: str, times: list = None) -> dict:
+    """
+    names/values: 시계열 이름과 값, dt: 시계열별 샘플 간격(unit, 모르면 NaN)
+    times: (선택) 시계열별 샘플 시각(unit). 있으면 위상 정렬 / 동시 발생 / 상호상관도 계산
+    """
+    X, lengths = pad_matrix(values)
+    power, acf, nfft = spectrum_and_acf(X, lengths)
+    periods, frac = dominant_periods(power, nfft, lengths)
+    lag, strength = acf_peak(acf, lengths)
+
+    table = pd.DataFrame({"series": names, "n": lengths})
+    for r in range(periods.shape[1]):
+        table[f"period{r + 1}_samples"] = periods[:, r]
+        table[f"period{r + 1}_{unit}"] = periods[:, r] * dt
+        table[f"period{r + 1}_power_pct"] = frac[:, r] * 100.0
+    table["acf_period_samples"] = lag
+    table[f"acf_period_{unit}"] = lag * dt
+    table["acf_strength"] = strength
+    spikes = mad_spikes(X)
+    table["spike_pct"] = spikes.sum(axis=1) / lengths * 100.0
+    out = {"periods": table, "acf": acf}
+
+    if times is None or len(names) < 2:
+        return out
+
+    T, _ = pad_matrix(times)
+    sid, col = np.nonzero(spikes)
+    spike_t = T[sid, col]
+    ok = np.isfinite(spike_t)
+    spike_t, sid = spike_t[ok], sid[ok]
+
+    # 기준 주기: 스펙트럼 파워 비율이 가장 큰 시계열의 1순위 주기
+    ref = int(np.nanargmax(np.nan_to_num(frac[:, 0], nan=-1))) if np.isfinite(frac[:, 0]).any() else None
+    if ref is not None and np.isfinite(periods[ref, 0] * dt[ref]):
+        ref_period = float(periods[ref, 0] * dt[ref])
+        phase = phase_alignment(spike_t, sid, len(names), ref_period)
+        phase.insert(0, "series", names)
+        phase["ref_series"] = names[ref]
+        phase[f"ref_period_{unit}"] = ref_period
+        out["phase"] = phase
+
+    tol = COINCIDENCE_MS if unit == "ms" else COINCIDENCE_MS / 1000.0
+    out["coincidence"] = pd.DataFrame(coincidence_matrix(spike_t, sid, len(names), tol), index=names, columns=names)
+
+    step = GRID_MS if unit == "ms" else max(GRID_MS / 1000.0, float(np.nanmin(dt)))
+    grid, step = resample_to_grid([np.asarray(t) for t in times], values, step)
+    max_lag = int((XCORR_MAX_LAG_MS if unit == "ms" else XCORR_MAX_LAG_MS / 1000.0) / step)
+    peak, peak_lag = xcorr_matrix(_zscore(grid), max_lag)
+    out["xcorr"] = pd.DataFrame(peak, index=names, columns=names)
+    out["xcorr_lag"] = pd.DataFrame(peak_lag * step, index=names, columns=names)
+    return out
+
+
+# ===== 입력 =====
+def load_stage_series(app: str, data_dir: Path = DATA_DIR):
+    """analyze/data/<stage>_<app>.csv → (이름, 값 ms, 간격 ms, 시각 ms 또는 None)"""
+    names, values, dts, times = [], [], [], []
+    for p in sorted(data_dir.glob(f"*_{app}.csv*")):
+        stem = Path(strip_compression_suffix(p.name)).stem
+        with open_input(p, "rb") as f:
+            df = pd.read_csv(f)
+        if "Duration (ns)" not in df.columns or len(df) < 16:
+            continue
+        names.append(stem[: -len(app) - 1])
+        values.append(df["Duration (ns)"].to_numpy(dtype=np.float64) / 1e6)
+        if "Start (ns)" in df.columns:
+            t = df["Start (ns)"].to_numpy(dtype=np.float64) / 1e6
+            times.append(t)
+            dts.append(float(np.median(np.diff(t))) if len(t) > 1 else np.nan)
+        else:
+            times.append(None)   # OpenVINS total 처럼 시각이 없는 시계열은 프레임 단위로만 분석
+            dts.append(np.nan)
+    return names, values, np.array(dts), times
+
+def load_system_series(csv_path: Path):
+    """periodic_log.csv → (컬럼 이름, 값, 간격 s, 시각 s)"""
+    from logger_csv_to_graph import PLOT_COLUMN_PATTERN, load_csv, ensure_numeric, find_time_column
+    from throttle_detector import time_axis_ms
+
+    df = load_csv(csv_path, usecols=lambda c: bool(PLOT_COLUMN_PATTERN.search(str(c))))
+    t_s = time_axis_ms(df) / 1000.0
+    time_col = find_time_column(df)
+    cols = [c for c in df.columns if c != time_col and not str(c).startswith("_time")
+            and not re.search(r"(time|date)", str(c), re.I)]
+    cols = [c for c in ensure_numeric(df, cols) if df[c].nunique(dropna=True) > 1]  # 상수 컬럼 제외
+    dt = float(np.nanmedian(np.diff(t_s))) if len(t_s) > 1 else np.nan
+    values = [df[c].to_numpy(dtype=np.float64) for c in cols]
+    return [str(c) for c in cols], values, np.full(len(cols), dt), [t_s] * len(cols)
+
+
+# ===== 저장 =====
+def plot_acf(names: list, acf: np.ndarray, out_png: Path, title: str):
+    fig, ax = plt.subplots(figsize=(10, 4.2), constrained_layout=True)
+    ax.set_prop_cycle(color=list(plt.cm.tab10.colors) + list(plt.cm.Set2.colors))
+    for name, row in zip(names, acf):
+        ax.plot(np.arange(len(row)), row, label=name, linewidth=0.9)
+    ax.axhline(0, color="black", linewidth=0.5)
+    ax.set_xlabel("Lag (samples)")
+    ax.set_ylabel("Autocorrelation")
+    ax.set_title(title)
+    ax.legend(fontsize=8, ncols=2)
+    ax.grid(True, alpha=0.3)
+    plt.savefig(out_png, dpi=150)
+    plt.close(fig)
+
+def plot_matrix(M: pd.DataFrame, out_png: Path, title: str, vmin=-1.0, vmax=1.0):
+    fig, ax = plt.subplots(figsize=(1.0 + 0.55 * len(M), 0.6 + 0.5 * len(M)), constrained_layout=True)
+    im = ax.imshow(M.to_numpy(dtype=np.float64), cmap="coolwarm", vmin=vmin, vmax=vmax)
+    ax.set_xticks(np.arange(len(M)))
+    ax.set_xticklabels(M.columns, rotation=45, ha="right", fontsize=8)
+    ax.set_yticks(np.arange(len(M)))
+    ax.set_yticklabels(M.index, fontsize=8)
+    fig.colorbar(im, ax=ax)
+    ax.set_title(title)
+    plt.savefig(out_png, dpi=150)
+    plt.close(fig)
+
+def save_results(res: dict, names: list, out_dir: Path, title: str, unit: str):
+    out_dir.mkdir(parents=True, exist_ok=True)
+    res["periods"].to_csv(out_dir / "periods.csv", index=False, float_format="%.4f")
+    plot_acf(names, res["acf"], out_dir / "autocorrelation.png", f"Autocorrelation — {title}")
+    if "phase" in res:
+        res["phase"].to_csv(out_dir / "spike_phase_alignment.csv", index=False, float_format="%.4f")
+    if "coincidence" in res:
+        res["coincidence"].to_csv(out_dir / "spike_coincidence.csv", float_format="%.3f")
+        plot_matrix(res["coincidence"], out_dir / "spike_coincidence.png", f"Spike coincidence — {title}", 0.0, 1.0)
+    if "xcorr" in res:
+        res["xcorr"].to_csv(out_dir / "xcorr_peak.csv", float_format="%.3f")
+        res["xcorr_lag"].to_csv(out_dir / f"xcorr_lag_{unit}.csv", float_format="%.3f")
+        plot_matrix(res["xcorr"], out_dir / "xcorr_peak.png", f"Cross-correlation peak — {title}")
+    print(f"[SAVED] {out_dir}")
+
+def analyze_app(app: str, data_dir: Path = DATA_DIR):
+    names, values, dts, times = load_stage_series(app, data_dir)
+    if not names:
+        print(f"[INFO] {app}: 분석할 stage 가 없습니다")
+        return
+    res = analyze_series(names, values, dts, "ms")
+    # 시각이 있는 stage 끼리만 위상 / 상호상관
+    timed = [i for i, t in enumerate(times) if t is not None]
+    if len(timed) >= 2:
+        sub = analyze_series([names[i] for i in timed], [values[i] for i in timed], dts[timed], "ms",
+                             [times[i] for i in timed])
+        res.update({k: v for k, v in sub.items() if k not in ("periods", "acf")})
+    save_results(res, names, ANALYZE_ROOT / f"{app}_nsys" / "periodicity", app, "ms")
+
+def analyze_periodic_log(csv_path: Path):
+    names, values, dts, times = load_system_series(csv_path)
+    if not names:
+        return
+    exp = csv_path.parent.name
+    res = analyze_series(names, values, dts, "s", times)
+    save_results(res, names, ANALYZE_ROOT / exp / "periodicity", exp, "s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="주기성 / 스파이크 정렬 / 상호상관 분석")
+    ap.add_argument("--app", action="append", help="analyze/data 의 앱 이름 (여러 번 지정 가능)")
+    ap.add_argument("--periodic", type=Path, action="append", help="periodic_log.csv 경로 (여러 번 지정 가능)")
+    args = ap.parse_args()
+
+    apps, periodic = args.app, args.periodic
+    if not apps and not periodic:
+        from logger_csv_to_graph import DATA_ROOT, SEARCH_DEPTH, discover_datasets
+        apps = sorted({Path(strip_compression_suffix(p.name)).stem.rsplit("_", 1)[-1]
+                       for p in DATA_DIR.glob("*_*.csv*")}) if DATA_DIR.exists() else []
+        periodic = [resolve_input(d / "periodic_log.csv") for d in discover_datasets(DATA_ROOT, depth=SEARCH_DEPTH)] \
+            if DATA_ROOT.exists() else []
+
+    for app in apps or []:
+        analyze_app(app)
+    for csv_path in periodic or []:
+        analyze_periodic_log(csv_path)
+
+if __name__ == "__main__":
+    main()
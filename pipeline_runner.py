@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+pipeline_runner.py
+------------------
+component_log_to_csv → csv_to_graph / csv_to_graph2,
+openvins_timing_parser → vio_timing_comparison,
+openvins_klt_parser → klt_timing_comparison
+체인을 한 프로세스 안의 DAG 로 실행한다.
+
+- stage 사이 데이터는 DataFrame 그대로 넘기고, 중간 CSV(analyze/data, data/results/*_stats.csv)는
+  --write-intermediates 일 때만 쓴다.
+- 서로 의존하지 않는 가지(앱별 추출, 로그별 파싱)는 스레드 풀에서 동시에 돌린다.
+  큰 로그의 정규식 파싱은 parallel_log_scan 이 다시 프로세스 풀로 나눈다.
+- matplotlib 은 스레드 안전하지 않으므로 그래프를 그리는 노드는 메인 스레드에서만 실행한다.
+- 노드별 wall time 을 analyze/pipeline_timings.csv 로 저장.
+
+    python pipeline_runner.py                        # nsys + vio + klt 전부
+    python pipeline_runner.py --only nsys --workers 4
+    python pipeline_runner.py --write-intermediates  # 기존 스크립트와 같은 중간 CSV 도 저장
+    python pipeline_runner.py --profile              # 구간별 시간 / RSS / 읽은 바이트 (profiling.py)
+"""
+
+import os
+import time
+import argparse
+import threading
+import pandas as pd
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import profiling
+from log_input import strip_compression_suffix
+
+ANALYZE_ROOT = Path("/home/nokdujeon/kangseok/ILLIXR/analyze")
+TIMINGS_CSV = ANALYZE_ROOT / "pipeline_timings.csv"
+BRANCHES = ("nsys", "vio", "klt")
+
+
+# ===== DAG =====
+class Pipeline:
+    """
+    노드 = (이름, 함수, 의존 노드 이름들, main).
+    함수는 의존 노드들의 결과를 순서대로 인자로 받고, main=True 인 노드는 메인 스레드에서 실행된다.
+    실패한 노드의 후손은 실행하지 않고 skipped 로 기록한다.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+
+    def add(self, name: str, func, deps=(), main: bool = False):
+        for d in deps:
+            if d not in self.nodes:
+                raise KeyError(f"정의되지 않은 의존 노드: {d} (← {name})")
+        self.nodes[name] = (func, tuple(deps), main)
+        return name
+
+    def run(self, workers: int = None):
+        """반환: (결과 {이름: 값}, 노드별 시간 DataFrame)"""
+        waiting = {name: len(deps) for name, (_f, deps, _m) in self.nodes.items()}
+        children = {name: [] for name in self.nodes}
+        for name, (_f, deps, _m) in self.nodes.items():
+            for d in deps:
+                children[d].append(name)
+
+        results, timings, failed = {}, [], set()
+        t_origin = time.perf_counter()
+        main_ready = []
+        running = {}
+
+        def timed(name, func, args):
+            t0 = time.perf_counter()
+            try:
+                out, status = func(*args), "ok"
+            except Exception as e:
+                print(f"[WARN] {name} 실패: {e!r}")
+                out, status = e, "failed"
+            t1 = time.perf_counter()
+            return out, {"node": name, "thread": threading.current_thread().name, "status": status,
+                         "start_s": t0 - t_origin, "end_s": t1 - t_origin, "wall_s": t1 - t0}
+
+        def finish(name, out, timing):
+            timings.append(timing)
+            if timing["status"] != "ok":
+                failed.add(name)
+            results[name] = out
+            for c in children[name]:
+                waiting[c] -= 1
+                if waiting[c] == 0:
+                    release(c)
+
+        def release(name):
+            func, deps, main = self.nodes[name]
+            if any(d in failed for d in deps):
+                print(f"[SKIP] {name}: 선행 노드 실패")
+                finish(name, None, {"node": name, "thread": "", "status": "skipped",
+                                    "start_s": float("nan"), "end_s": float("nan"), "wall_s": 0.0})
+                return
+            args = [results[d] for d in deps]
+            if main:
+                main_ready.append((name, func, args))
+            else:
+                running[pool.submit(timed, name, func, args)] = name
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                                thread_name_prefix="worker") as pool:
+            for name, n in list(waiting.items()):
+                if n == 0:
+                    release(name)
+            while main_ready or running:
+                if main_ready:
+                    # 그래프 노드는 하나씩 메인 스레드에서; 그 사이 워커는 계속 돈다
+                    name, func, args = main_ready.pop(0)
+                    finish(name, *timed(name, func, args))
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    finish(running.pop(fut), *fut.result())
+
+        df = pd.DataFrame(timings, columns=["node", "thread", "status", "start_s", "end_s", "wall_s"])
+        df.insert(1, "branch", df["node"].str.split(":", n=1).str[0])
+        return results, df
+
+
+# ===== nsys 가지: component_log_to_csv → csv_to_graph / csv_to_graph2 =====
+def extract_app(app_dir: Path, write_intermediates: bool) -> dict:
+    """앱 폴더 최신 런 → {stage 파일 이름: DataFrame(ns)} (component_log_to_csv.process_app 과 같은 내용)"""
+    import component_log_to_csv as clc
+
+    app = app_dir.name.replace("_nsys", "")
+    with profiling.stage("discover"):
+        run_dir, log_file, nvtx_csv = clc.find_run_files(app_dir)
+    frames = {}
+    if log_file.exists():
+        frames["OpenVINS"] = pd.DataFrame({"Duration (ns)": clc.parse_openvins_totals(log_file)})
+    if nvtx_csv.exists():
+        nvtx, _skipped = clc.nvtx_stage_frames(nvtx_csv, hierarchy_dir=ANALYZE_ROOT / f"{app}_nsys")
+        frames.update({clc.safe_filename(k): v for k, v in nvtx.items()})
+    if write_intermediates:
+        clc.ANALYZE_DIR.mkdir(parents=True, exist_ok=True)
+        clc.write_stage_frames(frames, app, clc.ANALYZE_DIR)
+    print(f"[OK] {app}: stages={len(frames)}")
+    return {"app": app, "run_dir": run_dir, "nvtx_csv": nvtx_csv, "frames": frames}
+
+def render_app_graphs(extracted: dict):
+    import csv_to_graph
+
+    with profiling.stage("summarize"):
+        times = {stage: csv_to_graph.times_ms(df) for stage, df in extracted["frames"].items()}
+    with profiling.stage("render"):
+        csv_to_graph.plot_stage_times(extracted["app"], {k: v[0] for k, v in times.items()},
+                                      {k: v[1] for k, v in times.items()})
+
+def render_app_bars(extracted: dict):
+    import csv_to_graph2
+
+    series = {stage: df["Duration (ns)"] / 1_000_000.0 for stage, df in extracted["frames"].items()}
+    with profiling.stage("render"):
+        csv_to_graph2.plot_stage_bars(extracted["app"], series)
+
+def render_app_cuda(extracted: dict):
+    import component_log_to_csv as clc
+
+    clc.attribute_cuda(extracted["run_dir"], extracted["nvtx_csv"], extracted["app"])
+
+def add_nsys_branch(pipe: Pipeline, write_intermediates: bool):
+    import component_log_to_csv as clc
+
+    if not clc.BASE_DIR.exists():
+        print(f"[SKIP] nsys: {clc.BASE_DIR} 없음")
+        return
+    for app_dir in sorted(d for d in clc.subdirs(clc.BASE_DIR) if d.name.endswith("_nsys")):
+        app = app_dir.name.replace("_nsys", "")
+        ext = pipe.add(f"nsys:{app}:extract", lambda d=app_dir: extract_app(d, write_intermediates))
+        pipe.add(f"nsys:{app}:graph", render_app_graphs, [ext], main=True)
+        pipe.add(f"nsys:{app}:bars", render_app_bars, [ext], main=True)
+        pipe.add(f"nsys:{app}:cuda", render_app_cuda, [ext], main=True)
+
+
+# ===== vio / klt 가지: 로그 파서 → 비교 그래프 =====
+def _log_files(log_dir: str) -> list:
+    """[(scene, 경로)] — illixr.log.gz 처럼 압축된 로그 포함"""
+    if not os.path.isdir(log_dir):
+        return []
+    out = []
+    for f in sorted(os.listdir(log_dir)):
+        name = strip_compression_suffix(f)
+        if name.endswith(".log"):
+            out.append((os.path.splitext(name)[0], os.path.join(log_dir, f)))
+    return out
+
+def _collect(scenes: list):
+    """비교 노드 입력: 파싱 노드 결과들 → {scene: 통계} (데이터 없는 scene 제외)"""
+    return lambda *stats: {s: st for s, st in zip(scenes, stats) if st is not None}
+
+def _render(plot, *args):
+    with profiling.stage("render"):
+        return plot(*args)
+
+def vio_stats(path: str):
+    import openvins_timing_parser as otp
+
+    with profiling.stage("parse"):
+        df = otp.parse_log(path)
+    if df.empty:
+        return None
+    with profiling.stage("summarize"):
+        return otp.summary_stats(df)
+
+def klt_stats(path: str):
+    import openvins_klt_parser as okp
+
+    with profiling.stage("parse"):
+        data = okp.parse_klt_log(path)
+    if not data:
+        return None
+    with profiling.stage("summarize"):
+        return okp.klt_stats(data)
+
+def add_vio_branch(pipe: Pipeline, log_dir: str, write_intermediates: bool):
+    import openvins_timing_parser as otp
+    import vio_timing_comparison as vtc
+
+    logs = _log_files(log_dir)
+    parsed = [pipe.add(f"vio:{scene}:parse", lambda p=path: vio_stats(p)) for scene, path in logs]
+    if write_intermediates:
+        for (scene, _path), node in zip(logs, parsed):
+            def write(stats, scene=scene):
+                if stats is not None:
+                    os.makedirs(vtc.DATA_DIR, exist_ok=True)
+                    with profiling.stage("write"):
+                        otp.write_summary_table(stats, scene, vtc.DATA_DIR)
+            pipe.add(f"vio:{scene}:write", write, [node], main=True)
+    if parsed:
+        scenes = [s for s, _ in logs]
+        pipe.add("vio:compare", lambda *st: _render(vtc.plot_comparison, _collect(scenes)(*st)), parsed, main=True)
+
+def add_klt_branch(pipe: Pipeline, log_dir: str, write_intermediates: bool):
+    import openvins_klt_parser as okp
+    import klt_timing_comparison as ktc
+
+    logs = _log_files(log_dir)
+    parsed = [pipe.add(f"klt:{scene}:parse", lambda p=path: klt_stats(p)) for scene, path in logs]
+    if write_intermediates:
+        for (scene, _path), node in zip(logs, parsed):
+            def write(stats, scene=scene):
+                if stats is not None:
+                    os.makedirs(okp.RESULTS_DIR, exist_ok=True)
+                    with profiling.stage("write"):
+                        okp.save_klt_stats(stats, f"{scene}.log")
+            pipe.add(f"klt:{scene}:write", write, [node], main=True)
+    if parsed:
+        scenes = [s for s, _ in logs]
+        pipe.add("klt:compare", lambda *st: _render(ktc.plot_comparison, _collect(scenes)(*st)), parsed, main=True)
+
+
+def build_pipeline(branches, log_dir: str, write_intermediates: bool) -> Pipeline:
+    pipe = Pipeline()
+    if "nsys" in branches:
+        add_nsys_branch(pipe, write_intermediates)
+    if "vio" in branches:
+        add_vio_branch(pipe, log_dir, write_intermediates)
+    if "klt" in branches:
+        add_klt_branch(pipe, log_dir, write_intermediates)
+    return pipe
+
+def main():
+    import openvins_klt_parser
+
+    ap = argparse.ArgumentParser(description="ILLIXR 분석 스크립트 체인을 한 프로세스 DAG 로 실행")
+    ap.add_argument("--only", choices=BRANCHES, action="append", help="실행할 가지 (여러 번 지정 가능, 기본: 전부)")
+    ap.add_argument("--workers", type=int, default=None, help="워커 스레드 수 (기본: CPU 수)")
+    ap.add_argument("--log-dir", default=openvins_klt_parser.DATA_DIR, help="vio / klt 가지가 읽을 <scene>.log 폴더")
+    ap.add_argument("--write-intermediates", action="store_true",
+                    help="analyze/data/*.csv, data/results/*_stats.csv 같은 중간 결과도 저장")
+    ap.add_argument("--timings", type=Path, default=TIMINGS_CSV, help="노드별 시간 CSV 경로")
+    profiling.add_arguments(ap)
+    args = ap.parse_args()
+    profiling.enable_from_args(args, "pipeline_runner")
+
+    with profiling.stage("discover"):
+        pipe = build_pipeline(args.only or BRANCHES, args.log_dir, args.write_intermediates)
+    if not pipe.nodes:
+        raise SystemExit("[INFO] 실행할 노드가 없습니다")
+
+    t0 = time.perf_counter()
+    _results, timings = pipe.run(args.workers)
+    total = time.perf_counter() - t0
+
+    args.timings.parent.mkdir(parents=True, exist_ok=True)
+    timings.to_csv(args.timings, index=False, float_format="%.4f")
+    print("\n=== STAGE WALL TIME ===")
+    print(timings.sort_values("wall_s", ascending=False).to_string(index=False, float_format="%.3f"))
+    by_branch = timings.groupby("branch")["wall_s"].sum()
+    print(f"\n[OK] total wall {total:.2f}s (노드 합 {timings['wall_s'].sum():.2f}s, "
+          + ", ".join(f"{b} {s:.2f}s" for b, s in by_branch.items()) + ")")
+    print(f"[SAVED] {args.timings}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+power_efficiency_report.py
+--------------------------
+전력 로그(tegrastats CSV 또는 periodic_log.csv의 VDD_IN)와 illixr.log의
+[TIME] ... for total 항목을 실험 폴더 단위로 묶어
+에너지/프레임(mJ/frame)과 성능/와트(frames/J)를 장면별·전력모드별로 계산한다.
+
+- 실험 폴더명 규칙: <scene>_<power mode>  (예: openxr_15W, materials_MAXN)
+- 에너지는 전력 샘플을 시간축으로 사다리꼴 적분(벡터화)하여 구한다.
+- illixr.log에는 타임스탬프가 없으므로, 전력 로그 구간과 로그 구간이 같은 실행을
+  덮고 있다고 가정하고 해당 구간 동안 완료된 total 항목 수를 프레임 수로 쓴다.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from pathlib import Path
+
+import time_axis
+from log_input import open_input, resolve_input
+from logger_csv_to_graph import load_csv, find_time_column, parse_time_column
+
+# ====== 사용자 설정 ======
+DATA_ROOT = Path("/home/nokdujeon/kangseok/ILLIXR/build")  # 실험 폴더들의 부모 폴더
+SEARCH_DEPTH = 2
+ANALYZE_ROOT = Path("/home/nokdujeon/kangseok/ILLIXR/analyze")
+REPORT_DIR = ANALYZE_ROOT / "power_efficiency"
+
+# 전력 로그 후보 (앞쪽이 우선, .gz/.zst 등 압축본 포함)
+POWER_LOG_GLOBS = ("tegrastats*.csv*", "periodic_log.csv*")
+POWER_COL_PATTERN = re.compile(r"(VDD_IN|power_mW|power)", re.I)
+
+TOTAL_PATTERN = re.compile(r"\[TIME\]:\s*([\d\.]+)\s*ms\s*for\s*total")
+
+
+# ===== 입력 =====
+def count_total_entries(log_file: Path) -> int:
+    """illixr.log 의 '[TIME] ... for total' 항목 수 = 완료된 OpenVINS 업데이트(프레임) 수"""
+    n = 0
+    with open_input(log_file, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            if TOTAL_PATTERN.search(line):
+                n += 1
+    return n
+
+def find_power_log(exp_dir: Path):
+    for pat in POWER_LOG_GLOBS:
+        hits = sorted(exp_dir.glob(pat))
+        if hits:
+            return hits[0]
+    return None
+
+def power_time_seconds(df: pd.DataFrame, power_path: Path) -> np.ndarray:
+    """
+    전력 샘플의 시간축(초, 0부터 시작)을 만든다.
+    tegrastats 타임스탬프는 1초 해상도라 파일명의 샘플링 간격(…_10ms.csv)을 우선 사용한다.
+    """
+    m = re.search(r"_(\d+)ms", power_path.stem)
+    if m:
+        return np.arange(len(df), dtype=np.float64) * int(m.group(1)) / 1000.0
+
+    time_col_raw = find_time_column(df)
+    time_col, _is_dt = parse_time_column(df, time_col_raw)
+    if time_col_raw is None:
+        t_ms = df[time_col].to_numpy(dtype=np.float64)
+    else:
+        t_ms = time_axis.to_milliseconds(df[time_col_raw], df.attrs["time_schema"])
+    return (t_ms - np.nanmin(t_ms)) / 1000.0
+
+def energy_joules(t_s: np.ndarray, power_mw: np.ndarray) -> float:
+    """사다리꼴 적분: Σ (p[i] + p[i+1]) / 2 * (t[i+1] - t[i])  [mW·s → J]"""
+    valid = np.isfinite(t_s) & np.isfinite(power_mw)
+    t, p = t_s[valid], power_mw[valid]
+    if len(t) < 2:
+        return float("nan")
+    return float(np.sum((p[1:] + p[:-1]) * np.diff(t)) * 0.5 / 1000.0)
+
+
+# ===== 실험 하나 처리 =====
+def split_scene_mode(exp_name: str):
+    """'openxr_15W' -> ('openxr', '15W'),  규칙: 마지막 '_' 뒤가 전력 모드"""
+    if "_" not in exp_name:
+        return exp_name, "unknown"
+    scene, mode = exp_name.rsplit("_", 1)
+    return scene, mode
+
+def evaluate_experiment(exp_dir: Path):
+    log_file = resolve_input(exp_dir / "illixr.log")
+    power_path = find_power_log(exp_dir)
+    if not log_file.exists() or power_path is None:
+        print(f"[SKIP] {exp_dir.name}: illixr.log 또는 전력 로그 없음")
+        return None
+
+    df = load_csv(power_path)
+    power_cols = [c for c in df.columns if POWER_COL_PATTERN.search(str(c))]
+    if not power_cols:
+        print(f"[WARN] {exp_dir.name}: 전력 컬럼(VDD_IN/power)을 찾지 못했습니다 → {power_path}")
+        return None
+
+    power_mw = pd.to_numeric(df[power_cols[0]], errors="coerce").to_numpy(dtype=np.float64)
+    t_s = power_time_seconds(df, power_path)
+    energy_j = energy_joules(t_s, power_mw)
+    duration_s = float(np.nanmax(t_s) - np.nanmin(t_s)) if len(t_s) else float("nan")
+    frames = count_total_entries(log_file)
+
+    scene, mode = split_scene_mode(exp_dir.name)
+    row = {
+        "experiment": exp_dir.name,
+        "scene": scene,
+        "power_mode": mode,
+        "power_log": str(power_path),
+        "power_col": power_cols[0],
+        "frames": frames,
+        "duration_s": duration_s,
+        "energy_J": energy_j,
+        "avg_power_W": energy_j / duration_s if duration_s > 0 else float("nan"),
+        "fps": frames / duration_s if duration_s > 0 else float("nan"),
+        "mJ_per_frame": energy_j * 1000.0 / frames if frames > 0 else float("nan"),
+        "frames_per_J": frames / energy_j if energy_j > 0 else float("nan"),
+    }
+    print(f"[OK] {exp_dir.name}: frames={frames}, E={energy_j:.2f} J, "
+          f"{row['mJ_per_frame']:.2f} mJ/frame, {row['frames_per_J']:.3f} frames/J")
+    return row
+
+
+# ===== 리포트 =====
+def plot_metric(table: pd.DataFrame, metric: str, ylabel: str, out_dir: Path):
+    pivot = table.pivot_table(index="scene", columns="power_mode", values=metric, aggfunc="mean")
+    pivot.to_csv(out_dir / f"{metric}_by_scene_mode.csv", float_format="%.4f")
+
+    ax = pivot.plot(kind="bar", figsize=(9, 5))
+    ax.set_title(f"{metric} per scene / power mode")
+    ax.set_ylabel(ylabel)
+    ax.set_xlabel("Scene")
+    ax.grid(axis="y", alpha=0.3)
+    ax.legend(title="Power mode")
+    plt.xticks(rotation=0)
+    plt.tight_layout()
+    out_png = out_dir / f"{metric}_by_scene_mode.png"
+    plt.savefig(out_png, dpi=150)
+    plt.close()
+    print(f"[SAVED] {out_png}")
+
+def discover_experiments(data_root: Path, depth: int = 1):
+    pat = "/".join(["*"] * max(depth, 1))
+    return sorted({p.parent for p in data_root.glob(f"{pat}/illixr.log*") if p.is_file()})
+
+
+# ===== 메인 =====
+def main():
+    exp_dirs = discover_experiments(DATA_ROOT, depth=SEARCH_DEPTH)
+    if not exp_dirs:
+        print(f"[WARN] {DATA_ROOT} 아래에서 illixr.log 를 가진 실험 폴더를 찾지 못했습니다.")
+        return
+
+    rows = [r for r in (evaluate_experiment(d) for d in exp_dirs) if r is not None]
+    if not rows:
+        print("[WARN] 계산 가능한 실험이 없습니다.")
+        return
+
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    table = pd.DataFrame(rows).sort_values(["scene", "power_mode"], ignore_index=True)
+    out_csv = REPORT_DIR / "power_efficiency.csv"
+    table.to_csv(out_csv, index=False, float_format="%.4f")
+    print(f"[SAVED] {out_csv}")
+
+    plot_metric(table, "mJ_per_frame", "mJ / frame", REPORT_DIR)
+    plot_metric(table, "frames_per_J", "frames / J", REPORT_DIR)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+profiling.py
+------------
+분석 스크립트 자체의 구간별 비용 측정 (--profile).
+
+    with profiling.stage("load"):
+        df = pd.read_csv(...)
+
+- 구간 이름은 discover / load / parse / clean / group / summarize / render / write 를 쓴다.
+- 구간마다 호출 수, wall / CPU 시간, RSS 변화와 최대값, /proc/self/io 의 읽은 바이트(rchar, read_bytes)를 누적.
+  RSS 와 I/O 카운터는 프로세스 전체 값이라 스레드가 겹치면(pipeline_runner) 구간 간에 섞일 수 있다.
+- enable() 전에는 stage() 가 공유 nullcontext 하나를 돌려줄 뿐이라 꺼져 있을 때 비용은 함수 호출 한 번.
+- cprofile=True 면 스레드마다 가장 바깥 구간을 cProfile 로 기록해 두고,
+  종료 시 wall time 합이 가장 큰 구간의 pstats(.pstats + 상위 함수 .txt)만 저장한다.
+- 결과: analyze/profile/<이름>_<시각>.json / .csv (프로세스 종료 시 자동 저장)
+"""
+
+import os
+import io
+import json
+import time
+import atexit
+import pstats
+import cProfile
+import threading
+import contextlib
+from pathlib import Path
+from datetime import datetime
+
+ANALYZE_ROOT = Path("/home/nokdujeon/kangseok/ILLIXR/analyze")
+PROFILE_DIR = ANALYZE_ROOT / "profile"
+STAGES = ("discover", "load", "parse", "clean", "group", "summarize", "render", "write")
+PSTATS_TOP = 40   # .txt 에 남길 상위 함수 수
+
+_NULL = contextlib.nullcontext()
+_profiler = None
+
+
+# ===== 프로세스 카운터 =====
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def rss_bytes() -> int:
+    """현재 RSS (리눅스 /proc/self/statm, 없으면 ru_maxrss 로 대신)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def io_bytes() -> tuple:
+    """(rchar, read_bytes). rchar 는 페이지 캐시 포함 read() 바이트, read_bytes 는 실제 저장장치 읽기"""
+    try:
+        with open("/proc/self/io") as f:
+            kv = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(kv["rchar"]), int(kv["read_bytes"])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+
+# ===== 측정기 =====
+class Profiler:
+    def __init__(self, name: str, out_dir: Path = PROFILE_DIR, cprofile: bool = False):
+        self.name = name
+        self.out_dir = Path(out_dir)
+        self.cprofile = cprofile
+        self.started = datetime.now()
+        self.t0 = time.perf_counter()
+        self.stats = {}        # 구간 이름 → 누적 값
+        self.pstats = {}       # 구간 이름 → pstats.Stats (cprofile=True)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.peak_rss = rss_bytes()
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        depth = getattr(self.local, "depth", 0)
+        self.local.depth = depth + 1
+        prof = None
+        if self.cprofile and depth == 0:
+            prof = cProfile.Profile()
+            try:
+                prof.enable()
+            except ValueError:   # 같은 스레드에 다른 프로파일러가 이미 켜져 있음
+                prof = None
+        rss0, (rchar0, rb0) = rss_bytes(), io_bytes()
+        c0, t0 = time.thread_time(), time.perf_counter()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - t0, time.thread_time() - c0
+            if prof is not None:
+                prof.disable()
+            rss1, (rchar1, rb1) = rss_bytes(), io_bytes()
+            self.local.depth = depth
+            with self.lock:
+                s = self.stats.setdefault(name, {"stage": name, "calls": 0, "wall_s": 0.0, "cpu_s": 0.0,
+                                                 "rss_delta_mb": 0.0, "rss_max_mb": 0.0,
+                                                 "read_mb": 0.0, "disk_read_mb": 0.0})
+                s["calls"] += 1
+                s["wall_s"] += wall
+                s["cpu_s"] += cpu
+                s["rss_delta_mb"] += (rss1 - rss0) / 1e6
+                s["rss_max_mb"] = max(s["rss_max_mb"], rss1 / 1e6)
+                s["read_mb"] += (rchar1 - rchar0) / 1e6
+                s["disk_read_mb"] += (rb1 - rb0) / 1e6
+                self.peak_rss = max(self.peak_rss, rss1)
+                if prof is not None:
+                    if name in self.pstats:
+                        self.pstats[name].add(prof)
+                    else:
+                        self.pstats[name] = pstats.Stats(prof)
+
+    def rows(self) -> list:
+        total = time.perf_counter() - self.t0
+        out = []
+        for s in sorted(self.stats.values(), key=lambda r: -r["wall_s"]):
+            out.append({**s, "wall_pct": s["wall_s"] / total * 100.0 if total > 0 else 0.0})
+        return out
+
+    def save(self) -> Path:
+        """JSON / CSV (+ 가장 무거운 구간의 pstats) 저장. 반환: JSON 경로"""
+        import csv
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        base = self.out_dir / f"{self.name}_{self.started:%Y%m%d_%H%M%S}"
+        rows = self.rows()
+        report = {
+            "name": self.name,
+            "started": self.started.isoformat(timespec="seconds"),
+            "wall_s": time.perf_counter() - self.t0,
+            "peak_rss_mb": self.peak_rss / 1e6,
+            "pid": os.getpid(),
+            "stages": rows,
+        }
+        if self.pstats and rows:
+            hottest = next((r["stage"] for r in rows if r["stage"] in self.pstats), None)
+            if hottest is not None:
+                pst = self.pstats[hottest]
+                pst.dump_stats(str(base) + f"_{hottest}.pstats")
+                buf = io.StringIO()
+                pst.stream = buf
+                pst.sort_stats("cumulative").print_stats(PSTATS_TOP)
+                Path(str(base) + f"_{hottest}.txt").write_text(buf.getvalue())
+                report["pstats_stage"] = hottest
+
+        with open(str(base) + ".json", "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        with open(str(base) + ".csv", "w", newline="") as f:
+            cols = ["stage", "calls", "wall_s", "wall_pct", "cpu_s", "rss_delta_mb", "rss_max_mb",
+                    "read_mb", "disk_read_mb"]
+            w = csv.DictWriter(f, fieldnames=cols)
+            w.writeheader()
+            for r in rows:
+                w.writerow({c: (f"{r[c]:.4f}" if isinstance(r[c], float) else r[c]) for c in cols})
+        return Path(str(base) + ".json")
+
+    def print_summary(self):
+        print("\n=== PROFILE ===")
+        print(f"{'stage':<12}{'calls':>8}{'wall_s':>10}{'%':>7}{'cpu_s':>10}{'rss_max_mb':>12}{'read_mb':>10}")
+        for r in self.rows():
+            print(f"{r['stage']:<12}{r['calls']:>8}{r['wall_s']:>10.3f}{r['wall_pct']:>7.1f}"
+                  f"{r['cpu_s']:>10.3f}{r['rss_max_mb']:>12.1f}{r['read_mb']:>10.1f}")
+
+
+# ===== 모듈 인터페이스 =====
+def stage(name: str):
+    """측정 구간. --profile 이 꺼져 있으면 아무 일도 하지 않는 공유 컨텍스트"""
+    if _profiler is None:
+        return _NULL
+    return _profiler.stage(name)
+
+def enabled() -> bool:
+    return _profiler is not None
+
+def enable(name: str, out_dir: Path = PROFILE_DIR, cprofile: bool = False) -> Profiler:
+    """측정 시작. 프로세스가 끝날 때(정상 종료 / SystemExit) 결과를 저장한다"""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler(name, out_dir, cprofile)
+        atexit.register(finish)
+    return _profiler
+
+def finish():
+    """결과 저장 후 측정 종료 (여러 번 불러도 한 번만 저장)"""
+    global _profiler
+    prof, _profiler = _profiler, None
+    if prof is None:
+        return
+    prof.print_summary()
+    print(f"[SAVED] {prof.save()}")
+
+def add_arguments(ap):
+    """argparse 에 --profile / --profile-cprofile 추가"""
+    ap.add_argument("--profile", action="store_true",
+                    help=f"구간별 시간 / RSS / 읽은 바이트를 {PROFILE_DIR}/ 에 JSON, CSV 로 저장")
+    ap.add_argument("--profile-cprofile", action="store_true",
+                    help="--profile 과 함께: 가장 오래 걸린 구간의 cProfile pstats 도 저장")
+
+def enable_from_args(args, name: str):
+    if getattr(args, "profile", False) or getattr(args, "profile_cprofile", False):
+        enable(name, cprofile=args.profile_cprofile)
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+results_db.py
+-------------
+흩어져 있는 분석 결과(analyze/data/*.csv, analyze/multirun, results/*_stats.csv, *_klt_stats.csv,
+실험별 periodic_log.csv)를 하나의 SQLite 파일에 모으고, 비교 스크립트가 디렉터리를 다시 훑는 대신
+인덱스 쿼리로 읽도록 한다.
+
+테이블
+  runs(run_id, app, run, source, ingested_at)            -- (app, run, source) 당 한 행
+                                                          -- run: run 디렉터리 이름 또는 원본 파일 수정 시각
+  stages(stage_id, name)
+  durations(run_id, stage_id, seq, duration_ns, self_ns)  -- 프레임별 실행 시간
+  metrics(metric_id, name)
+  system_samples(run_id, metric_id, t_ms, value)          -- periodic_log.csv 시계열 (long format)
+  summaries(run_id, stage_id, stat, value)                -- mean / 25% / 50% / 75% ...
+
+    python results_db.py ingest                       # 기본 경로 전부 적재
+    python results_db.py ingest --results-dir data/results --db data/results/results.sqlite
+    python results_db.py runs
+"""
+
+import re
+import sqlite3
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+
+from log_input import open_input, strip_compression_suffix
+
+ANALYZE_ROOT = Path("/home/nokdujeon/kangseok/ILLIXR/analyze")
+DB_PATH = ANALYZE_ROOT / "results.sqlite"
+DATA_DIR = ANALYZE_ROOT / "data"            # component_log_to_csv 출력
+MULTIRUN_DIR = ANALYZE_ROOT / "multirun"    # component_log_to_csv --multi-run 출력
+RESULTS_DIR = ANALYZE_ROOT / "results"      # openvins_timing_parser / openvins_klt_parser 출력
+BATCH_ROWS = 100_000                        # executemany 한 번에 넣을 행 수
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      INTEGER PRIMARY KEY,
+    app         TEXT NOT NULL,
+    run         TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    ingested_at TEXT NOT NULL,
+    UNIQUE (app, run, source)
+);
+CREATE TABLE IF NOT EXISTS stages (
+    stage_id INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS durations (
+    run_id      INTEGER NOT NULL REFERENCES runs(run_id),
+    stage_id    INTEGER NOT NULL REFERENCES stages(stage_id),
+    seq         INTEGER NOT NULL,
+    duration_ns INTEGER NOT NULL,
+    self_ns     INTEGER
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    metric_id INTEGER PRIMARY KEY,
+    name      TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS system_samples (
+    run_id    INTEGER NOT NULL REFERENCES runs(run_id),
+    metric_id INTEGER NOT NULL REFERENCES metrics(metric_id),
+    t_ms      REAL NOT NULL,
+    value     REAL
+);
+CREATE TABLE IF NOT EXISTS summaries (
+    run_id   INTEGER NOT NULL REFERENCES runs(run_id),
+    stage_id INTEGER NOT NULL REFERENCES stages(stage_id),
+    stat     TEXT NOT NULL,
+    value    REAL,
+    PRIMARY KEY (run_id, stage_id, stat)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_app ON runs (app, run);
+CREATE INDEX IF NOT EXISTS idx_durations_stage_run ON durations (stage_id, run_id, seq);
+CREATE INDEX IF NOT EXISTS idx_samples_run_metric ON system_samples (run_id, metric_id, t_ms);
+CREATE INDEX IF NOT EXISTS idx_summaries_stage ON summaries (stage_id, stat);
+"""
+
+
+# ===== 연결 / 키 =====
+def connect(db_path: Path = DB_PATH) -> sqlite3.Connection:
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(db_path)
+    con.execute("PRAGMA journal_mode = WAL")
+    con.execute("PRAGMA synchronous = NORMAL")
+    con.executescript(SCHEMA)
+    return con
+
+def _name_id(con, table: str, id_col: str, name: str) -> int:
+    con.execute(f"INSERT OR IGNORE INTO {table} (name) VALUES (?)", (name,))
+    return con.execute(f"SELECT {id_col} FROM {table} WHERE name = ?", (name,)).fetchone()[0]
+
+def stage_id(con, name: str) -> int:
+    return _name_id(con, "stages", "stage_id", name)
+
+def metric_id(con, name: str) -> int:
+    return _name_id(con, "metrics", "metric_id", name)
+
+def get_run(con, app: str, run: str, source: str, replace: bool = True) -> int:
+    """run_id 반환. replace=True 면 같은 run 의 기존 데이터를 지우고 다시 적재할 수 있게 한다"""
+    row = con.execute("SELECT run_id FROM runs WHERE app = ? AND run = ? AND source = ?",
+                      (app, run, source)).fetchone()
+    now = datetime.now().isoformat(timespec="seconds")
+    if row is None:
+        cur = con.execute("INSERT INTO runs (app, run, source, ingested_at) VALUES (?, ?, ?, ?)",
+                          (app, run, source, now))
+        return cur.lastrowid
+    run_id = row[0]
+    if replace:
+        for table in ("durations", "system_samples", "summaries"):
+            con.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+        con.execute("UPDATE runs SET ingested_at = ? WHERE run_id = ?", (now, run_id))
+    return run_id
+
+
+# ===== 적재 =====
+def _executemany_batched(con, sql: str, rows, batch: int = BATCH_ROWS):
+    buf = []
+    for r in rows:
+        buf.append(r)
+        if len(buf) >= batch:
+            con.executemany(sql, buf)
+            buf.clear()
+    if buf:
+        con.executemany(sql, buf)
+
+def insert_durations(con, run_id: int, stage: str, duration_ns, self_ns=None, seq=None):
+    d = np.asarray(duration_ns, dtype=np.int64)
+    s = np.arange(len(d)) if seq is None else np.asarray(seq, dtype=np.int64)
+    sid = stage_id(con, stage)
+    if self_ns is None:
+        rows = ((run_id, sid, i, v, None) for i, v in zip(s.tolist(), d.tolist()))
+    else:
+        rows = zip([run_id] * len(d), [sid] * len(d), s.tolist(), d.tolist(),
+                   np.asarray(self_ns, dtype=np.int64).tolist())
+    _executemany_batched(con, "INSERT INTO durations VALUES (?, ?, ?, ?, ?)", rows)
+
+def insert_summary(con, run_id: int, stage: str, stats: dict):
+    sid = stage_id(con, stage)
+    con.executemany("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?)",
+                    [(run_id, sid, k, float(v)) for k, v in stats.items() if pd.notna(v)])
+
+def insert_system_samples(con, run_id: int, t_ms: np.ndarray, frame: pd.DataFrame):
+    t = np.asarray(t_ms, dtype=np.float64).tolist()
+    for col in frame.columns:
+        mid = metric_id(con, str(col))
+        v = frame[col].to_numpy(dtype=np.float64)
+        vals = np.where(np.isfinite(v), v, np.nan).tolist()
+        rows = ((run_id, mid, ti, None if vi != vi else vi) for ti, vi in zip(t, vals))
+        _executemany_batched(con, "INSERT INTO system_samples VALUES (?, ?, ?, ?)", rows)
+
+def _split_stage_app(stem: str):
+    """'Timewarp_vk_openxr' -> ('Timewarp_vk', 'openxr') (csv_to_graph 규칙과 동일)"""
+    if "_" not in stem:
+        return stem, "unknown"
+    return tuple(stem.rsplit("_", 1))
+
+def _read_csv(path: Path) -> pd.DataFrame:
+    with open_input(path, "rb") as f:
+        return pd.read_csv(f)
+
+def capture_stamp(paths) -> str:
+    """원본 파일들 중 가장 늦은 수정 시각 'YYYYmmdd_HHMMSS' — 고정 경로에 덮어쓰는 출력의 run 키"""
+    mtime = max(Path(p).stat().st_mtime for p in paths)
+    return datetime.fromtimestamp(mtime).strftime("%Y%m%d_%H%M%S")
+
+def ingest_stage_csvs(con, data_dir: Path = DATA_DIR, run: str = None) -> int:
+    """
+    analyze/data/<stage>_<app>.csv (component_log_to_csv 기본 모드 출력).
+    이 폴더는 추출할 때마다 덮어쓰이므로 run 을 주지 않으면 앱별 CSV 의 수정 시각을 run 키로 쓴다.
+    → 새로 추출한 결과는 새 run, 같은 파일을 다시 적재하면 그 run 만 교체.
+    """
+    by_app = {}
+    for p in sorted(data_dir.glob("*.csv*")):
+        stage, app = _split_stage_app(Path(strip_compression_suffix(p.name)).stem)
+        by_app.setdefault(app, []).append((stage, p))
+
+    n = 0
+    for app, files in by_app.items():
+        run_id = get_run(con, app, run or capture_stamp(p for _, p in files), "nvtx")
+        for stage, p in files:
+            df = _read_csv(p)
+            if "Duration (ns)" not in df.columns:
+                continue
+            insert_durations(con, run_id, stage, df["Duration (ns)"],
+                             df["Self (ns)"] if "Self (ns)" in df.columns else None)
+            n += len(df)
+        con.commit()
+    return n
+
+def ingest_multirun(con, multirun_dir: Path = MULTIRUN_DIR) -> int:
+    """analyze/multirun/<app>/runs/<run>/<stage>.csv spool (Seq 로 원래 순서 복원)"""
+    n = 0
+    for app_dir in sorted(d for d in multirun_dir.glob("*") if d.is_dir()):
+        for run_dir in sorted(d for d in (app_dir / "runs").glob("*") if d.is_dir()):
+            run_id = get_run(con, app_dir.name, run_dir.name, "nvtx")
+            for p in sorted(run_dir.glob("*.csv")):
+                df = _read_csv(p)
+                insert_durations(con, run_id, p.stem, df["Duration (ns)"],
+                                 df["Self (ns)"] if "Self (ns)" in df.columns else None, seq=df["Seq"])
+                n += len(df)
+            con.commit()
+    return n
+
+def ingest_stats_csvs(con, results_dir: Path = RESULTS_DIR) -> int:
+    """
+    results/<app>_stats.csv (OpenVINS), results/<app>_klt_stats.csv (KLT) → summaries.
+    파서가 같은 파일명에 덮어쓰므로 파일 수정 시각을 run 키로 써서 이전 결과를 남긴다.
+    """
+    n = 0
+    for p in sorted(results_dir.glob("*_stats.csv")):
+        stem = p.stem[: -len("_stats")]
+        if stem.endswith("_klt"):
+            app, source = stem[: -len("_klt")], "klt_stats"
+        else:
+            app, source = stem, "openvins_stats"
+        df = pd.read_csv(p, index_col=0)
+        run_id = get_run(con, app, capture_stamp([p]), source)
+        for step, row in df.iterrows():
+            insert_summary(con, run_id, str(step), row.to_dict())
+            n += 1
+    con.commit()
+    return n
+
+def ingest_periodic_log(con, csv_path: Path) -> int:
+    """
+    periodic_log.csv → system_samples (실험 폴더 이름이 app, 첫 샘플 기준 ms).
+    로거가 같은 파일명에 덮어쓰므로 ingest_stage_csvs 처럼 파일 수정 시각을 run 키로 쓴다.
+    """
+    from logger_csv_to_graph import PLOT_COLUMN_PATTERN, load_csv, ensure_numeric, find_time_column
+    from throttle_detector import time_axis_ms
+
+    df = load_csv(csv_path, usecols=lambda c: bool(PLOT_COLUMN_PATTERN.search(str(c))))
+    t_ms = time_axis_ms(df)
+    time_col = find_time_column(df)
+    cols = [c for c in df.columns if c != time_col and not str(c).startswith("_time")
+            and not re.search(r"(time|date)", str(c), re.I)]
+    cols = ensure_numeric(df, cols)
+    run_id = get_run(con, csv_path.parent.name, capture_stamp([csv_path]), "periodic_log")
+    insert_system_samples(con, run_id, t_ms, df[cols])
+    con.commit()
+    return len(df) * len(cols)
+
+
+# ===== 조회 =====
+def list_runs(con, app: str = None) -> pd.DataFrame:
+    sql = "SELECT run_id, app, run, source, ingested_at FROM runs"
+    params = ()
+    if app is not None:
+        sql += " WHERE app = ?"
+        params = (app,)
+    return pd.read_sql_query(sql + " ORDER BY app, run", con, params=params)
+
+def durations(con, app: str, stage: str, run: str = None) -> pd.DataFrame:
+    """(run, seq, duration_ns, self_ns) — run 을 주지 않으면 그 앱의 모든 run"""
+    sql = ("SELECT r.run, d.seq, d.duration_ns, d.self_ns FROM durations d "
+           "JOIN runs r ON r.run_id = d.run_id JOIN stages s ON s.stage_id = d.stage_id "
+           "WHERE r.app = ? AND s.name = ?")
+    params = [app, stage]
+    if run is not None:
+        sql += " AND r.run = ?"
+        params.append(run)
+    return pd.read_sql_query(sql + " ORDER BY r.run, d.seq", con, params=params)
+
+def stage_stats(con, app: str = None) -> pd.DataFrame:
+    """app / stage / run 별 n, mean, min, max (ms) — csv_to_graph2 막대그래프와 같은 지표"""
+    sql = ("SELECT r.app, s.name AS stage, r.run, COUNT(*) AS n, AVG(d.duration_ns) / 1e6 AS mean_ms, "
+           "MIN(d.duration_ns) / 1e6 AS min_ms, MAX(d.duration_ns) / 1e6 AS max_ms "
+           "FROM durations d JOIN runs r ON r.run_id = d.run_id JOIN stages s ON s.stage_id = d.stage_id")
+    params = ()
+    if app is not None:
+        sql += " WHERE r.app = ?"
+        params = (app,)
+    return pd.read_sql_query(sql + " GROUP BY r.app, s.name, r.run ORDER BY r.app, s.name, r.run", con, params=params)
+
+def summary_table(con, source: str, stat: str, apps=None) -> pd.DataFrame:
+    """
+    index=stage(step), columns=app 인 표. 같은 앱에 여러 run 이 있으면 가장 최근 run(수정 시각 키)을 쓴다.
+    vio_timing_comparison(source='openvins_stats') / klt_timing_comparison(source='klt_stats') 용.
+    """
+    df = pd.read_sql_query(
+        "SELECT r.app, s.name AS stage, m.value, r.run, r.ingested_at FROM summaries m "
+        "JOIN runs r ON r.run_id = m.run_id JOIN stages s ON s.stage_id = m.stage_id "
+        "WHERE r.source = ? AND m.stat = ?", con, params=(source, stat))
+    if apps is not None:
+        df = df[df["app"].isin(list(apps))]
+    df = df.sort_values(["run", "ingested_at"]).drop_duplicates(["app", "stage"], keep="last")
+    table = df.pivot(index="stage", columns="app", values="value")
+    if apps is not None:
+        table = table[[a for a in apps if a in table.columns]]
+    return table
+
+def latest_run(con, app: str, source: str):
+    """그 앱/소스의 가장 최근 run 키 (수정 시각 키라 문자열 최대값 = 최신). 없으면 None"""
+    return con.execute("SELECT MAX(run) FROM runs WHERE app = ? AND source = ?", (app, source)).fetchone()[0]
+
+def system_series(con, app: str, metric: str, run: str = None) -> pd.DataFrame:
+    """periodic_log 시계열 한 컬럼: (t_ms, value) — run 을 주지 않으면 그 앱의 가장 최근 run"""
+    if run is None:
+        run = latest_run(con, app, "periodic_log")
+    return pd.read_sql_query(
+        "SELECT t.t_ms, t.value FROM system_samples t JOIN runs r ON r.run_id = t.run_id "
+        "JOIN metrics m ON m.metric_id = t.metric_id "
+        "WHERE r.app = ? AND r.source = 'periodic_log' AND r.run = ? AND m.name = ? ORDER BY t.t_ms",
+        con, params=(app, run, metric))
+
+
+# ===== CLI =====
+def main():
+    ap = argparse.ArgumentParser(description="분석 결과 SQLite DB")
+    ap.add_argument("--db", type=Path, default=DB_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    ing = sub.add_parser("ingest", help="결과 파일 적재 (같은 run 은 덮어씀)")
+    ing.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    ing.add_argument("--multirun-dir", type=Path, default=MULTIRUN_DIR)
+    ing.add_argument("--results-dir", type=Path, default=RESULTS_DIR)
+    ing.add_argument("--periodic-root", type=Path, default=None,
+                     help="periodic_log.csv 를 찾을 상위 폴더 (기본: logger_csv_to_graph.DATA_ROOT)")
+
+    sub.add_parser("runs", help="적재된 run 목록")
+    st = sub.add_parser("stats", help="app / stage / run 별 통계")
+    st.add_argument("--app", default=None)
+    args = ap.parse_args()
+
+    con = connect(args.db)
+    try:
+        if args.cmd == "ingest":
+            if args.data_dir.exists():
+                print(f"[OK] analyze/data     : {ingest_stage_csvs(con, args.data_dir)} rows")
+            if args.multirun_dir.exists():
+                print(f"[OK] multirun spools  : {ingest_multirun(con, args.multirun_dir)} rows")
+            if args.results_dir.exists():
+                print(f"[OK] stats CSV        : {ingest_stats_csvs(con, args.results_dir)} steps")
+            from logger_csv_to_graph import DATA_ROOT, SEARCH_DEPTH, discover_datasets
+            from log_input import resolve_input
+            root = args.periodic_root or DATA_ROOT
+            if root.exists():
+                for d in discover_datasets(root, depth=SEARCH_DEPTH):
+                    n = ingest_periodic_log(con, resolve_input(d / "periodic_log.csv"))
+                    print(f"[OK] periodic_log     : {d.name} ({n} samples)")
+            print(f"[SAVED] {args.db}")
+        elif args.cmd == "runs":
+            print(list_runs(con).to_string(index=False))
+        elif args.cmd == "stats":
+            print(stage_stats(con, args.app).to_string(index=False, float_format="%.3f"))
+    finally:
+        con.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+steady_state.py
+---------------
+OpenVINS 초기화 프레임 / 종료 직전 샘플처럼 정상 상태가 아닌 구간을 MSER-5 로 잘라낸다.
+
+MSER(d) = Σ_{i≥d} (y_i - ȳ_d)² / (n - d)²  (y 는 5개씩 묶은 배치 평균)
+을 최소로 하는 d 가 warm-up 절단점. 접미 누적합으로 모든 d 를 한 번에 계산한다.
+종료 구간은 남은 구간을 뒤집어 같은 방식으로 찾는다.
+
+환경 변수 ILLIXR_TRIM_STEADY_STATE=0 이면 기본값이 '자르지 않음' 으로 바뀐다.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+
+TRIM_STEADY_STATE = os.environ.get("ILLIXR_TRIM_STEADY_STATE", "1") != "0"
+MSER_BATCH = 5
+MAX_TRIM_FRAC = 0.5   # 한쪽에서 잘라낼 수 있는 최대 비율 (MSER 는 끝부분에서 불안정)
+MIN_SAMPLES = 4 * MSER_BATCH
+
+TRIM_COLUMNS = ["n_total", "n", "trim_head", "trim_tail"]
+
+
+def mser_truncation(y: np.ndarray, batch: int = MSER_BATCH, max_frac: float = MAX_TRIM_FRAC) -> int:
+    """앞에서 잘라낼 샘플 수 (batch 배수)"""
+    nb = len(y) // batch
+    if nb < 4:
+        return 0
+    b = y[: nb * batch].reshape(nb, batch).mean(axis=1)
+    s1 = np.cumsum(b[::-1])[::-1]          # s1[d] = Σ_{i≥d} b_i
+    s2 = np.cumsum((b * b)[::-1])[::-1]
+    m = np.arange(nb, 0, -1, dtype=np.float64)
+    sse = np.maximum(s2 - s1 * s1 / m, 0.0)
+    d_max = max(1, int(nb * max_frac))
+    d = int(np.argmin(sse[:d_max] / (m[:d_max] ** 2)))
+    return d * batch
+
+def steady_window(values, batch: int = MSER_BATCH, max_frac: float = MAX_TRIM_FRAC):
+    """정상 상태 구간 [start, end). 샘플이 MIN_SAMPLES 보다 적으면 전체 구간"""
+    y = np.asarray(values, dtype=np.float64)
+    n = len(y)
+    if n < MIN_SAMPLES:
+        return 0, n
+    head = mser_truncation(y, batch, max_frac)
+    tail = mser_truncation(y[head:][::-1], batch, max_frac)
+    return head, n - tail
+
+def trim_series(s: pd.Series, enabled: bool = None):
+    """
+    s → (정상 상태 구간만 남긴 Series, {n_total, n, trim_head, trim_tail}).
+    enabled=None 이면 TRIM_STEADY_STATE 를 따른다.
+    """
+    enabled = TRIM_STEADY_STATE if enabled is None else enabled
+    s = pd.Series(s).dropna()
+    n = len(s)
+    start, end = steady_window(s.to_numpy()) if enabled else (0, n)
+    info = {"n_total": n, "n": end - start, "trim_head": start, "trim_tail": n - end}
+    return s.iloc[start:end], info
+
+def steady_describe(data, percentiles=(0.25, 0.5, 0.75), columns=("mean", "25%", "50%", "75%"),
+                    enabled: bool = None) -> pd.DataFrame:
+    """
+    {이름: 값 목록} 또는 DataFrame → 이름별 describe() 통계 + 잘라낸 범위 (TRIM_COLUMNS).
+    열마다 길이가 달라도 되며, 각 열을 따로 잘라낸 뒤 통계를 낸다.
+    """
+    items = data.items() if isinstance(data, dict) else ((c, data[c]) for c in data.columns)
+    rows = {}
+    for name, vals in items:
+        trimmed, info = trim_series(pd.Series(vals, dtype=np.float64), enabled)
+        desc = trimmed.describe(percentiles=list(percentiles))
+        rows[name] = {**{c: desc.get(c, np.nan) for c in columns}, **info}
+    return pd.DataFrame.from_dict(rows, orient="index", columns=list(columns) + TRIM_COLUMNS)
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+synthetic_data.py
+-----------------
+벤치마크/검증용 합성 데이터 생성기.
+실제 로거 출력과 같은 형식의 파일을 원하는 크기로 만든다.
+
+- periodic_log.csv : steady_clock ns 타임스탬프, 코어별 util(%)/freq(kHz), GPU, 온도(m°C), 메모리
+- illixr.log       : OpenVINS [TIME] / [TIME-KLT] 줄 + 일반 로그 줄 (일부 ANSI 색상 코드 포함)
+- NVTX push/pop CSV: nsys nvtx_pushpop_trace 형식, 플러그인별 중첩 range
+- tegrastats 로그  : tegrastats 텍스트 출력 형식
+- CUDA trace       : nsys cuda_api_trace / cuda_gpu_trace + NVTX CSV (vector_add_nvtx.cu 패턴), 정답 귀속 표
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+
+def generate_periodic_log(path: Path, n_rows: int = 100_000, n_cores: int = 6,
+                          interval_ms: int = 1, percent: bool = True, seed: int = 0) -> Path:
+    """
+    periodic_log.csv 형식의 합성 로그.
+    percent=True 이면 util 컬럼을 '12.3%' 문자열로 기록한다 (실제 로거와 동일).
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n_rows)
+    cols = {}
+
+    # steady_clock(부팅 후 경과) 나노초
+    cols["timestamp"] = 3_600_000_000_000 + np.arange(n, dtype=np.int64) * interval_ms * 1_000_000
+
+    util = np.clip(rng.normal(45.0, 15.0, size=(n, n_cores)), 0.0, 100.0)
+    max_khz = 1_984_000
+    steps_khz = np.array([max_khz, 1_728_000, 1_420_800, 729_600])
+    freq = steps_khz[rng.choice(len(steps_khz), size=(n, n_cores), p=[0.85, 0.08, 0.05, 0.02])]
+    for i in range(n_cores):
+        u = np.round(util[:, i], 1)
+        cols[f"CPU{i}_util"] = pd.Series(u).astype(str) + "%" if percent else u
+        cols[f"CPU{i}_freq"] = freq[:, i]
+        cols[f"CPU{i}_max_freq"] = np.full(n, max_khz)
+
+    cols["GPU_util"] = rng.integers(0, 1000, size=n)  # Jetson load (0~999, ‰)
+    cols["GPU_freq"] = rng.choice([1_300_500_000, 1_032_750_000, 624_750_000], size=n, p=[0.8, 0.15, 0.05])
+
+    walk = np.cumsum(rng.normal(0.0, 20.0, size=(n, 2)), axis=0)
+    temp = np.clip(48_000 + walk, 30_000, 95_000).astype(np.int64)
+    cols["cpu_temp"] = temp[:, 0]
+    cols["gpu_temp"] = temp[:, 1]
+
+    mem_total = 31_000_000
+    cols["mem_used"] = (mem_total * np.clip(0.4 + np.cumsum(rng.normal(0, 1e-4, n)), 0.05, 0.95)).astype(np.int64)
+    cols["mem_total"] = np.full(n, mem_total)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(cols).to_csv(path, index=False)
+    return path
+
+
+# ===== illixr.log =====
+OPENVINS_STEPS = [
+    ("tracking", 4.0), ("propagation", 0.3), ("MSCKF update", 2.5), ("SLAM update", 1.2),
+    ("SLAM delayed init", 0.6), ("marginalization", 0.2),
+]
+KLT_STEPS = [
+    ("pyramid", 0.8), ("detection", 1.5), ("temporal klt", 2.0), ("stereo klt", 1.7),
+    ("feature DB update", 0.4), ("total", 6.4),
+]
+NOISE_LINES = [
+    "[INFO] [plugin] timewarp_vk: submitted frame\n",
+    "[DEBUG] [switchboard] topic fast_pose: 1 subscriber\n",
+    "\x1b[0;33m[WARN] [camera] frame dropped, queue full\x1b[0m\n",
+]
+
+def generate_illixr_log(path: Path, n_frames: int = 10_000, klt: bool = True,
+                        noise_per_frame: int = 3, seed: int = 0) -> Path:
+    """
+    프레임마다 OpenVINS [TIME] 7줄(+ total), KLT [TIME-KLT] 6줄, 일반 로그 몇 줄을 쓴다.
+    실행시간은 lognormal 분포.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n_frames)
+    ov = {name: rng.lognormal(np.log(mu), 0.35, size=n) for name, mu in OPENVINS_STEPS}
+    ov_total = np.sum(list(ov.values()), axis=0)
+    kl = {name: rng.lognormal(np.log(mu), 0.3, size=n) for name, mu in KLT_STEPS}
+    n_features = rng.integers(80, 400, size=n)
+    noise = rng.integers(0, len(NOISE_LINES), size=(n, noise_per_frame))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            lines = [NOISE_LINES[j] for j in noise[i]]
+            if klt:
+                for name, _mu in KLT_STEPS:
+                    extra = f" ({n_features[i]} features)" if name == "detection" else ""
+                    color = "\x1b[0;32m" if name == "total" else ""
+                    lines.append(f"{color}[TIME-KLT]: {kl[name][i]:.4f} ms for {name}{extra}\n")
+            for name, _mu in OPENVINS_STEPS:
+                lines.append(f"[TIME]: {ov[name][i]:.4f} ms for {name}\n")
+            lines.append(f"[TIME]: {ov_total[i]:.4f} ms for total\n")
+            f.writelines(lines)
+    return path
+
+
+# ===== NVTX push/pop trace CSV =====
+# (이름, 스레드 번호, 평균 ms, [(자식 이름, 부모 대비 비율), ...])
+NVTX_PLUGINS = [
+    (":OpenVINS:feed_imu_cam", 1, 9.0, [(":OpenVINS:track_image_and_update", 0.7)]),
+    (":Timewarp_vk:warp", 2, 1.2, [(":Timewarp_vk:record_command_buffer", 0.3)]),
+    (":Native_renderer:draw", 3, 3.5, [(":Native_renderer:update_uniforms", 0.2),
+                                       (":Native_renderer:submit", 0.4)]),
+    (":Gtsam_integrator:propagate", 4, 0.4, []),
+    (":Pose_prediction:get fast pose", 5, 0.05, []),
+]
+
+NVTX_FRAME_GAP_NS = 1_000   # 같은 스레드에서 다음 프레임 range 시작 전 최소 간격
+NVTX_OVERLAP_EXTRA = 0.5    # overlap_frames=True: 부모 range 를 주기의 이 비율만큼 더 늘림
+
+NVTX_COLUMNS = ["Start (ns)", "End (ns)", "Duration (ns)", "DurChild (ns)", "DurNonChild (ns)",
+                "Name", "PID", "TID", "Lvl", "NumChild", "RangeId", "ParentId"]
+
+def generate_nvtx_pushpop_csv(path: Path, n_frames: int = 10_000, period_ms: float = 11.1,
+                              seed: int = 0, overlap_frames: bool = False) -> Path:
+    """
+    프레임 주기마다 플러그인 스레드별 부모 range 1개와 그 안에 순차 배치된 자식 range 를 만든다.
+    DurChild/DurNonChild/Lvl/ParentId 는 실제 중첩 구조와 일치하게 채운다.
+    부모 range 는 같은 스레드의 다음 프레임 시작 전에 끝나도록 잘라서 프레임끼리 겹치지 않는다
+    (자식은 부모 길이에 비례해 배치되므로 함께 줄어든다).
+    overlap_frames=True 면 반대로 부모를 주기의 NVTX_OVERLAP_EXTRA 만큼 늘려, 같은 스레드의 모든 프레임이
+    다음 프레임과 겹치는(중첩은 아닌) 사슬을 만든다. nvtx_hierarchy 스윕의 최악 경우 벤치마크용.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n_frames)
+    pid = 4242
+    frame_start = (np.arange(n, dtype=np.int64) * int(period_ms * 1e6)) + 1_000_000_000
+    parts = []
+    next_id = 1
+
+    for name, tid_off, mean_ms, children in NVTX_PLUGINS:
+        tid = pid + tid_off
+        p_start = frame_start + rng.integers(0, 500_000, size=n)
+        p_dur = (rng.lognormal(np.log(mean_ms), 0.3, size=n) * 1e6).astype(np.int64) + 1_000
+        if overlap_frames:
+            p_dur += int(period_ms * 1e6 * NVTX_OVERLAP_EXTRA)
+        else:
+            p_dur[:-1] = np.minimum(p_dur[:-1], np.diff(p_start) - NVTX_FRAME_GAP_NS)
+        p_ids = np.arange(next_id, next_id + n, dtype=np.int64)
+        next_id += n
+
+        child_sum = np.zeros(n, dtype=np.int64)
+        cursor = p_start + (p_dur * 0.05).astype(np.int64)
+        for c_name, ratio in children:
+            c_dur = (p_dur * ratio * rng.uniform(0.8, 1.0, size=n)).astype(np.int64)
+            c_ids = np.arange(next_id, next_id + n, dtype=np.int64)
+            next_id += n
+            parts.append(pd.DataFrame({
+                "Start (ns)": cursor, "End (ns)": cursor + c_dur, "Duration (ns)": c_dur,
+                "DurChild (ns)": 0, "DurNonChild (ns)": c_dur, "Name": c_name, "PID": pid,
+                "TID": tid, "Lvl": 1, "NumChild": 0, "RangeId": c_ids, "ParentId": p_ids,
+            }))
+            child_sum += c_dur
+            cursor = cursor + c_dur
+
+        parts.append(pd.DataFrame({
+            "Start (ns)": p_start, "End (ns)": p_start + p_dur, "Duration (ns)": p_dur,
+            "DurChild (ns)": child_sum, "DurNonChild (ns)": p_dur - child_sum, "Name": name,
+            "PID": pid, "TID": tid, "Lvl": 0, "NumChild": len(children), "RangeId": p_ids,
+            "ParentId": -1,
+        }))
+
+    df = pd.concat(parts, ignore_index=True).sort_values(["Start (ns)", "Lvl"], ignore_index=True)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df[NVTX_COLUMNS].to_csv(path, index=False)
+    return path
+
+
+# ===== CUDA API / GPU trace (vector_add_nvtx.cu 패턴) =====
+CUDA_API_COLUMNS = ["Start (ns)", "Duration (ns)", "Name", "Result", "CorrID", "Pid", "Tid", "T-Pri", "Thread Name"]
+CUDA_GPU_COLUMNS = ["Start (ns)", "Duration (ns)", "CorrId", "Bytes (MB)", "Throughput (MBps)",
+                    "SrcMemKd", "DstMemKd", "Device", "Ctx", "Strm", "Name"]
+
+def generate_cuda_trace(out_dir: Path, n_frames: int = 1_000, period_ms: float = 11.1, seed: int = 0) -> dict:
+    """
+    프레임마다 ':VectorAdd:iteration' range 안에 'H2D memcpy'(memcpy 2회), 'Kernel launch'(launch + sync),
+    range 밖 memset 1회, 'D2H memcpy'(memcpy 1회)를 배치한다.
+    memset 은 앞 형제 range 가 끝난 뒤 부모 range 안에서 호출되므로 부모로 올라가는 경로도 검증된다.
+    반환: {"nvtx", "api", "gpu", "expected"} 경로. expected 는 CorrId 별 정답 range 경로와 복사 바이트.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n_frames)
+    us = 1_000
+    pid, tid = 4242, 4252
+    t0 = np.arange(n, dtype=np.int64) * int(period_ms * 1e6) + 1_000_000_000
+    nbytes = rng.choice(np.array([1 << 20, 4 << 20], dtype=np.int64), size=(n, 3))
+    m = (nbytes / 1e3).astype(np.int64) + rng.integers(5, 30, size=(n, 3)) * us   # ~1 GB/s + 고정 비용
+    k = rng.integers(200, 2_000, size=n) * us
+
+    # ---- 시각 배치 ----
+    h2d_s = t0 + 5 * us
+    api1_s = h2d_s + us
+    api2_s = api1_s + m[:, 0]
+    h2d_e = api2_s + m[:, 1] + us
+    kl_s = h2d_e + 2 * us
+    launch_s = kl_s + us
+    sync_s = launch_s + 5 * us
+    kern_s = launch_s + 7 * us
+    sync_e = kern_s + k + us
+    kl_e = sync_e + us
+    memset_s = kl_e + 2 * us
+    d2h_s = memset_s + 10 * us
+    api3_s = d2h_s + us
+    d2h_e = api3_s + m[:, 2] + us
+    parent_e = d2h_e + 5 * us
+
+    corr = 1 + np.arange(n, dtype=np.int64)[:, None] * 6 + np.arange(6)
+    # (api 이름, 시작, 끝, corr 열)
+    api_calls = [
+        ("cudaMemcpy", api1_s, api2_s, 0), ("cudaMemcpy", api2_s, api2_s + m[:, 1], 1),
+        ("cudaLaunchKernel", launch_s, sync_s, 2), ("cudaDeviceSynchronize", sync_s, sync_e, 3),
+        ("cudaMemsetAsync", memset_s, memset_s + 4 * us, 4), ("cudaMemcpy", api3_s, api3_s + m[:, 2], 5),
+    ]
+    api = pd.concat([pd.DataFrame({
+        "Start (ns)": s, "Duration (ns)": e - s, "Name": name, "Result": 0, "CorrID": corr[:, j],
+        "Pid": pid, "Tid": tid, "T-Pri": 0, "Thread Name": "vector_add",
+    }) for name, s, e, j in api_calls], ignore_index=True).sort_values("Start (ns)", ignore_index=True)
+
+    # (이름, 시작, 끝, corr 열, 바이트, src, dst, 정답 경로)
+    root = "VectorAdd:iteration"
+    gpu_ops = [
+        ("[CUDA memcpy Host-to-Device]", api1_s + 3 * us, api2_s - us, 0, nbytes[:, 0], "Pageable", "Device",
+         f"{root};H2D memcpy"),
+        ("[CUDA memcpy Host-to-Device]", api2_s + 3 * us, api2_s + m[:, 1] - us, 1, nbytes[:, 1], "Pageable",
+         "Device", f"{root};H2D memcpy"),
+        ("add(int *, int *, int *)", kern_s, kern_s + k, 2, np.zeros(n, dtype=np.int64), "", "",
+         f"{root};Kernel launch"),
+        ("[CUDA memset]", memset_s + 2 * us, memset_s + 3 * us, 4, nbytes[:, 2], "", "Device", root),
+        ("[CUDA memcpy Device-to-Host]", api3_s + 3 * us, api3_s + m[:, 2] - us, 5, nbytes[:, 2], "Device",
+         "Pageable", f"{root};D2H memcpy"),
+    ]
+    gpu_parts, exp_parts = [], []
+    for name, s, e, j, b, src, dst, path in gpu_ops:
+        dur = e - s
+        gpu_parts.append(pd.DataFrame({
+            "Start (ns)": s, "Duration (ns)": dur, "CorrId": corr[:, j],
+            "Bytes (MB)": np.where(b > 0, b / 1e6, np.nan), "Throughput (MBps)": np.where(b > 0, b / dur * 1e3, np.nan),
+            "SrcMemKd": src, "DstMemKd": dst, "Device": 0, "Ctx": 1, "Strm": 7, "Name": name,
+        }))
+        copy_bytes = b if "memcpy" in name else np.zeros(n, dtype=np.int64)
+        exp_parts.append(pd.DataFrame({
+            "corr_id": corr[:, j], "path": path,
+            "h2d_bytes": copy_bytes if "Host-to-Device" in name else 0,
+            "d2h_bytes": copy_bytes if "Device-to-Host" in name else 0,
+        }))
+    gpu = pd.concat(gpu_parts, ignore_index=True).sort_values("Start (ns)", ignore_index=True)
+    expected = pd.concat(exp_parts, ignore_index=True)
+
+    # ---- NVTX push/pop ----
+    children = [("H2D memcpy", h2d_s, h2d_e), ("Kernel launch", kl_s, kl_e), ("D2H memcpy", d2h_s, d2h_e)]
+    child_sum = sum(e - s for _, s, e in children)
+    p_ids = 1 + np.arange(n, dtype=np.int64) * 4
+    nvtx_parts = [pd.DataFrame({
+        "Start (ns)": t0, "End (ns)": parent_e, "Duration (ns)": parent_e - t0, "DurChild (ns)": child_sum,
+        "DurNonChild (ns)": parent_e - t0 - child_sum, "Name": ":" + root, "PID": pid, "TID": tid, "Lvl": 0,
+        "NumChild": len(children), "RangeId": p_ids, "ParentId": -1,
+    })]
+    for i, (name, s, e) in enumerate(children, start=1):
+        nvtx_parts.append(pd.DataFrame({
+            "Start (ns)": s, "End (ns)": e, "Duration (ns)": e - s, "DurChild (ns)": 0,
+            "DurNonChild (ns)": e - s, "Name": name, "PID": pid, "TID": tid, "Lvl": 1, "NumChild": 0,
+            "RangeId": p_ids + i, "ParentId": p_ids,
+        }))
+    nvtx = pd.concat(nvtx_parts, ignore_index=True).sort_values(["Start (ns)", "Lvl"], ignore_index=True)
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "nvtx": out_dir / "illixr_nvtx_pushpop_trace.csv",
+        "api": out_dir / "illixr_cuda_api_trace.csv",
+        "gpu": out_dir / "illixr_cuda_gpu_trace.csv",
+        "expected": out_dir / "cuda_expected_attribution.csv",
+    }
+    nvtx[NVTX_COLUMNS].to_csv(paths["nvtx"], index=False)
+    api[CUDA_API_COLUMNS].to_csv(paths["api"], index=False)
+    gpu[CUDA_GPU_COLUMNS].to_csv(paths["gpu"], index=False)
+    expected.to_csv(paths["expected"], index=False)
+    return paths
+
+
+# ===== tegrastats =====
+def generate_tegrastats_log(path: Path, n_lines: int = 100_000, interval_ms: int = 10,
+                            n_cores: int = 6, seed: int = 0) -> Path:
+    """tegrastats --interval <interval_ms> 출력과 같은 형식의 텍스트 로그"""
+    rng = np.random.default_rng(seed)
+    n = int(n_lines)
+    t0 = datetime(2025, 9, 4, 20, 15, 56)
+    util = rng.integers(0, 100, size=(n, n_cores))
+    ram = rng.integers(3000, 9000, size=n)
+    gpu = rng.integers(0, 99, size=n)
+    temp = np.clip(45.0 + np.cumsum(rng.normal(0, 0.02, size=n)), 30.0, 95.0)
+    power = rng.integers(4000, 15000, size=n)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        for i in range(n):
+            ts = (t0 + timedelta(milliseconds=i * interval_ms)).strftime("%m-%d-%Y %H:%M:%S")
+            cpu = ",".join(f"{u}%@1984" for u in util[i])
+            f.write(f"{ts} RAM {ram[i]}/30536MB (lfb 6x4MB) SWAP 0/15268MB (cached 0MB) "
+                    f"CPU [{cpu}] EMC_FREQ 0% GR3D_FREQ {gpu[i]}% cpu@{temp[i]:.3f}C "
+                    f"soc2@{temp[i] - 1.5:.3f}C gpu@{temp[i] - 2.0:.3f}C "
+                    f"VDD_IN {power[i]}mW/{power[i]}mW VDD_CPU_GPU_CV {power[i] // 4}mW/{power[i] // 4}mW\n")
+    return path
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""tests/ 에서 저장소 루트의 스크립트 모듈을 바로 import 할 수 있게 한다."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""cuda_gpu_attribution: 중첩 NVTX range 안의 커널/memcpy 귀속과 stage 별 합계"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("matplotlib")
+
+import nvtx_hierarchy
+import cuda_gpu_attribution as cga
+
+
+def _nested_trace():
+    # frame ⊃ track ⊃ pyramid (TID 7). memcpy 는 pyramid 안에서, 커널은 track 이 끝난 뒤 frame 안에서 호출
+    nvtx = pd.DataFrame([
+        (":VIO:frame", 0, 1_000, 7),
+        (":VIO:track", 100, 600, 7),
+        (":KLT:pyramid", 200, 300, 7),
+    ], columns=["Name", "Start (ns)", "End (ns)", "TID"])
+    api = pd.DataFrame([
+        (250, 280, 1, 7, "cudaMemcpy"),
+        (700, 705, 2, 7, "cudaLaunchKernel"),
+    ], columns=["start", "end", "corr_id", "tid", "name"])
+    gpu = pd.DataFrame([
+        (260, 360, 1, "[CUDA memcpy Host-to-Device]", "memcpy", "HtoD", 4_000_000),
+        (710, 910, 2, "add(int *, int *, int *)", "kernel", None, 0),
+    ], columns=["start", "end", "corr_id", "name", "kind", "copy", "bytes"])
+    return gpu, api, nvtx
+
+
+def test_kernel_and_memcpy_go_to_innermost_enclosing_range():
+    gpu, api, nvtx = _nested_trace()
+    h = nvtx_hierarchy.build_hierarchy(nvtx)
+    g = cga.attribute(gpu, api, h).set_index("corr_id")
+
+    assert g.loc[1, "path"] == "VIO:frame;VIO:track;KLT:pyramid"
+    assert g.loc[1, "stage"] == "KLT"
+    # 커널 호출 시점엔 track/pyramid 가 이미 끝났으므로 부모(frame)로 올라감
+    assert g.loc[2, "path"] == "VIO:frame"
+    assert g.loc[2, "stage"] == "VIO"
+
+
+def test_stage_report_totals():
+    gpu, api, nvtx = _nested_trace()
+    h = nvtx_hierarchy.build_hierarchy(nvtx)
+    report = cga.stage_report(h, cga.attribute(gpu, api, h)).set_index("Stage")
+
+    assert report.loc["KLT", "Memcpys"] == 1 and report.loc["KLT", "Kernels"] == 0
+    assert report.loc["VIO", "Kernels"] == 1 and report.loc["VIO", "Memcpys"] == 0
+    assert report.loc["KLT", "GPU busy (ms)"] == pytest.approx(100 / 1e6)
+    assert report.loc["VIO", "GPU busy (ms)"] == pytest.approx(200 / 1e6)
+    assert report.loc["KLT", "H2D (MB)"] == pytest.approx(4.0)
+    assert report["H2D (MB)"].sum() == pytest.approx(4.0)
+    # VIO inclusive 는 바깥 frame 한 번만 (track 은 같은 stage 안에 중첩), self 는 frame 500 + track 400
+    assert report.loc["VIO", "CPU inclusive (ms)"] == pytest.approx(1_000 / 1e6)
+    assert report.loc["VIO", "CPU self (ms)"] == pytest.approx(900 / 1e6)
+    assert report.loc["KLT", "CPU self (ms)"] == pytest.approx(100 / 1e6)
+
+
+def test_activity_on_thread_without_ranges_is_unattributed():
+    gpu, api, nvtx = _nested_trace()
+    api.loc[1, "tid"] = 9
+    g = cga.attribute(gpu, api, nvtx_hierarchy.build_hierarchy(nvtx)).set_index("corr_id")
+    assert g.loc[2, "stage"] == cga.UNATTRIBUTED
+    assert g.loc[1, "stage"] == "KLT"
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""drift_detection.DriftTracker 요약: flush 된 미완성 구간은 p50 변화율에 쓰지 않는다"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+import drift_detection
+
+
+def test_p50_change_ignores_partial_window():
+    tr = drift_detection.DriftTracker("s", window=100, baseline=1)
+    tr.update(np.full(300, 10.0))
+    tr.update(np.full(60, 20.0))          # 미완성 구간 (60 / 100)
+    rows = tr.flush()
+    assert len(rows) == 1 and rows[0]["n"] == 60
+
+    summary = tr.summary()
+    assert summary["windows"] == 4
+    assert summary["last_p50_ms"] == pytest.approx(10.0, rel=0.02)
+    assert abs(summary["p50_change_pct"]) < 2.0
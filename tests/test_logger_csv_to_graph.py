@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""logger_csv_to_graph.load_csv: '%' 제거 스트리밍과 큰 숫자 CSV 의 블록 읽기"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("matplotlib")
+
+import logger_csv_to_graph as L
+import synthetic_data
+
+
+@pytest.fixture(autouse=True)
+def schema_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(L, "SCHEMA_CACHE_FILE", tmp_path / "schema_cache.json")
+    monkeypatch.setattr(L, "_schema_cache", None)
+
+
+def test_percent_in_header_is_kept(tmp_path, capsys):
+    path = tmp_path / "periodic_log.csv"
+    path.write_text("timestamp,CPU Util (%),GPU_freq\n"
+                    + "".join(f"{1000 + i},{i % 100}.5%,{1_300_500_000}\n" for i in range(500)))
+    df = L.load_csv(path, usecols=lambda c: c != "GPU_freq")
+    assert list(df.columns) == ["timestamp", "CPU Util (%)"]
+    assert df["CPU Util (%)"].dtype == np.float64
+    assert df["CPU Util (%)"].iloc[3] == pytest.approx(3.5)
+    assert "[WARN]" not in capsys.readouterr().out   # 일반 파싱으로 다시 읽지 않음
+
+
+def test_block_read_matches_plain_read(tmp_path, monkeypatch):
+    path = synthetic_data.generate_periodic_log(tmp_path / "periodic_log.csv", n_rows=5_000, n_cores=2)
+    monkeypatch.setattr(L, "BLOCK_READ_MIN_BYTES", 1 << 60)
+    plain = L.load_csv(path)
+    monkeypatch.setattr(L, "BLOCK_READ_MIN_BYTES", 0)
+    monkeypatch.setattr(L, "BLOCK_READ_CHUNK_ROWS", 777)   # 청크 경계가 여러 번 생기도록
+    block = L.load_csv(path)
+    pd.testing.assert_frame_equal(plain, block)
+
+
+def test_block_read_mixed_dtypes(tmp_path, monkeypatch):
+    # epoch ns 타임스탬프(> 2**53)는 int64, 나머지는 float64 → dtype 별 블록 두 개
+    path = tmp_path / "periodic_log.csv"
+    t0 = 1_760_000_000_000_000_000
+    path.write_text("CPU0_util,timestamp,cpu_temp\n"
+                    + "".join(f"{i % 7}%,{t0 + i * 1_000_000},{48000 + i}\n" for i in range(3_000)))
+    monkeypatch.setattr(L, "BLOCK_READ_MIN_BYTES", 0)
+    monkeypatch.setattr(L, "BLOCK_READ_CHUNK_ROWS", 512)
+    df = L.load_csv(path)
+    assert list(df.columns) == ["CPU0_util", "timestamp", "cpu_temp"]
+    assert df["timestamp"].dtype == np.int64
+    assert df["timestamp"].iloc[-1] == t0 + 2_999 * 1_000_000
+    assert df["CPU0_util"].iloc[-1] == 2_999 % 7
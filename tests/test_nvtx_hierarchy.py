@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""nvtx_hierarchy.build_hierarchy: 제대로 중첩되지 않은 range 처리"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+import nvtx_hierarchy
+
+
+def _trace(rows):
+    return pd.DataFrame(rows, columns=["Name", "Start (ns)", "End (ns)", "TID"])
+
+
+def test_nested_ranges():
+    h = nvtx_hierarchy.build_hierarchy(_trace([
+        (":A:outer", 0, 100, 1),
+        (":A:inner", 10, 40, 1),
+    ]))
+    assert h["parent"].tolist() == [-1, 0]
+    assert h["self_ns"].tolist() == [70, 30]
+
+
+def test_range_ending_after_parent_is_not_nested():
+    # 다음 프레임 range 가 이전 range 보다 늦게 끝남 → 형제
+    h = nvtx_hierarchy.build_hierarchy(_trace([
+        (":A:frame", 0, 100, 1),
+        (":A:frame", 90, 200, 1),
+    ]))
+    assert h["parent"].tolist() == [-1, -1]
+    assert h["self_ns"].tolist() == [100, 110]
+
+
+def test_overlapping_siblings_keep_self_non_negative():
+    h = nvtx_hierarchy.build_hierarchy(_trace([
+        (":A:outer", 0, 100, 1),
+        (":A:a", 0, 80, 1),
+        (":A:b", 20, 100, 1),
+    ]))
+    assert h["parent"].tolist() == [-1, 0, 0]
+    assert (h["self_ns"] >= 0).all()
+
+
+def test_chained_overlap_is_linear():
+    # 같은 스레드에서 앞 range 와 겹치며 이어지는 프레임 + 각 프레임 안의 자식
+    import time
+
+    n = 40_000
+    i = np.arange(n, dtype=np.int64)
+    frames = _trace({"Name": ":A:frame", "Start (ns)": i * 10, "End (ns)": i * 10 + 15, "TID": 1})
+    children = _trace({"Name": ":A:child", "Start (ns)": i * 10 + 1, "End (ns)": i * 10 + 4, "TID": 1})
+    df = pd.concat([frames, children], ignore_index=True)
+
+    t0 = time.perf_counter()
+    h = nvtx_hierarchy.build_hierarchy(df)
+    elapsed = time.perf_counter() - t0
+
+    assert (h["parent"].to_numpy()[:n] == -1).all()
+    # 자식은 같은 시점에 열린 두 프레임(앞 프레임은 i*10+5 에 끝남) 중 자신을 감싸는 것 → 자기 프레임
+    assert (h["parent"].to_numpy()[n:] == i).all()
+    assert (h["self_ns"] >= 0).all()
+    assert elapsed < 5.0
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""parallel_log_scan: 직렬 파싱과 구간 병렬 파싱 결과가 같은지 (구간 경계에 걸친 줄 포함)"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("matplotlib")
+
+import parallel_log_scan
+import synthetic_data
+
+CHUNK_BYTES = 1_000   # 줄 길이(수십 바이트)와 서로소에 가까운 크기 → 대부분의 경계가 줄 중간에 떨어짐
+
+
+@pytest.fixture(scope="module")
+def illixr_log(tmp_path_factory):
+    path = tmp_path_factory.mktemp("scan") / "illixr.log"
+    return synthetic_data.generate_illixr_log(path, n_frames=400, seed=1)
+
+
+def test_ranges_cover_file_on_line_boundaries(illixr_log):
+    data = illixr_log.read_bytes()
+    ranges = parallel_log_scan.newline_aligned_ranges(illixr_log, CHUNK_BYTES)
+    assert len(ranges) > 10
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, e), (s, _) in zip(ranges[:-1], ranges[1:]):
+        assert e == s
+        assert data[e - 1:e] == b"\n"
+
+
+def test_parse_log_serial_equals_parallel(illixr_log):
+    from openvins_timing_parser import parse_log
+
+    serial = parse_log(illixr_log, workers=1)
+    parallel = parallel_log_scan.parallel_parse_log(illixr_log, workers=2, chunk_bytes=CHUNK_BYTES)
+    assert len(serial) == 400
+    assert serial.to_csv(index=False) == parallel.to_csv(index=False)
+
+
+def test_openvins_totals_serial_equals_parallel(illixr_log):
+    from component_log_to_csv import parse_openvins_totals
+
+    serial = parse_openvins_totals(illixr_log, workers=1)
+    parallel = parallel_log_scan.parallel_openvins_totals(illixr_log, workers=2, chunk_bytes=CHUNK_BYTES)
+    assert len(serial) == 400
+    assert serial == parallel
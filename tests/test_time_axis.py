@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""time_axis.infer_time_schema: steady_clock 값이 epoch 로 오인되지 않는지"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+import time_axis
+
+
+def _series(start, step, n=500):
+    return pd.Series(np.int64(start) + np.arange(n, dtype=np.int64) * np.int64(step))
+
+
+def test_steady_clock_ns_30min_after_boot_is_not_epoch_ms():
+    schema = time_axis.infer_time_schema(_series(1_800_000_000_000, 10_000_000), "timestamp")
+    assert schema["kind"] == "monotonic"
+    assert schema["unit"] == "ns"
+    assert schema["interval_ms"] == pytest.approx(10.0)
+
+
+def test_steady_clock_ns_20days_uptime_is_not_epoch_us():
+    schema = time_axis.infer_time_schema(_series(20 * 86400 * 10**9, 10_000_000), "timestamp")
+    assert schema["kind"] == "monotonic"
+    assert schema["unit"] == "ns"
+    assert schema["interval_ms"] == pytest.approx(10.0)
+
+
+@pytest.mark.parametrize("unit,scale", [("s", 1), ("ms", 10**3), ("us", 10**6), ("ns", 10**9)])
+def test_real_epoch_keeps_its_unit(unit, scale):
+    start = 1_760_000_000 * scale          # 2025-10
+    step = scale // 10 if scale >= 10 else 1   # 100 ms (s 단위는 1 s)
+    schema = time_axis.infer_time_schema(_series(start, step), "timestamp")
+    assert schema["kind"] == "epoch"
+    assert schema["unit"] == unit
+
+
+def test_epoch_seconds_float():
+    s = pd.Series(1_760_000_000.0 + np.arange(500) * 0.1)
+    schema = time_axis.infer_time_schema(s, "timestamp")
+    assert (schema["kind"], schema["unit"]) == ("epoch", "s")
+    assert schema["interval_ms"] == pytest.approx(100.0)
+
+
+def test_monotonic_ms_small_values():
+    schema = time_axis.infer_time_schema(_series(123_456, 10), "t")
+    assert (schema["kind"], schema["unit"]) == ("monotonic", "ms")
+
+
+@pytest.mark.parametrize("unit,scale", [("s", 1), ("ms", 10**3), ("us", 10**6)])
+def test_real_epoch_1hz_is_not_read_one_unit_finer(unit, scale):
+    schema = time_axis.infer_time_schema(_series(1_760_000_000 * scale, scale), "timestamp")
+    assert (schema["kind"], schema["unit"]) == ("epoch", unit)
+    assert schema["interval_ms"] == pytest.approx(1000.0)
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+throttle_detector.py
+--------------------
+periodic_log.csv 에서 코어별 주파수/온도 벡터를 그대로(평균·롤링 없이) 유지한 채
+주파수 급락(throttling), 온도 초과(thermal excursion), 거버너 진동(DVFS oscillation)을
+벡터화된 임계값/변화점 검출로 찾아 이벤트 테이블(start/end/duration/magnitude)로 저장한다.
+
+- 롤링 윈도우는 누적합(cumsum)으로 계산하므로 샘플 수 n 에 대해 O(n) 이다.
+  (1 ms 해상도 수 시간 로그도 수 초 안에 처리)
+- 결과: analyze/<실험폴더명>/throttle_events.csv
+"""
+
+import re
+import warnings
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+import time_axis
+from log_input import resolve_input
+from logger_csv_to_graph import (
+    DATA_ROOT, SEARCH_DEPTH, DATASETS, ANALYZE_ROOT,
+    load_csv, find_time_column, parse_time_column, discover_datasets,
+)
+
+# ====== 검출 파라미터 ======
+DROP_RATIO = 0.25          # 관측된 정상 상태 주파수 대비 25% 이상 떨어지면 drop
+REF_PERCENTILE = 99        # 정상 상태 주파수 = 부하 구간 주파수의 99 퍼센타일 (CPU*_max_freq 는 상한으로만)
+BUSY_UTIL_PCT = 50.0       # 코어 사용률이 이 이상일 때만 drop 으로 봄 (유휴 다운클럭은 정상 동작)
+THROTTLE_TEMP_C = 70.0     # 사용률 컬럼이 없는 코어 / GPU 는 이 온도 이상인 구간의 drop 만 인정
+TEMP_LIMIT_C = 80.0        # 이 온도 이상이면 thermal excursion
+OSC_WINDOW = 50            # 거버너 진동 판정 윈도우 (샘플 수)
+OSC_MIN_REVERSALS = 10     # 윈도우 안에서 증감 방향이 바뀐 횟수가 이 이상이면 진동
+OSC_MIN_STEP_MHZ = 50.0    # 이보다 작은 주파수 변화는 방향 전환으로 세지 않음
+MERGE_GAP = 3              # 이 샘플 수 이하로 떨어진 이벤트는 하나로 합침
+
+
+# ===== 벡터 유틸 =====
+def rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """axis 0 기준 trailing rolling sum (min_periods=1). 누적합 차분으로 O(n)."""
+    c = np.cumsum(x, axis=0, dtype=np.float64)
+    out = c.copy()
+    out[window:] -= c[:-window]
+    return out
+
+def mask_to_events(mask: np.ndarray):
+    """
+    (n, k) bool 마스크 → 컬럼별 연속 True 구간.
+    반환: (col, start, end) 배열, end 는 exclusive. 컬럼 순 → 시간 순으로 정렬됨.
+    """
+    m = np.asarray(mask, dtype=np.int8)
+    if m.ndim == 1:
+        m = m[:, None]
+    padded = np.zeros((m.shape[1], m.shape[0] + 2), dtype=np.int8)
+    padded[:, 1:-1] = m.T
+    d = np.diff(padded, axis=1)
+    col_s, start = np.nonzero(d == 1)
+    _col_e, end = np.nonzero(d == -1)
+    return col_s, start, end
+
+def merge_close_events(col, start, end, gap: int):
+    """같은 컬럼에서 gap 샘플 이하로 떨어진 이벤트를 병합 (벡터화)"""
+    if len(start) == 0:
+        return col, start, end
+    new_group = np.ones(len(start), dtype=bool)
+    new_group[1:] = (col[1:] != col[:-1]) | (start[1:] - end[:-1] > gap)
+    first = np.flatnonzero(new_group)
+    last = np.append(first[1:], len(start)) - 1
+    return col[first], start[first], end[last]
+
+def segment_reduce(ufunc, x: np.ndarray, col, start, end) -> np.ndarray:
+    """(n, k) 행렬 x 에서 이벤트 구간별 ufunc.reduce 값 (reduceat 사용)"""
+    if len(start) == 0:
+        return np.array([], dtype=np.float64)
+    n = x.shape[0]
+    flat = np.append(np.asarray(x, dtype=np.float64).T.ravel(), np.nan)
+    idx = np.empty(2 * len(start), dtype=np.int64)
+    idx[0::2] = col * n + start
+    idx[1::2] = col * n + end
+    return ufunc.reduceat(flat, idx)[0::2]
+
+
+# ===== 입력 =====
+def time_axis_ms(df: pd.DataFrame) -> np.ndarray:
+    """첫 샘플 기준 상대 시간(ms). 단위 추론은 time_axis 스키마를 따른다."""
+    time_col_raw = find_time_column(df)
+    time_col, _is_dt = parse_time_column(df, time_col_raw)
+    if time_col_raw is None:
+        t = df[time_col].to_numpy(dtype=np.float64)
+    else:
+        t = time_axis.to_milliseconds(df[time_col_raw], df.attrs["time_schema"])
+    return t - np.nanmin(t) if len(t) else t
+
+def numeric_matrix(df: pd.DataFrame, cols, scale: float = 1.0) -> np.ndarray:
+    """컬럼들을 (n, k) float32 행렬로. '%', ',' 문자는 제거."""
+    mats = []
+    for c in cols:
+        s = df[c]
+        if s.dtype == object:
+            s = s.astype(str).str.replace(r"[%,]", "", regex=True).str.strip()
+        mats.append(pd.to_numeric(s, errors="coerce").to_numpy(dtype=np.float32))
+    return np.column_stack(mats) * np.float32(scale)
+
+def core_index(col: str) -> int:
+    m = re.search(r"(\d+)", str(col))
+    return int(m.group(1)) if m else 10**9
+
+
+# ===== 검출 =====
+def _event_table(kind, signals, col, start, end, magnitude, unit, t_ms, interval_ms):
+    if len(start) == 0:
+        return pd.DataFrame()
+    t0 = t_ms[start]
+    t1 = t_ms[end - 1]
+    return pd.DataFrame({
+        "kind": kind,
+        "signal": np.asarray(signals, dtype=object)[col],
+        "start_idx": start,
+        "end_idx": end,
+        "start_ms": t0,
+        "end_ms": t1,
+        "duration_ms": t1 - t0 + interval_ms,
+        "magnitude": magnitude,
+        "unit": unit,
+    })
+
+def detect_frequency_drops(freq_mhz, ref_mhz, signals, t_ms, interval_ms, active=None):
+    """active: (n, k) 또는 (n, 1) bool — 부하/고온 구간. 주면 그 구간의 drop 만 이벤트로 남긴다"""
+    mask = freq_mhz < (1.0 - DROP_RATIO) * ref_mhz[None, :]
+    if active is not None:
+        mask &= active
+    col, start, end = merge_close_events(*mask_to_events(mask), MERGE_GAP)
+    depth = ref_mhz[col] - segment_reduce(np.fmin, freq_mhz, col, start, end)
+    return _event_table("freq_drop", signals, col, start, end, depth, "MHz", t_ms, interval_ms)
+
+def detect_thermal_excursions(temp_c, signals, t_ms, interval_ms):
+    mask = temp_c >= TEMP_LIMIT_C
+    col, start, end = merge_close_events(*mask_to_events(mask), MERGE_GAP)
+    peak = segment_reduce(np.fmax, temp_c, col, start, end) - TEMP_LIMIT_C
+    return _event_table("thermal_excursion", signals, col, start, end, peak, "°C over limit",
+                        t_ms, interval_ms)
+
+def detect_governor_oscillation(freq_mhz, signals, t_ms, interval_ms):
+    step = np.diff(freq_mhz, axis=0, prepend=freq_mhz[:1])
+    direction = (step > OSC_MIN_STEP_MHZ).astype(np.int8) - (step < -OSC_MIN_STEP_MHZ).astype(np.int8)
+    # 마지막으로 관측된 0 이 아닌 방향을 forward-fill (누적 최대 인덱스 트릭)
+    idx = np.where(direction != 0, np.arange(len(direction), dtype=np.int64)[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    last_dir = np.take_along_axis(direction, idx, axis=0)
+    prev_dir = np.vstack([np.zeros((1, last_dir.shape[1]), dtype=last_dir.dtype), last_dir[:-1]])
+    reversal = (direction != 0) & (prev_dir != 0) & (direction != prev_dir)
+
+    mask = rolling_sum(reversal.astype(np.float32), OSC_WINDOW) >= OSC_MIN_REVERSALS
+    col, start, end = mask_to_events(mask)
+    # 윈도우 끝에서 판정되므로 시작점을 윈도우 길이만큼 앞으로 당김
+    start = np.maximum(start - OSC_WINDOW + 1, 0)
+    col, start, end = merge_close_events(col, start, end, MERGE_GAP)
+    p2p = (segment_reduce(np.fmax, freq_mhz, col, start, end)
+           - segment_reduce(np.fmin, freq_mhz, col, start, end))
+    return _event_table("governor_oscillation", signals, col, start, end, p2p, "MHz p-p",
+                        t_ms, interval_ms)
+
+
+def steady_reference(freq_mhz, active=None, cap_mhz=None) -> np.ndarray:
+    """컬럼별 정상 상태 주파수: active 구간(없으면 전체)의 REF_PERCENTILE, cap_mhz 로 상한"""
+    f = freq_mhz if active is None else np.where(active, freq_mhz, np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # 부하 구간이 없는 컬럼 (All-NaN slice)
+        ref = np.nanpercentile(f, REF_PERCENTILE, axis=0)
+    ref = np.where(np.isfinite(ref), ref, np.nanpercentile(freq_mhz, REF_PERCENTILE, axis=0))
+    if cap_mhz is not None:
+        ref = np.fmin(ref, cap_mhz)
+    return ref
+
+def hot_mask(df: pd.DataFrame, temp_cols):
+    """(n, 1) bool — 온도 센서 중 하나라도 THROTTLE_TEMP_C 이상. 센서가 없으면 None"""
+    if not temp_cols:
+        return None
+    temp = numeric_matrix(df, temp_cols, 1 / 1000.0)
+    with np.errstate(invalid="ignore"):
+        return (np.nanmax(temp, axis=1) >= THROTTLE_TEMP_C)[:, None]
+
+
+# ===== 단일 CSV 처리 =====
+def detect_events(df: pd.DataFrame) -> pd.DataFrame:
+    t_ms = time_axis_ms(df)
+    dt = np.diff(t_ms)
+    interval_ms = float(np.nanmedian(dt)) if len(dt) else 0.0
+
+    tables = []
+    temp_cols = [c for c in df.columns if re.search(r"(?:^|_)temp$", str(c), re.I)]
+    hot = hot_mask(df, temp_cols)
+
+    # ---- CPU 코어별 주파수 (kHz → MHz) ----
+    # 유휴 코어의 다운클럭을 throttling 으로 보지 않도록, 부하가 걸린 구간에서만 drop 을 찾고
+    # 기준도 그 구간에서 관측된 주파수로 잡는다. CPU*_max_freq 는 기준의 상한으로만 사용.
+    freq_cols = sorted([c for c in df.columns if re.fullmatch(r"CPU\d+_freq", str(c), re.I)], key=core_index)
+    if freq_cols:
+        freq = numeric_matrix(df, freq_cols, 1 / 1000.0)
+        max_cols = {core_index(c): c for c in df.columns if re.fullmatch(r"CPU\d+_max_freq", str(c), re.I)}
+        util_cols = {core_index(c): c for c in df.columns if re.fullmatch(r"CPU\d+_util", str(c), re.I)}
+        cap = np.full(len(freq_cols), np.nan)
+        busy = np.ones(freq.shape, dtype=bool)
+        has_util = np.zeros(len(freq_cols), dtype=bool)
+        for j, c in enumerate(freq_cols):
+            mc = max_cols.get(core_index(c))
+            if mc is not None:
+                cap[j] = np.nanmax(numeric_matrix(df, [mc], 1 / 1000.0))
+            uc = util_cols.get(core_index(c))
+            if uc is not None:
+                busy[:, j] = numeric_matrix(df, [uc])[:, 0] >= BUSY_UTIL_PCT
+                has_util[j] = True
+        ref = steady_reference(freq, busy, cap)
+        # 사용률이 없는 코어는 고온 구간을 조건으로 (기준은 전체 구간에서 잡음)
+        if hot is not None:
+            busy[:, ~has_util] = hot
+        elif not has_util.all():
+            print("[INFO] CPU*_util / *_temp 컬럼이 없어 유휴 다운클럭도 freq_drop 으로 잡힐 수 있습니다.")
+        tables.append(detect_frequency_drops(freq, ref, freq_cols, t_ms, interval_ms, busy))
+        tables.append(detect_governor_oscillation(freq, freq_cols, t_ms, interval_ms))
+    else:
+        print("[INFO] CPU*_freq 컬럼을 찾지 못했습니다.")
+
+    # ---- GPU 주파수 (Hz → MHz) ----
+    # GPU 사용률 단위는 보드마다 달라(%, ‰) 고온 구간만 drop 조건으로 사용
+    if "GPU_freq" in df.columns:
+        gpu = numeric_matrix(df, ["GPU_freq"], 1 / 1e6)
+        ref = steady_reference(gpu)
+        tables.append(detect_frequency_drops(gpu, ref, ["GPU_freq"], t_ms, interval_ms, hot))
+        tables.append(detect_governor_oscillation(gpu, ["GPU_freq"], t_ms, interval_ms))
+
+    # ---- 온도 센서별 (milli°C → °C) ----
+    if temp_cols:
+        temp = numeric_matrix(df, temp_cols, 1 / 1000.0)
+        tables.append(detect_thermal_excursions(temp, temp_cols, t_ms, interval_ms))
+    else:
+        print("[INFO] *_temp 컬럼을 찾지 못했습니다.")
+
+    tables = [t for t in tables if not t.empty]
+    if not tables:
+        return pd.DataFrame(columns=["kind", "signal", "start_idx", "end_idx", "start_ms",
+                                     "end_ms", "duration_ms", "magnitude", "unit"])
+    return pd.concat(tables, ignore_index=True).sort_values(["start_ms", "kind"], ignore_index=True)
+
+def process_csv(csv_path: Path, out_root: Path) -> pd.DataFrame:
+    exp_name = csv_path.parent.name
+    df = load_csv(csv_path)
+    events = detect_events(df)
+
+    out_dir = out_root / exp_name
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_csv = out_dir / "throttle_events.csv"
+    events.to_csv(out_csv, index=False, float_format="%.3f")
+
+    counts = events["kind"].value_counts().to_dict() if not events.empty else {}
+    print(f"[SAVED] ({exp_name}) {len(events)} events {counts} → {out_csv}")
+    return events
+
+
+# ===== 메인 =====
+def main():
+    if DATASETS is not None:
+        dataset_dirs = [Path(p) for p in DATASETS]
+    else:
+        dataset_dirs = discover_datasets(DATA_ROOT, depth=SEARCH_DEPTH)
+
+    if not dataset_dirs:
+        print(f"[WARN] {DATA_ROOT} 아래에서 periodic_log.csv를 찾지 못했습니다. (depth={SEARCH_DEPTH})")
+        return
+
+    for d in dataset_dirs:
+        try:
+            process_csv(resolve_input(d / "periodic_log.csv"), ANALYZE_ROOT)
+        except Exception as e:
+            print(f"[ERROR] {d.name}: {e}")
+
+if __name__ == "__main__":
+    main()
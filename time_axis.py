@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+time_axis.py
+------------
+로그 CSV의 시간 컬럼 단위를 추론하는 모듈.
+
+- epoch 시계(s/ms/us/ns)와 monotonic 시계(steady_clock 등, s/ms/us/ns)를 구분한다.
+  ILLIXR 는 steady_clock 나노초를 기록하므로 "큰 값 = ms" 로 가정하면 안 된다.
+- 실제 샘플링 간격과 누락 구간(gap)을 벡터화해서 계산한다.
+- 추론 결과(스키마)를 데이터셋별 JSON 으로 저장해 두고, 파일이 바뀌지 않았으면 재사용한다.
+- 여러 소스를 비교할 수 있도록 균일 시간 격자로 리샘플링하는 함수를 제공한다.
+"""
+
+import re
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# 단위별 1초당 tick 수
+UNIT_SCALE = {"s": 1.0, "ms": 1e3, "us": 1e6, "ns": 1e9}
+
+# epoch 로 인정할 범위 (2000-01-01 ~ 2100-01-01, 초)
+EPOCH_MIN_S = 946_684_800
+EPOCH_MAX_S = 4_102_444_800
+
+# monotonic 시계에서 그럴듯한 샘플링 간격(초)과 구동 시간(초) 범위
+PLAUSIBLE_DT_S = (1e-5, 60.0)
+PLAUSIBLE_SPAN_S = 90 * 24 * 3600
+PREFERRED_DT_S = 1e-2  # 후보가 여러 개면 간격이 10 ms 에 가장 가까운 단위 선택
+# epoch 범위 값이 monotonic 으로도 읽힐 때, epoch 해석의 간격이 이 이하이면 epoch 유지
+# (steady_clock ns 20일 ≈ epoch us 처럼 한 단위 차이로 겹치는 경우, 로거 간격이 5초를 넘는 일은 드묾)
+EPOCH_MAX_AMBIGUOUS_DT_S = 5.0
+
+GAP_FACTOR = 3.0            # 중앙 간격의 3배를 넘으면 gap 으로 간주
+DEFAULT_INTERVAL_MS = 100   # 시간 컬럼이 없을 때 가정하는 샘플 간격
+
+UNIT_HINT = re.compile(r"(?:^|[_\s\(\[])(ns|us|ms|s|sec)(?:$|[_\s\)\]])", re.I)
+
+
+# ===== 추론 =====
+def _unit_from_name(column) -> str:
+    if column is None:
+        return None
+    m = UNIT_HINT.search(str(column))
+    if not m:
+        return None
+    unit = m.group(1).lower()
+    return "s" if unit == "sec" else unit
+
+def _sampling_stats(values: np.ndarray, scale: float) -> dict:
+    """tick 단위 값 → ms 기준 샘플링 간격과 gap 통계"""
+    dt = np.diff(values)
+    pos = dt[dt > 0]
+    if len(pos) == 0:
+        return {"interval_ms": None, "n_gaps": 0, "gap_total_ms": 0.0,
+                "max_gap_ms": 0.0, "n_backwards": int(np.sum(dt < 0))}
+    med = float(np.median(pos))
+    gaps = pos[pos > GAP_FACTOR * med]
+    to_ms = 1e3 / scale
+    return {
+        "interval_ms": med * to_ms,
+        "n_gaps": int(len(gaps)),
+        "gap_total_ms": float(np.sum(gaps - med)) * to_ms,
+        "max_gap_ms": float(gaps.max()) * to_ms if len(gaps) else 0.0,
+        "n_backwards": int(np.sum(dt < 0)),
+    }
+
+def _dt_distance(dt_s: float) -> float:
+    """간격이 PREFERRED_DT_S 에서 얼마나 먼지 (log10 차이)"""
+    return abs(np.log10(dt_s) - np.log10(PREFERRED_DT_S))
+
+def _monotonic_candidates(median_dt: float, span: float, start: float = None) -> list:
+    """[(간격 거리, 단위)] — 간격이 그럴듯하고 구동 시간(span, 시작값)이 PLAUSIBLE_SPAN_S 이내인 단위"""
+    out = []
+    for unit, scale in UNIT_SCALE.items():
+        dt_s = median_dt / scale
+        if not PLAUSIBLE_DT_S[0] <= dt_s <= PLAUSIBLE_DT_S[1] or span / scale > PLAUSIBLE_SPAN_S:
+            continue
+        if start is not None and abs(start) / scale > PLAUSIBLE_SPAN_S:
+            continue
+        out.append((_dt_distance(dt_s), unit))
+    return out
+
+def _pick_monotonic_unit(median_dt: float, span: float) -> str:
+    candidates = _monotonic_candidates(median_dt, span)
+    return min(candidates)[1] if candidates else "ms"
+
+def _epoch_candidates(med: float, median_dt: float, units) -> list:
+    """[(간격 거리, 단위)] — 값이 2000~2100 년 범위이고 샘플 간격도 PLAUSIBLE_DT_S 안인 단위만"""
+    out = []
+    for unit in units:
+        scale = UNIT_SCALE[unit]
+        dt_s = median_dt / scale
+        if EPOCH_MIN_S <= med / scale <= EPOCH_MAX_S and PLAUSIBLE_DT_S[0] <= dt_s <= PLAUSIBLE_DT_S[1]:
+            out.append((_dt_distance(dt_s), unit))
+    return out
+
+def infer_time_schema(series: pd.Series, column=None) -> dict:
+    """
+    시간 컬럼 하나의 스키마를 추론한다.
+    kind: 'epoch' | 'monotonic' | 'datetime'(문자열 날짜) | 'index'(해석 불가)
+
+    값 크기만으로는 epoch 와 구분되지 않는 경우가 있다
+    (부팅 30분 뒤 steady_clock ns ≈ 1.8e12 는 epoch ms 범위, 20일 뒤 ≈ 1.7e15 는 epoch us 범위).
+    그래서 epoch 단위는 샘플 간격이 그럴듯할 때만 인정한다. 같은 값이 monotonic 으로도 읽히면
+    epoch 해석의 간격이 EPOCH_MAX_AMBIGUOUS_DT_S 이하일 때 epoch 를 유지하고,
+    그보다 길 때(예: 10 ms 간격 ns 가 epoch us 로 읽혀 10 초 간격이 되는 경우)만 monotonic 으로 판정한다.
+    """
+    schema = {"column": None if column is None else str(column), "kind": "index", "unit": None}
+    num = pd.to_numeric(series, errors="coerce")
+    finite = num.to_numpy(dtype=np.float64)
+    finite = finite[np.isfinite(finite)]
+
+    if len(finite) == 0:
+        dt = pd.to_datetime(series, errors="coerce")
+        if dt.notna().sum() > len(series) // 2:
+            ns = dt.dropna().astype("int64").to_numpy()
+            schema.update(kind="datetime", unit="ns", **_sampling_stats(ns, UNIT_SCALE["ns"]))
+        return schema
+
+    med = float(np.median(finite))
+    pos = np.diff(finite)
+    pos = pos[pos > 0]
+    median_dt = float(np.median(pos)) if len(pos) else 1.0
+    span = float(finite.max() - finite.min())
+
+    named = _unit_from_name(column)
+    epoch = _epoch_candidates(med, median_dt, [named] if named else UNIT_SCALE)
+    kind, unit = "monotonic", named
+    if epoch:
+        best_epoch = min(epoch)
+        # 이름에 단위가 없고 epoch 간격이 비현실적으로 길 때만 monotonic 해석으로 바꿈
+        epoch_dt_s = median_dt / UNIT_SCALE[best_epoch[1]]
+        mono = [] if named else _monotonic_candidates(median_dt, span, start=float(finite.min()))
+        if mono and epoch_dt_s > EPOCH_MAX_AMBIGUOUS_DT_S:
+            unit = min(mono)[1]
+        else:
+            kind, unit = "epoch", best_epoch[1]
+    elif unit is None:
+        unit = _pick_monotonic_unit(median_dt, span)
+
+    schema.update(kind=kind, unit=unit, **_sampling_stats(finite, UNIT_SCALE[unit]))
+    return schema
+
+
+# ===== 변환 =====
+def to_milliseconds(series: pd.Series, schema: dict) -> np.ndarray:
+    """
+    epoch/datetime → epoch 기준 ms, monotonic → 첫 샘플 기준 상대 ms.
+    정수 ns 값은 float64 로 바꾸기 전에 기준값을 빼서 정밀도를 유지한다.
+    """
+    kind = schema.get("kind")
+    if kind == "datetime":
+        dt = pd.to_datetime(series, errors="coerce")
+        ns = dt.astype("int64").to_numpy().astype(np.float64)
+        ns[dt.isna().to_numpy()] = np.nan
+        return ns / 1e6
+    if kind not in ("epoch", "monotonic"):
+        return np.arange(len(series), dtype=np.float64) * DEFAULT_INTERVAL_MS
+
+    scale = UNIT_SCALE[schema["unit"]]
+    num = pd.to_numeric(series, errors="coerce")
+    if pd.api.types.is_integer_dtype(num.dtype) and len(num):
+        base = int(num.iloc[0])
+        rel = (num.to_numpy() - base).astype(np.float64)
+    else:
+        vals = num.to_numpy(dtype=np.float64)
+        finite = vals[np.isfinite(vals)]
+        base = float(finite[0]) if len(finite) else 0.0
+        rel = vals - base
+    rel_ms = rel * (1e3 / scale)
+    if kind == "epoch":
+        return rel_ms + base * (1e3 / scale)
+    return rel_ms
+
+def to_datetime(series: pd.Series, schema: dict) -> pd.Series:
+    if schema.get("kind") == "datetime":
+        return pd.to_datetime(series, errors="coerce")
+    num = pd.to_numeric(series, errors="coerce")
+    return pd.to_datetime(num, unit=schema["unit"], errors="coerce")
+
+
+# ===== 스키마 캐시 =====
+def dataset_signature(csv_path: Path) -> str:
+    st = Path(csv_path).stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+def load_time_schema(cache_path: Path, csv_path: Path):
+    """저장된 스키마가 있고 원본 CSV 가 그대로이면 반환, 아니면 None"""
+    cache_path = Path(cache_path)
+    if not cache_path.exists():
+        return None
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if cached.get("signature") != dataset_signature(csv_path):
+        return None
+    return cached.get("schema")
+
+def save_time_schema(cache_path: Path, csv_path: Path, schema: dict):
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"source": str(csv_path), "signature": dataset_signature(csv_path), "schema": schema}
+    cache_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+# ===== 리샘플링 =====
+def common_grid(time_axes, step_ms: float = None) -> np.ndarray:
+    """여러 소스의 ms 시간축이 겹치는 구간에 대한 균일 격자. step 미지정 시 가장 거친 간격 사용."""
+    starts, ends, steps = [], [], []
+    for t in time_axes:
+        t = np.asarray(t, dtype=np.float64)
+        t = t[np.isfinite(t)]
+        if len(t) < 2:
+            continue
+        starts.append(t.min())
+        ends.append(t.max())
+        steps.append(np.median(np.diff(np.sort(t))))
+    if not starts:
+        return np.array([], dtype=np.float64)
+    step = step_ms if step_ms else float(max(steps))
+    return np.arange(max(starts), min(ends) + step * 0.5, step)
+
+def resample_uniform(t_ms, frame: pd.DataFrame, step_ms: float = None, grid=None) -> pd.DataFrame:
+    """
+    숫자 컬럼들을 균일 격자로 선형 보간한다.
+    grid 를 주면 그 격자를 그대로 쓰므로 다른 소스와 같은 축으로 비교할 수 있다.
+    """
+    t = np.asarray(t_ms, dtype=np.float64)
+    order = np.argsort(t, kind="stable")
+    t = t[order]
+    if grid is None:
+        grid = common_grid([t], step_ms)
+
+    out = {"time_ms": grid}
+    for c in frame.columns:
+        v = pd.to_numeric(frame[c], errors="coerce").to_numpy(dtype=np.float64)[order]
+        ok = np.isfinite(t) & np.isfinite(v)
+        if ok.sum() < 2:
+            continue
+        out[c] = np.interp(grid, t[ok], v[ok], left=np.nan, right=np.nan)
+    return pd.DataFrame(out)
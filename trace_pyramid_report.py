@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+trace_pyramid_report.py
+-----------------------
+실행 시간 / 시스템 지표 시계열을 확대·이동 가능한 단일 HTML(오프라인)로 만든다.
+
+- 시계열마다 2의 거듭제곱 버킷으로 min / max / mean 피라미드를 만든다 (reshape 로 벡터화).
+- 가장 촘촘한 저장 레벨의 버킷 수는 리포트 전체 예산(FINEST_BUDGET_BUCKETS)을 시계열 길이에 맞춰 나눈다.
+  예산 안에 들어오는 짧은 시계열은 버킷 1(단일 샘플)까지 확대되고, 남은 예산을 긴 시계열이 나눠 갖는다
+  (시계열당 최소 MIN_FINEST_BUCKETS).
+  한계: 시계열 하나가 자기 몫보다 길면 가장 촘촘한 레벨도 여러 샘플을 묶은 min/max/mean 이다.
+  예) 기본 예산(약 100만)에 1,000만 샘플 시계열 1개 → 버킷 16. 이런 시계열은 실행 시 [INFO] 로 알리며
+  --finest-budget 을 키우면 (HTML 크기 증가와 맞바꿔) 더 깊이 확대할 수 있다.
+- 레벨은 Float32 배열을 base64 로 HTML 에 넣고, 브라우저는 현재 확대 범위에 필요한 레벨만
+  그때그때 디코딩해서 canvas 에 그린다 (min~max 띠 + mean 선).
+
+    python trace_pyramid_report.py                          # analyze/data 앱별 + periodic_log 실험별
+    python trace_pyramid_report.py --app openxr
+    python trace_pyramid_report.py --periodic /path/to/openxr_15W/periodic_log.csv
+"""
+
+import re
+import json
+import base64
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from log_input import open_input, resolve_input, strip_compression_suffix
+
+ANALYZE_ROOT = Path("/home/nokdujeon/kangseok/ILLIXR/analyze")
+DATA_DIR = ANALYZE_ROOT / "data"
+FINEST_BUDGET_BUCKETS = 1 << 20  # 리포트 하나의 가장 촘촘한 레벨 버킷 수 합 (base64 ~16-22 MB, 전 레벨 합 ~2배)
+MIN_FINEST_BUCKETS = 1 << 16     # 시계열당 최소 보장 버킷 수 (시계열당 ~1 MB)
+MIN_COARSEST_BUCKETS = 256     # 이 정도가 되면 더 거칠게 만들지 않음
+
+
+# ===== 피라미드 =====
+def _reduce_pairs(mn, mx, sm, cnt, t):
+    """버킷 두 개씩 합쳐 한 단계 거친 레벨"""
+    if len(mn) % 2:
+        pad = lambda a, v: np.append(a, a.dtype.type(v))
+        mn, mx, sm, cnt = pad(mn, np.nan), pad(mx, np.nan), pad(sm, 0), pad(cnt, 0)
+        t = None if t is None else pad(t, t[-1])
+    return (np.fmin(mn[0::2], mn[1::2]), np.fmax(mx[0::2], mx[1::2]),
+            sm[0::2] + sm[1::2], cnt[0::2] + cnt[1::2], None if t is None else t[0::2])
+
+def allocate_finest(lengths, budget: int = FINEST_BUDGET_BUCKETS, floor: int = MIN_FINEST_BUCKETS) -> list:
+    """
+    시계열 길이 목록 → 시계열별 가장 촘촘한 레벨의 최대 버킷 수.
+    짧은 것부터 필요한 만큼(길이) 주고 남은 예산을 나머지가 균등하게 나눈다 (water-filling).
+    """
+    caps = [0] * len(lengths)
+    remaining = budget
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    for k, i in enumerate(order):
+        share = remaining // (len(order) - k)
+        caps[i] = max(floor, min(int(lengths[i]), share))
+        remaining = max(0, remaining - min(int(lengths[i]), caps[i]))
+    return caps
+
+def build_pyramid(y: np.ndarray, t: np.ndarray = None, max_finest: int = MIN_FINEST_BUCKETS) -> list:
+    """
+    y(샘플 값), t(선택, 샘플 시각) → [{bucket, min, max, mean, t}, ...] (촘촘 → 거침).
+    버킷 크기는 모두 2의 거듭제곱이고, 레벨 0 버킷 수는 max_finest 이하.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    bucket = 1
+    while -(-n // bucket) > max_finest:
+        bucket *= 2
+    nb = -(-n // bucket)
+
+    padded = np.full(nb * bucket, np.nan)
+    padded[:n] = y
+    m = padded.reshape(nb, bucket)
+    valid = ~np.isnan(m)
+    mn = np.fmin.reduce(m, axis=1)
+    mx = np.fmax.reduce(m, axis=1)
+    sm = np.where(valid, m, 0.0).sum(axis=1)
+    cnt = valid.sum(axis=1)
+    tb = None if t is None else np.asarray(t, dtype=np.float64)[::bucket]
+
+    levels = []
+    while True:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = sm / cnt
+        levels.append({"bucket": bucket, "min": mn, "max": mx, "mean": mean, "t": tb})
+        if len(mn) <= MIN_COARSEST_BUCKETS:
+            break
+        mn, mx, sm, cnt, tb = _reduce_pairs(mn, mx, sm, cnt, tb)
+        bucket *= 2
+    return levels
+
+def _encode_level(level: dict) -> dict:
+    cols = [level["min"], level["max"], level["mean"]]
+    if level["t"] is not None:
+        cols.append(level["t"])
+    data = np.column_stack(cols).astype(np.float32)  # [min, max, mean, (t)] 행 단위로 interleave
+    return {"bucket": level["bucket"], "len": len(data),
+            "data": base64.b64encode(data.tobytes()).decode("ascii")}
+
+def series_payload(name: str, unit: str, y, t=None, t_unit: str = None, max_finest: int = MIN_FINEST_BUCKETS) -> dict:
+    y = np.asarray(y, dtype=np.float64)
+    levels = build_pyramid(y, t, max_finest)
+    if levels[0]["bucket"] > 1:
+        print(f"[INFO] {name}: {len(y)} samples → 가장 촘촘한 버킷 {levels[0]['bucket']} 샘플 "
+              f"(단일 샘플까지 확대하려면 --finest-budget 증가)")
+    return {"name": name, "unit": unit, "n": int(len(y)), "t_unit": t_unit if t is not None else None,
+            "stride": 4 if t is not None else 3, "levels": [_encode_level(lv) for lv in levels]}
+
+
+# ===== 입력 =====
+def build_payloads(series: list, budget: int = FINEST_BUDGET_BUCKETS) -> list:
+    """[{name, unit, y, t, t_unit}, ...] → 예산을 나눠 각 시계열의 피라미드 payload"""
+    caps = allocate_finest([len(s["y"]) for s in series], budget)
+    return [series_payload(s["name"], s["unit"], s["y"], s.get("t"), s.get("t_unit"), cap)
+            for s, cap in zip(series, caps)]
+
+def duration_series(app: str, data_dir: Path = DATA_DIR) -> list:
+    """analyze/data/<stage>_<app>.csv → 프레임 순서 Duration / Self (ms)"""
+    out = []
+    for p in sorted(data_dir.glob(f"*_{app}.csv*")):
+        stem = Path(strip_compression_suffix(p.name)).stem
+        stage = stem[: -len(app) - 1]
+        with open_input(p, "rb") as f:
+            df = pd.read_csv(f)
+        if "Duration (ns)" not in df.columns:
+            continue
+        out.append({"name": f"{stage} duration", "unit": "ms", "y": df["Duration (ns)"].to_numpy() / 1e6})
+        if "Self (ns)" in df.columns:
+            out.append({"name": f"{stage} self", "unit": "ms", "y": df["Self (ns)"].to_numpy() / 1e6})
+    return out
+
+def system_series(csv_path: Path) -> list:
+    """periodic_log.csv → 숫자 컬럼별 시계열 (x = 첫 샘플 기준 시간 s)"""
+    from logger_csv_to_graph import PLOT_COLUMN_PATTERN, load_csv, ensure_numeric, find_time_column
+    from throttle_detector import time_axis_ms
+
+    df = load_csv(csv_path, usecols=lambda c: bool(PLOT_COLUMN_PATTERN.search(str(c))))
+    t_s = time_axis_ms(df) / 1000.0
+    time_col = find_time_column(df)
+    cols = [c for c in df.columns if c != time_col and not str(c).startswith("_time")
+            and not re.search(r"(time|date)", str(c), re.I)]
+    out = []
+    for c in ensure_numeric(df, cols):
+        unit = "%" if re.search(r"util|load", str(c), re.I) else ""
+        out.append({"name": str(c), "unit": unit, "y": df[c].to_numpy(dtype=np.float64), "t": t_s, "t_unit": "s"})
+    return out
+
+
+# ===== HTML =====
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>__TITLE__</title>
+<style>
+body{font-family:sans-serif;margin:12px;background:#fafafa}
+.panel{background:#fff;border:1px solid #ddd;margin:0 0 10px 0;padding:6px}
+.head{font-size:13px;margin-bottom:4px}.head span{color:#888;margin-left:8px}
+canvas{width:100%;height:220px;display:block;cursor:crosshair}
+</style></head><body>
+<h3>__TITLE__</h3>
+<div style="font-size:12px;color:#666">휠: 확대/축소 · 드래그: 이동 · 더블클릭: 전체 보기 · 띠 = min~max, 선 = mean</div>
+<div id="panels"></div>
+<script>
+const SERIES = __PAYLOAD__;
+
+function decode(level) {
+  if (!level.arr) {
+    const bin = atob(level.data), buf = new Uint8Array(bin.length);
+    for (let i = 0; i < bin.length; i++) buf[i] = bin.charCodeAt(i);
+    level.arr = new Float32Array(buf.buffer);
+    level.data = null;
+  }
+  return level.arr;
+}
+
+function pickLevel(s, x0, x1, width) {
+  // 화면 폭 이상의 버킷이 보이는 가장 거친 레벨 (없으면 가장 촘촘한 레벨)
+  for (let i = s.levels.length - 1; i >= 0; i--) {
+    if ((x1 - x0) / s.levels[i].bucket >= width) return s.levels[i];
+  }
+  return s.levels[0];
+}
+
+function makePanel(s) {
+  const div = document.createElement("div"); div.className = "panel";
+  const head = document.createElement("div"); head.className = "head";
+  head.innerHTML = s.name + (s.unit ? " (" + s.unit + ")" : "") + "<span></span>";
+  const info = head.querySelector("span");
+  const cv = document.createElement("canvas");
+  div.appendChild(head); div.appendChild(cv);
+  document.getElementById("panels").appendChild(div);
+  const view = {x0: 0, x1: s.n};
+
+  function draw() {
+    const dpr = window.devicePixelRatio || 1, W = cv.clientWidth, H = cv.clientHeight;
+    cv.width = W * dpr; cv.height = H * dpr;
+    const g = cv.getContext("2d"); g.setTransform(dpr, 0, 0, dpr, 0, 0);
+    g.clearRect(0, 0, W, H);
+    const L = 56, R = 8, T = 6, B = 20, pw = W - L - R, ph = H - T - B;
+    const lv = pickLevel(s, view.x0, view.x1, pw), a = decode(lv), st = s.stride, b = lv.bucket;
+    const i0 = Math.max(0, Math.floor(view.x0 / b)), i1 = Math.min(lv.len - 1, Math.ceil(view.x1 / b));
+    let lo = Infinity, hi = -Infinity;
+    for (let i = i0; i <= i1; i++) {
+      const mn = a[i * st], mx = a[i * st + 1];
+      if (mn < lo) lo = mn; if (mx > hi) hi = mx;
+    }
+    if (!isFinite(lo)) { lo = 0; hi = 1; }
+    if (hi === lo) { hi = lo + 1; }
+    const pad = (hi - lo) * 0.05; lo -= pad; hi += pad;
+    const X = x => L + (x - view.x0) / (view.x1 - view.x0) * pw;
+    const Y = v => T + (1 - (v - lo) / (hi - lo)) * ph;
+
+    g.fillStyle = "rgba(31,119,180,0.25)";
+    for (let i = i0; i <= i1; i++) {
+      const mn = a[i * st], mx = a[i * st + 1];
+      if (mn !== mn) continue;
+      const xa = X(i * b), xb = Math.max(X((i + 1) * b), xa + 1);
+      g.fillRect(xa, Y(mx), xb - xa, Math.max(1, Y(mn) - Y(mx)));
+    }
+    g.strokeStyle = "#1f77b4"; g.lineWidth = 1; g.beginPath();
+    let pen = false;
+    for (let i = i0; i <= i1; i++) {
+      const v = a[i * st + 2];
+      if (v !== v) { pen = false; continue; }
+      const x = X((i + 0.5) * b), y = Y(v);
+      if (pen) g.lineTo(x, y); else { g.moveTo(x, y); pen = true; }
+    }
+    g.stroke();
+
+    g.fillStyle = "#333"; g.font = "11px sans-serif";
+    g.strokeStyle = "#ccc"; g.strokeRect(L, T, pw, ph);
+    for (let k = 0; k <= 4; k++) {
+      const v = lo + (hi - lo) * k / 4;
+      g.fillText(v.toPrecision(4), 2, Y(v) + 4);
+      const xi = view.x0 + (view.x1 - view.x0) * k / 4;
+      let label = Math.round(xi).toString();
+      if (st === 4) {
+        const bi = Math.min(lv.len - 1, Math.max(0, Math.floor(xi / b)));
+        label = a[bi * st + 3].toFixed(2) + " " + s.t_unit;
+      }
+      g.fillText(label, Math.min(X(xi), W - 60), H - 5);
+    }
+    info.textContent = "n=" + s.n + " · bucket=" + b + " · samples " + Math.round(view.x0) + "–" + Math.round(view.x1);
+  }
+
+  cv.addEventListener("wheel", e => {
+    e.preventDefault();
+    const r = cv.getBoundingClientRect(), f = (e.clientX - r.left - 56) / (r.width - 64);
+    const xm = view.x0 + (view.x1 - view.x0) * Math.min(1, Math.max(0, f));
+    const k = e.deltaY < 0 ? 0.8 : 1.25;
+    let w = Math.min(s.n, Math.max(16, (view.x1 - view.x0) * k));
+    view.x0 = Math.max(0, Math.min(s.n - w, xm - (xm - view.x0) / (view.x1 - view.x0) * w)); view.x1 = view.x0 + w;
+    draw();
+  }, {passive: false});
+  let drag = null;
+  cv.addEventListener("mousedown", e => { drag = {x: e.clientX, x0: view.x0, x1: view.x1}; });
+  window.addEventListener("mouseup", () => { drag = null; });
+  window.addEventListener("mousemove", e => {
+    if (!drag) return;
+    const w = drag.x1 - drag.x0, dx = (e.clientX - drag.x) / (cv.clientWidth - 64) * w;
+    view.x0 = Math.min(Math.max(0, drag.x0 - dx), s.n - w); view.x1 = view.x0 + w; draw();
+  });
+  cv.addEventListener("dblclick", () => { view.x0 = 0; view.x1 = s.n; draw(); });
+  window.addEventListener("resize", draw);
+  draw();
+}
+SERIES.forEach(makePanel);
+</script></body></html>
+"""
+
+def write_report(series: list, out_html: Path, title: str, budget: int = FINEST_BUDGET_BUCKETS):
+    if not series:
+        print(f"[INFO] 시계열이 없어 리포트를 만들지 않습니다: {title}")
+        return
+    out_html.parent.mkdir(parents=True, exist_ok=True)
+    payload = build_payloads(series, budget)
+    html = HTML_TEMPLATE.replace("__TITLE__", title).replace("__PAYLOAD__", json.dumps(payload))
+    out_html.write_text(html, encoding="utf-8")
+    print(f"[SAVED] {out_html} ({out_html.stat().st_size / 1e6:.1f} MB, {len(series)} series)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="확대 가능한 HTML 시계열 리포트 (min/max/mean 피라미드)")
+    ap.add_argument("--app", action="append", help="analyze/data 의 앱 이름 (여러 번 지정 가능)")
+    ap.add_argument("--periodic", type=Path, action="append", help="periodic_log.csv 경로 (여러 번 지정 가능)")
+    ap.add_argument("--finest-budget", type=int, default=FINEST_BUDGET_BUCKETS,
+                    help="리포트 하나의 가장 촘촘한 레벨 버킷 수 합 (클수록 긴 시계열도 단일 샘플까지 확대, HTML 커짐)")
+    args = ap.parse_args()
+
+    apps, periodic = args.app, args.periodic
+    if not apps and not periodic:
+        # 기본: analyze/data 의 모든 앱 + logger_csv_to_graph 가 찾는 모든 실험
+        from logger_csv_to_graph import DATA_ROOT, SEARCH_DEPTH, discover_datasets
+        apps = sorted({Path(strip_compression_suffix(p.name)).stem.rsplit("_", 1)[-1]
+                       for p in DATA_DIR.glob("*_*.csv*")}) if DATA_DIR.exists() else []
+        periodic = [resolve_input(d / "periodic_log.csv") for d in discover_datasets(DATA_ROOT, depth=SEARCH_DEPTH)] \
+            if DATA_ROOT.exists() else []
+
+    for app in apps or []:
+        write_report(duration_series(app), ANALYZE_ROOT / f"{app}_nsys" / "trace_report.html",
+                     f"Execution time — {app}", args.finest_budget)
+    for csv_path in periodic or []:
+        exp = csv_path.parent.name
+        write_report(system_series(csv_path), ANALYZE_ROOT / exp / "trace_report.html",
+                     f"System metrics — {exp}", args.finest_budget)
+
+if __name__ == "__main__":
+    main()
@@ -14,37 +14,67 @@ files = {
     "openxr": os.path.join(DATA_DIR, "openxr_stats.csv")
 }
 
-# === 3. CSV 불러오기 ===
-dfs = {}
-for name, path in files.items():
-    if os.path.exists(path):
-        df = pd.read_csv(path)
-        df.set_index(df.columns[0], inplace=True)
-        dfs[name] = df
-    else:
-        print(f"⚠️ 파일을 찾을 수 없습니다: {path}")
-
-# === 4. 통계 항목 ===
+# === 3. 통계 항목 ===
 metrics = ["mean", "25%", "50%", "75%"]
 
+# === 4. 통계 불러오기 (results.sqlite 가 있고 CSV 보다 최신이면 DB 조회, 아니면 CSV) ===
+DB_PATH = os.path.join(DATA_DIR, "results.sqlite")  # python results_db.py --db ... ingest --results-dir ...
+
+def load_stats():
+    """{scene: 통계 DataFrame(index=Process Step, columns ⊇ metrics)}"""
+    dfs = {}
+    use_db = os.path.exists(DB_PATH)
+    if use_db:
+        import results_db
+        con = results_db.connect(DB_PATH)
+        # 파서를 다시 돌리고 ingest 를 잊은 경우: DB 의 최신 run 보다 새 CSV 가 있으면 CSV 를 읽는다
+        stale = [name for name, path in files.items()
+                 if os.path.exists(path)
+                 and results_db.capture_stamp([path]) > (results_db.latest_run(con, name, "openvins_stats") or "")]
+        if stale:
+            print(f"⚠️ results.sqlite 보다 새 CSV 가 있어 CSV 를 읽습니다 ({', '.join(stale)}) "
+                  f"— python results_db.py ingest 로 갱신하세요")
+            use_db = False
+        else:
+            tables = {m: results_db.summary_table(con, "openvins_stats", m, apps=files.keys()) for m in metrics}
+            dfs = {name: pd.DataFrame({m: t[name] for m, t in tables.items()})
+                   for name in files if name in tables["mean"].columns}
+        con.close()
+    if not use_db:
+        for name, path in files.items():
+            if os.path.exists(path):
+                df = pd.read_csv(path)
+                df.set_index(df.columns[0], inplace=True)
+                dfs[name] = df
+            else:
+                print(f"⚠️ 파일을 찾을 수 없습니다: {path}")
+    return dfs
+
 # === 5. 그래프 저장 폴더 ===
 SAVE_DIR = os.path.join(DATA_DIR, "plots")
-os.makedirs(SAVE_DIR, exist_ok=True)
-
-# === 6. 그래프 생성 ===
-for metric in metrics:
-    plt.figure(figsize=(10, 6))
-    metric_values = pd.DataFrame({name: df[metric] for name, df in dfs.items()})
-    metric_values.plot(kind="bar", figsize=(10, 6))
-    plt.title(f"Comparison of {metric} Execution Times (ms)")
-    plt.ylabel("Time (ms)")
-    plt.xlabel("Process Step")
-    plt.xticks(rotation=45)
-    plt.legend(title="Scene")
-    plt.tight_layout()
-    
-    save_name = os.path.join(SAVE_DIR, f"vio_timing_comparison_{metric}.png")
-    plt.savefig(save_name)
-    plt.close()
-
-print("✅ 그래프 저장 완료:", SAVE_DIR)
+
+# === 6. 그래프 생성 (pipeline_runner 는 openvins_timing_parser 통계를 메모리에서 바로 넘김) ===
+def plot_comparison(dfs, save_dir=SAVE_DIR):
+    os.makedirs(save_dir, exist_ok=True)
+    for metric in metrics:
+        plt.figure(figsize=(10, 6))
+        metric_values = pd.DataFrame({name: df[metric] for name, df in dfs.items()})
+        metric_values.plot(kind="bar", figsize=(10, 6))
+        plt.title(f"Comparison of {metric} Execution Times (ms)")
+        plt.ylabel("Time (ms)")
+        plt.xlabel("Process Step")
+        plt.xticks(rotation=45)
+        plt.legend(title="Scene")
+        plt.tight_layout()
+
+        save_name = os.path.join(save_dir, f"vio_timing_comparison_{metric}.png")
+        plt.savefig(save_name)
+        plt.close("all")
+
+    print("✅ 그래프 저장 완료:", save_dir)
+
+def main():
+    plot_comparison(load_stats())
+
+if __name__ == "__main__":
+    main()